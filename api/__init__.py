@@ -0,0 +1,2 @@
+# Lets the pipeline scripts in the repo root import the modules shared with the
+# API (e.g. api.cricsheet); the server itself runs from api/ with plain imports.
@@ -0,0 +1,33 @@
+import os
+import hmac
+from fastapi import APIRouter, Header, HTTPException
+from typing import Optional
+import data_loader
+
+router = APIRouter()
+
+@router.post("/admin/reload")
+def reload_data(x_admin_token: Optional[str] = Header(None)):
+    """
+    Reload player_data/ without restarting. Runs in FastAPI's threadpool, so
+    other requests keep being served from the current version meanwhile.
+    Disabled unless IPL_ADMIN_TOKEN is set; the token goes in X-Admin-Token.
+
+    Only the worker process that handles the request reloads here. The
+    others notice the rewritten snapshot within SNAPSHOT_POLL_INTERVAL
+    seconds, so the response reports this worker alone.
+    """
+    token = os.environ.get("IPL_ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    
+    reloaded = data_loader.reload_dataset()
+    return {
+        "scope": "worker",
+        "pid": os.getpid(),
+        "reloaded": reloaded,
+        "version": data_loader.current_version(),
+        "other_workers_follow_within_seconds": data_loader.SNAPSHOT_POLL_INTERVAL,
+    }
@@ -0,0 +1,321 @@
+import re
+import time
+import pandas as pd
+try:
+    # pipeline.py imports this module from the repo root as api.build_snapshot
+    from .compare import COMPARE_METRICS
+    from .leaderboards import ALL_TIME, METRICS, encode_board
+    from .search_index import build_search_tables, load_aliases
+    from .snapshot import (
+        PLAYER_DATA_DIR, SNAPSHOT_PATH, compute_data_version, encode_json, encode_snapshot, filter_key, normalize_name,
+        write_snapshot
+    )
+except ImportError:
+    # The API (and this module's command line) run from api/
+    from compare import COMPARE_METRICS
+    from leaderboards import ALL_TIME, METRICS, encode_board
+    from search_index import build_search_tables, load_aliases
+    from snapshot import (
+        PLAYER_DATA_DIR, SNAPSHOT_PATH, compute_data_version, encode_json, encode_snapshot, filter_key, normalize_name,
+        write_snapshot
+    )
+
+def load_data(data_dir=PLAYER_DATA_DIR):
+    """Load CSV data with error handling"""
+    try:
+        batting_df = pd.read_csv(data_dir / "batting_stats.csv")
+        bowling_df = pd.read_csv(data_dir / "bowling_stats.csv")
+        career_batting_df = pd.read_csv(data_dir / "career_batting_stats.csv")
+        career_bowling_df = pd.read_csv(data_dir / "career_bowling_stats.csv")
+        
+        print(f"Data loaded: {len(batting_df)} batting rows, {len(bowling_df)} bowling rows, {len(career_batting_df)} players")
+        return batting_df, bowling_df, career_batting_df, career_bowling_df
+    except FileNotFoundError as e:
+        print(f"Error: CSV files not found. Please run the data processing scripts first.")
+        print(f"Missing file: {e}")
+        return None, None, None, None
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return None, None, None, None
+
+def json_ready(df):
+    """Replace NaN with None so rows can be JSON-encoded"""
+    return df.astype(object).where(df.notna(), None)
+
+def records_by_player(df):
+    """Split a table into {player: [row dicts]}, converting the whole table to dicts once rather than per player"""
+    records = {}
+    for row in json_ready(df).to_dict(orient="records"):
+        records.setdefault(row["player"], []).append(row)
+    return records
+
+def build_player_tables(batting_df, bowling_df, career_batting_df, career_bowling_df):
+    """
+    Build the normalized-name -> response tables for the /batting, /bowling,
+    /career and /profile routes, so a request is one lookup with no
+    DataFrame scan or per-row serialization. A profile is all three in one
+    payload, for pages that show them together.
+    """
+    batting = records_by_player(batting_df)
+    bowling = records_by_player(bowling_df)
+    career_batting = records_by_player(career_batting_df)
+    career_bowling = records_by_player(career_bowling_df)
+
+    tables = {"batting": {}, "bowling": {}, "career": {}, "profile": {}}
+    for player in dict.fromkeys([*batting, *bowling, *career_batting, *career_bowling]):
+        key = normalize_name(player)
+        if player in batting:
+            tables["batting"][key] = encode_json({"player": player, "batting_stats": batting[player]})
+        if player in bowling:
+            tables["bowling"][key] = encode_json({"player": player, "bowling_stats": bowling[player]})
+        if player in career_batting or player in career_bowling:
+            tables["career"][key] = encode_json({
+                "player": player,
+                "career_batting": career_batting.get(player, []),
+                "career_bowling": career_bowling.get(player, [])
+            })
+        tables["profile"][key] = encode_json({
+            "player": player,
+            "career_batting": career_batting.get(player, []),
+            "career_bowling": career_bowling.get(player, []),
+            "batting_stats": batting.get(player, []),
+            "bowling_stats": bowling.get(player, [])
+        })
+    return tables
+
+def build_series_table(batting_df, bowling_df):
+    """
+    Per player, the seasons they played and one column of values per
+    compare metric in season order, for /compare. Columns are selected
+    from the season tables whole (with '-' placeholders as None) rather
+    than built row by row.
+    """
+    frames = []
+    for kind, df in (("batting", batting_df), ("bowling", bowling_df)):
+        columns = {metric: column for metric, (table, column) in COMPARE_METRICS.items() if table == kind}
+        selected = df[["player", "season", *columns.values()]].set_index(["player", "season"])
+        frames.append(selected.apply(pd.to_numeric, errors="coerce").set_axis(list(columns), axis=1))
+    # Sorted by player, so each player's seasons are one contiguous slice of every column
+    seasons = json_ready(pd.concat(frames, axis=1).sort_index())
+    players = seasons.index.get_level_values("player").tolist()
+    years = seasons.index.get_level_values("season").tolist()
+    columns = {metric: seasons[metric].tolist() for metric in COMPARE_METRICS}
+
+    series = {}
+    start = 0
+    for end in range(1, len(players) + 1):
+        if end < len(players) and players[end] == players[start]:
+            continue
+        series[normalize_name(players[start])] = encode_json({
+            "player": players[start],
+            "seasons": years[start:end],
+            "metrics": {metric: column[start:end] for metric, column in columns.items()}
+        })
+        start = end
+    return {"series": series}
+
+def last_name(name):
+    """
+    Last word of a CricSheet name ('CH Gayle' -> 'Gayle'), used for directory
+    ordering. The '(2)' CricSheet appends to tell namesakes apart is not part
+    of the name ('Arshad Khan (2)' -> 'Khan').
+    """
+    parts = re.sub(r"\s*\(\d+\)$", "", name).split()
+    return parts[-1] if parts else name
+
+def build_directory_entries(batting_df):
+    """
+    One directory entry per player: season span, teams (in the order they
+    first played for them) and a last-name sort key, sorted by that key
+    """
+    rows = batting_df[["player", "team", "season"]].sort_values("season", kind="stable")
+    spans = rows.groupby("player")["season"].agg(["min", "max"])
+    teams = rows.drop_duplicates(["player", "team"]).groupby("player", sort=False)["team"].agg(list)
+
+    entries = []
+    for player in spans.index:
+        first, last = int(spans.at[player, "min"]), int(spans.at[player, "max"])
+        entries.append({
+            "name": player,
+            "first_season": first,
+            "last_season": last,
+            "years": f"{first}-{last}",
+            "teams": teams[player],
+            "last_name": last_name(player),
+            "sort_key": f"{last_name(player).lower()} {player.lower()}"
+        })
+    entries.sort(key=lambda entry: entry["sort_key"])
+    return entries
+
+def build_player_directory(batting_df, entries):
+    """
+    Pre-encode the directory response for every team/season filter
+    combination that exists in the data, keyed by filter_key(team, season)
+    with None meaning "no filter"
+    """
+    rows = batting_df[["player", "team", "season"]]
+    position = {entry["name"]: i for i, entry in enumerate(entries)}
+
+    # Which directory positions belong under each (team, season) filter
+    members = {(None, None): set(range(len(entries)))}
+    for player, team, season in rows.itertuples(index=False):
+        i = position[player]
+        for key in ((str(team).upper(), None), (None, int(season)), (str(team).upper(), int(season))):
+            members.setdefault(key, set()).add(i)
+
+    payloads = {}
+    for key, positions in members.items():
+        selected = [entries[i] for i in sorted(positions)]
+        payloads[filter_key(*key)] = encode_json({"count": len(selected), "players": selected})
+    return payloads
+
+def build_team_tables(batting_df, bowling_df):
+    """
+    Build the team -> season -> roster tables with pre-encoded responses.
+
+    Keys are upper-cased team abbreviations. Each roster lists every
+    player who appeared for the team that season with their season
+    batting and bowling rows, ordered by matches played.
+    """
+    batting = json_ready(batting_df)
+    bowling = json_ready(bowling_df)
+    bowling_rows = {
+        (row["player"], row["team"], row["season"]): row
+        for row in bowling.to_dict(orient="records")
+    }
+
+    rosters = {}
+    for row in batting.to_dict(orient="records"):
+        key = (row["player"], row["team"], row["season"])
+        rosters.setdefault(str(row["team"]).upper(), {}).setdefault(int(row["season"]), []).append({
+            "player": row["player"],
+            "batting": row,
+            "bowling": bowling_rows.pop(key, None)
+        })
+    # Players with only a bowling row for a team-season
+    for (player, team, season), row in bowling_rows.items():
+        rosters.setdefault(str(team).upper(), {}).setdefault(int(season), []).append({
+            "player": player, "batting": None, "bowling": row
+        })
+
+    tables = {"team_seasons": {}, "team_rosters": {}}
+    teams = []
+    for team in sorted(rosters):
+        seasons = sorted(rosters[team], reverse=True)
+        teams.append({"team": team, "first_season": seasons[-1], "last_season": seasons[0], "seasons": len(seasons)})
+        tables["team_seasons"][team] = encode_json({
+            "team": team,
+            "seasons": [{"season": season, "players": len(rosters[team][season])} for season in seasons]
+        })
+        for season in seasons:
+            players = sorted(
+                rosters[team][season],
+                key=lambda entry: (-max((entry["batting"] or {}).get("matches") or 0,
+                                        (entry["bowling"] or {}).get("matches") or 0), entry["player"])
+            )
+            tables["team_rosters"][filter_key(team, season)] = encode_json({
+                "team": team, "season": season, "count": len(players), "players": players
+            })
+    tables["meta"] = {"teams": encode_json({"teams": teams})}
+    return tables
+
+def build_season_tables(batting_df, bowling_df):
+    """Pre-encode the /seasons/{year} batting (by runs) and bowling (by wickets) leaderboards"""
+    tables = {"season_batting": {}, "season_bowling": {}}
+    for table, df, column, field in (
+        ("season_batting", batting_df, "runs", "batting_leaderboard"),
+        ("season_bowling", bowling_df, "wickets", "bowling_leaderboard")
+    ):
+        for season, rows in df.groupby("season"):
+            rows = json_ready(rows.sort_values(column, ascending=False, kind="stable"))
+            tables[table][str(season)] = encode_json({"season": int(season), field: rows.to_dict(orient="records")})
+    return tables
+
+def leaderboard_stats(batting_df, bowling_df):
+    """
+    Sum season rows into one batting and one bowling row per player, with
+    the rate stats recomputed from the totals (None where undefined) and
+    teams listed in the order the player first played for them
+    """
+    batting = batting_df.assign(
+        not_outs=pd.to_numeric(batting_df["not_outs"], errors="coerce").fillna(0).astype(int)
+    ).sort_values("season", kind="stable")
+    batting = batting.groupby("player").agg(
+        teams=("team", lambda teams: ", ".join(dict.fromkeys(teams))),
+        matches=("matches", "sum"), innings=("innings", "sum"), not_outs=("not_outs", "sum"),
+        runs=("runs", "sum"), balls=("balls", "sum"), fours=("4s", "sum"), sixes=("6s", "sum")
+    ).reset_index()
+    dismissals = batting["innings"] - batting["not_outs"]
+    batting["average"] = (batting["runs"] / dismissals.where(dismissals > 0)).round(2)
+    batting["strike_rate"] = (batting["runs"] * 100 / batting["balls"].where(batting["balls"] > 0)).round(2)
+
+    bowling = bowling_df.sort_values("season", kind="stable").groupby("player").agg(
+        teams=("team", lambda teams: ", ".join(dict.fromkeys(teams))),
+        matches=("matches", "sum"), innings=("innings", "sum"), balls=("balls_bowled", "sum"),
+        runs_conceded=("runs_conceded", "sum"), wickets=("wickets", "sum")
+    ).reset_index()
+    balls = bowling["balls"].where(bowling["balls"] > 0)
+    wickets = bowling["wickets"].where(bowling["wickets"] > 0)
+    bowling["economy"] = (bowling["runs_conceded"] * 6 / balls).round(2)
+    bowling["average"] = (bowling["runs_conceded"] / wickets).round(2)
+    bowling["strike_rate"] = (bowling["balls"] / wickets).round(2)
+    return {"batting": batting, "bowling": bowling}
+
+def build_leaderboard_tables(batting_df, bowling_df):
+    """
+    Pre-sort every leaderboard, each season and all-time for each metric,
+    into a packed board (see leaderboards.encode_board) keyed by
+    filter_key(scope, metric). Players without a value for the metric
+    (no runs, no dismissals, no balls bowled, ...) are left off.
+    """
+    # Ties: more runs/balls bowled first for rate metrics, fewer balls for counting ones, then name
+    tie_breaks = {
+        "runs": ("balls", True), "sixes": ("balls", True), "wickets": ("balls", True),
+        "average": ("runs", False), "strike_rate": ("runs", False), "economy": ("balls", False)
+    }
+    tables = {"leaderboards": {}}
+    scopes = [(ALL_TIME, batting_df, bowling_df)] + [
+        (str(season), batting_df[batting_df["season"] == season], bowling_df[bowling_df["season"] == season])
+        for season in sorted(batting_df["season"].unique())
+    ]
+    for scope, scope_batting, scope_bowling in scopes:
+        stats = leaderboard_stats(scope_batting, scope_bowling)
+        for metric, (kind, ascending) in METRICS.items():
+            tie_column, tie_ascending = tie_breaks[metric]
+            df = stats[kind]
+            df = df[df[metric].notna() & (df[metric] > 0)].sort_values(
+                [metric, tie_column, "player"], ascending=[ascending, tie_ascending, True], kind="stable"
+            )
+            rows = json_ready(df.rename(columns={"fours": "4s", "sixes": "6s"})).to_dict(orient="records")
+            tables["leaderboards"][filter_key(scope, metric)] = encode_board([
+                (int(row["balls"]), int(row["innings"]), encode_json(row)) for row in rows
+            ])
+    return tables
+
+def build_tables(data_dir=PLAYER_DATA_DIR):
+    """Build every snapshot table from the pipeline CSVs, or None if they are missing"""
+    batting_df, bowling_df, career_batting_df, career_bowling_df = load_data(data_dir)
+    if batting_df is None:
+        return None
+
+    directory_entries = build_directory_entries(batting_df)
+    team_tables = build_team_tables(batting_df, bowling_df)
+    tables = {
+        **build_player_tables(batting_df, bowling_df, career_batting_df, career_bowling_df),
+        **build_series_table(batting_df, bowling_df),
+        "directory": build_player_directory(batting_df, directory_entries),
+        **build_season_tables(batting_df, bowling_df),
+        **build_leaderboard_tables(batting_df, bowling_df),
+        **team_tables,
+        **build_search_tables(directory_entries, load_aliases(data_dir / "people.csv")),
+    }
+    tables["meta"]["players"] = encode_json({"players": career_batting_df["player"].unique().tolist()})
+    return tables
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    tables = build_tables()
+    if tables is None:
+        raise SystemExit("Run parse_and_aggregate.py and career_stats.py first.")
+    write_snapshot(SNAPSHOT_PATH, encode_snapshot(compute_data_version(), tables))
+    print(f"Wrote {SNAPSHOT_PATH} ({SNAPSHOT_PATH.stat().st_size / 1e6:.1f} MB) in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,48 @@
+# Season-by-season comparison of several players. build_snapshot.py stores one
+# "series" entry per player: the seasons they played and, for every metric
+# below, a column of values in season order. /compare decodes one entry per
+# player and lines the columns up on the union of their seasons.
+
+# metric -> (stats table, column in the season CSV)
+COMPARE_METRICS = {
+    "matches": ("batting", "matches"),
+    "innings": ("batting", "innings"),
+    "runs": ("batting", "runs"),
+    "balls": ("batting", "balls"),
+    "average": ("batting", "batting_average"),
+    "strike_rate": ("batting", "strike_rate"),
+    "fifties": ("batting", "50s"),
+    "hundreds": ("batting", "100s"),
+    "fours": ("batting", "4s"),
+    "sixes": ("batting", "6s"),
+    "catches": ("batting", "catches"),
+    "stumpings": ("batting", "stumpings"),
+    "bowling_innings": ("bowling", "innings"),
+    "balls_bowled": ("bowling", "balls_bowled"),
+    "runs_conceded": ("bowling", "runs_conceded"),
+    "wickets": ("bowling", "wickets"),
+    "economy": ("bowling", "economy_rate"),
+    "bowling_average": ("bowling", "bowling_average"),
+    "bowling_strike_rate": ("bowling", "strike_rate"),
+}
+
+DEFAULT_METRICS = ("runs", "average", "strike_rate", "wickets", "economy")
+
+# Players per /compare request
+MAX_PLAYERS = 10
+
+def align_series(series, metrics):
+    """
+    Line up decoded per-player series on the sorted union of their seasons.
+    Returns (seasons, {metric: {player: values}}) with None for seasons a
+    player did not play.
+    """
+    seasons = sorted({season for entry in series for season in entry["seasons"]})
+    aligned = {metric: {} for metric in metrics}
+    for entry in series:
+        position = {season: i for i, season in enumerate(entry["seasons"])}
+        rows = [position.get(season) for season in seasons]
+        for metric in metrics:
+            column = entry["metrics"][metric]
+            aligned[metric][entry["player"]] = [column[i] if i is not None else None for i in rows]
+    return seasons, aligned
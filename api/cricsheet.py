@@ -0,0 +1,44 @@
+# CricSheet vocabulary shared by the pipeline (which imports it from the repo
+# root as api.cricsheet) and the API, so both sides decode matches the same way.
+
+# Wicket kinds are stored as small integer codes; index into this tuple to decode
+WICKET_KINDS = (
+    "caught", "bowled", "run out", "lbw", "caught and bowled", "stumped",
+    "hit wicket", "retired hurt", "retired out", "obstructing the field",
+    "handled the ball", "hit the ball twice", "timed out", "retired not out"
+)
+
+# Dismissals credited to the bowler (everything but run outs, retirements, ...)
+BOWLER_WICKET_KINDS = (
+    "caught", "bowled", "lbw", "caught and bowled", "stumped", "hit wicket", "hit the ball twice"
+)
+
+# Franchise names as they appear in CricSheet -> the abbreviations used in the
+# season tables (teams.html maps them back). Renamed franchises that kept their
+# identity share an abbreviation.
+TEAM_ABBREVIATIONS = {
+    "Chennai Super Kings": "CSK", "Deccan Chargers": "DEC", "Delhi Capitals": "DC",
+    "Delhi Daredevils": "DD", "Gujarat Lions": "GL", "Gujarat Titans": "GT",
+    "Kings XI Punjab": "KXIP", "Kochi Tuskers Kerala": "KTK", "Kolkata Knight Riders": "KKR",
+    "Lucknow Super Giants": "LSG", "Mumbai Indians": "MI", "Pune Warriors": "PWI",
+    "Punjab Kings": "PBKS", "Rajasthan Royals": "RR", "Rising Pune Supergiant": "RPS",
+    "Rising Pune Supergiants": "RPS", "Royal Challengers Bangalore": "RCB",
+    "Royal Challengers Bengaluru": "RCB", "Sunrisers Hyderabad": "SRH",
+}
+
+# Seasons that straddle a new year, as CricSheet labels them -> the year they are filed under
+SEASON_YEARS = {"2007/08": 2008, "2009/10": 2010, "2020/21": 2020}
+
+def normalize_season(season):
+    """Normalize a CricSheet season label to a single year (e.g. '2007/08' -> 2008, '2020/21' -> 2020)"""
+    season = str(season)
+    return SEASON_YEARS.get(season) or int(season)
+
+def team_names(team):
+    """
+    The CricSheet names a team filter stands for: an abbreviation (any
+    case) covers every name its franchise played under, anything else is
+    taken as a full name
+    """
+    names = [name for name, abbreviation in TEAM_ABBREVIATIONS.items() if abbreviation == team.upper()]
+    return names or [team]
@@ -1,29 +1,268 @@
-from pathlib import Path
-import pandas as pd
-BASE_DIR = Path(__file__).resolve().parent.parent  # repo root
-PLAYER_DATA_DIR = BASE_DIR / "player_data"
+import mmap
+import time
+import threading
+from functools import lru_cache
+try:
+    import fcntl  # POSIX only: serializes snapshot rebuilds across worker processes
+except ImportError:
+    fcntl = None
+from snapshot import (
+    ARTIFACT_FILES, DATA_FILES, DELIVERY_STORE_PATH, GAME_LOGS_PATH, MATCH_ARCHIVE_PATH, MATCHUPS_PATH, PLAYER_DATA_DIR, SNAPSHOT_PATH, Snapshot, SnapshotError, compute_data_version,
+    encode_snapshot, filter_key, normalize_name, write_snapshot
+)
+import snapshot as snapshot_format
+from metrics import record_timing
+from search_index import search
 
-def load_data():
-    """Load CSV data with error handling"""
+# Seconds spent on each stage of loading the data, for the startup report
+startup_timings = {}
+
+# Seconds between checks for a snapshot written by another worker or the pipeline
+SNAPSHOT_POLL_INTERVAL = 2.0
+
+def encode_json(content):
+    """snapshot.encode_json, timed as the serialize stage of the current request"""
+    start = time.perf_counter()
+    body = snapshot_format.encode_json(content)
+    record_timing("serialize", time.perf_counter() - start)
+    return body
+
+class Dataset:
+    """One version of the served data: a snapshot of pre-encoded responses and lookup indexes"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+        # Encoded /search, /splits and scorecard responses for this version only; dropped along with it on reload
+        self.search_response = lru_cache(maxsize=4096)(self.encode_search_response)
+        self.splits_response = lru_cache(maxsize=512)(self.encode_splits_response)
+        self.scorecard_response = lru_cache(maxsize=256)(self.encode_scorecard_response)
+        self._artifacts = {}
+        self._artifacts_lock = threading.Lock()
+
+    def get(self, table, key):
+        """Pre-encoded response bytes for key in table, or None"""
+        return self.snapshot.get(table, key)
+
+    def view(self, table, key):
+        """Zero-copy view of a packed value in table, or None"""
+        return self.snapshot.view(table, key)
+
+    def get_many(self, table, keys):
+        """{key: pre-encoded response bytes or None} for several keys in table"""
+        return self.snapshot.get_many(table, keys)
+
+    def encode_search_response(self, query, limit):
+        """Encoded autocomplete matches for an already folded query, best first"""
+        return encode_json({"query": query, "results": search(self.snapshot, query, limit)})
+
+    def load_artifact(self, path, load):
+        """
+        Load an on-demand pipeline artifact once for this version (None if
+        it has not been built). The loaders import NumPy themselves, so it
+        stays off the startup path.
+        """
+        with self._artifacts_lock:
+            if path not in self._artifacts:
+                self._artifacts[path] = load(path) if path.exists() else None
+            return self._artifacts[path]
+
+    @property
+    def splits_engine(self):
+        """Splits engine over the delivery store"""
+        def load(path):
+            from splits import SplitsEngine, load_store
+            return SplitsEngine(load_store(path))
+        return self.load_artifact(DELIVERY_STORE_PATH, load)
+
+    @property
+    def matchup_index(self):
+        """Head-to-head index over the batter x bowler matrix"""
+        def load(path):
+            from matchups import MatchupIndex, load_matchups
+            return MatchupIndex(load_matchups(path))
+        return self.load_artifact(MATCHUPS_PATH, load)
+
+    @property
+    def game_log_index(self):
+        """Per-innings game logs with prefix sums"""
+        def load(path):
+            from game_logs import GameLogIndex, load_game_logs
+            return GameLogIndex(load_game_logs(path))
+        return self.load_artifact(GAME_LOGS_PATH, load)
+
+    @property
+    def match_archive(self):
+        """Packed, memory-mapped archive of the raw match files"""
+        def load(path):
+            from match_archive import open_match_archive
+            return open_match_archive(path)
+        return self.load_artifact(MATCH_ARCHIVE_PATH, load)
+
+    def encode_splits_response(self, player_key, by, season):
+        """Encoded splits for a normalized player name, or None if the player has no deliveries"""
+        splits = self.splits_engine.splits(player_key, by, season)
+        return encode_json(splits) if splits is not None else None
+
+    def encode_scorecard_response(self, match_id):
+        """Encoded scorecard of one match, or None if the archive has no such match"""
+        from match_archive import render_scorecard
+        match = self.match_archive.match(match_id)
+        return encode_json(render_scorecard(match_id, match)) if match is not None else None
+
+def open_snapshot(path):
+    """
+    Memory-map a snapshot file read-only. Every worker process maps the
+    same file, so the data lives once in the OS page cache instead of
+    once per process, and pages are only read in as lookups touch them.
+    """
+    with open(path, "rb") as f:
+        return Snapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+def load_dataset(data_dir=PLAYER_DATA_DIR, snapshot_path=SNAPSHOT_PATH):
+    """
+    Load the served data, preferring the binary snapshot written by
+    build_snapshot.py. If it is missing or older than the CSVs, the tables
+    are built from the CSVs with pandas (imported only then) and the
+    snapshot is rewritten so the next start (and every other worker) can
+    map it. Returns None if the pipeline has not been run.
+    """
+    start = time.perf_counter()
+    version = compute_data_version(data_dir)
+    try:
+        snapshot = open_snapshot(snapshot_path)
+    except (FileNotFoundError, ValueError, SnapshotError):
+        snapshot = None
+    startup_timings["data load"] = time.perf_counter() - start
+    if snapshot is not None and snapshot.version == version:
+        return Dataset(snapshot)
+
+    print("Serving snapshot missing or out of date, building it from the CSVs...")
+    start = time.perf_counter()
+    lock_file = open(snapshot_path.with_name(snapshot_path.name + ".lock"), "a") if fcntl else None
+    try:
+        if lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # Another worker may have rebuilt it while we waited for the lock
+            try:
+                snapshot = open_snapshot(snapshot_path)
+                if snapshot.version == version:
+                    return Dataset(snapshot)
+            except (FileNotFoundError, ValueError, SnapshotError):
+                pass
+
+        from build_snapshot import build_tables
+        tables = build_tables(data_dir)
+        if tables is None:
+            return None
+        buffer = encode_snapshot(version, tables)
+        startup_timings["index build"] = time.perf_counter() - start
+        try:
+            write_snapshot(snapshot_path, buffer)
+            return Dataset(open_snapshot(snapshot_path))
+        except OSError as e:
+            # Read-only deployments still serve, from this process's own copy
+            print(f"Could not write serving snapshot: {e}")
+            return Dataset(Snapshot(buffer))
+    finally:
+        if lock_file:
+            lock_file.close()
+
+def startup_report(import_seconds):
+    """One line summarizing where startup time went, given the total time spent importing the app"""
+    stages = {"imports": import_seconds - sum(startup_timings.values()), **startup_timings}
+    return "Startup: " + ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in stages.items())
+
+# The active dataset. Requests read it once through current_dataset() and keep
+# that object, so a reload never changes the data under an in-flight request
+dataset = load_dataset()
+reload_lock = threading.Lock()
+
+def current_dataset():
+    """The dataset new requests should be served from"""
+    return dataset
+
+def current_version():
+    """Version of the active dataset, reported on every data response"""
+    return dataset.version if dataset is not None else compute_data_version()
+
+def reload_dataset():
+    """
+    Load the data again and, if its version changed, swap it in. The new
+    snapshot and indexes are fully built before the single reference
+    assignment that publishes them. Returns True if a new version is active.
+    """
+    global dataset
+    with reload_lock:
+        if dataset is not None and compute_data_version() == dataset.version:
+            return False
+        new_dataset = load_dataset()
+        if new_dataset is None:
+            return False
+        dataset = new_dataset
+        print(f"Data reloaded: now serving version {dataset.version}")
+        return True
+
+def data_files_signature():
+    """Size and mtime of every served data file, to notice when the pipeline writes new output"""
+    signature = []
+    for name in DATA_FILES + ARTIFACT_FILES:
+        try:
+            stat = (PLAYER_DATA_DIR / name).stat()
+            signature.append((name, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append((name, None, None))
+    return signature
+
+def snapshot_signature():
+    """Identity of the snapshot file on disk; reloading or rerunning the pipeline replaces it"""
     try:
-        batting_df = pd.read_csv(PLAYER_DATA_DIR / "batting_stats.csv")
-        bowling_df = pd.read_csv(PLAYER_DATA_DIR / "bowling_stats.csv")
-        career_batting_df = pd.read_csv(PLAYER_DATA_DIR / "career_batting_stats.csv")
-        career_bowling_df = pd.read_csv(PLAYER_DATA_DIR /"career_bowling_stats.csv")
-        
-        print("Data loaded successfully!")
-        print(f"batting_df: {batting_df.shape}, columns: {batting_df.columns.tolist()}")
-        print(f"bowling_df: {bowling_df.shape}, columns: {bowling_df.columns.tolist()}")
-        print(f"career_batting_df: {career_batting_df.shape}, columns: {career_batting_df.columns.tolist()}")
-        print(f"career_bowling_df: {career_bowling_df.shape}, columns: {career_bowling_df.columns.tolist()}")
-        return batting_df, bowling_df, career_batting_df, career_bowling_df
-    except FileNotFoundError as e:
-        print(f"Error: CSV files not found. Please run the data processing scripts first.")
-        print(f"Missing file: {e}")
-        return None, None, None, None
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        return None, None, None, None
-
-# Load data when module is imported
-batting_df, bowling_df, career_batting_df, career_bowling_df = load_data()
\ No newline at end of file
+        stat = SNAPSHOT_PATH.stat()
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def follow_snapshot(interval=SNAPSHOT_POLL_INTERVAL):
+    """
+    Poll serving.snap every interval seconds in a daemon thread and reload
+    when another process replaces it. A reload only swaps the dataset of
+    the worker that runs it, but it also rewrites the snapshot, so this is
+    how the other workers of a multi-worker server catch up. One stat()
+    per interval; the data is only hashed when the file changed.
+    """
+    def follow():
+        last = snapshot_signature()
+        while True:
+            time.sleep(interval)
+            signature = snapshot_signature()
+            if signature == last:
+                continue
+            last = signature
+            try:
+                reload_dataset()
+            except Exception as e:
+                print(f"Error reloading data: {e}")
+
+    threading.Thread(target=follow, name="snapshot-follower", daemon=True).start()
+
+def watch_data(interval):
+    """Poll player_data/ every interval seconds in a daemon thread and reload when it changes"""
+    def watch():
+        last = data_files_signature()
+        changed = False
+        while True:
+            time.sleep(interval)
+            signature = data_files_signature()
+            if signature != last:
+                # Wait for one quiet interval, so a pipeline run that is still
+                # writing its CSVs is not loaded half-finished
+                last, changed = signature, True
+            elif changed:
+                changed = False
+                try:
+                    reload_dataset()
+                except Exception as e:
+                    # Keep serving the current version; a later change retries
+                    print(f"Error reloading data: {e}")
+
+    threading.Thread(target=watch, name="data-watcher", daemon=True).start()
@@ -0,0 +1,57 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from data_loader import current_dataset, encode_json
+
+router = APIRouter()
+
+def get_game_log_index():
+    """The active dataset's game log index, or a 500 if it has not been built"""
+    dataset = current_dataset()
+    if dataset is None:
+        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    index = dataset.game_log_index
+    if index is None:
+        raise HTTPException(status_code=500, detail="Game logs not built. Please run parse_and_aggregate.py --columnar first.")
+    return index
+
+def get_person(index, player_name: str) -> int:
+    person = index.person(player_name)
+    if person is None:
+        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
+    return person
+
+def iso(day: Optional[date]):
+    return day.isoformat() if day is not None else None
+
+@router.get("/player/{player_name}/log")
+def get_player_log(
+    player_name: str,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to")
+):
+    """Get a player's innings-by-innings log between two dates (inclusive), with batting and bowling totals"""
+    index = get_game_log_index()
+    person = get_person(index, player_name)
+    return Response(content=encode_json({
+        "player": index.names[person],
+        "from": iso(date_from),
+        "to": iso(date_to),
+        **index.log(person, iso(date_from), iso(date_to))
+    }), media_type="application/json")
+
+@router.get("/player/{player_name}/form")
+def get_player_form(
+    player_name: str,
+    innings: int = Query(10, ge=1, le=100),
+    date_to: Optional[date] = Query(None, alias="to")
+):
+    """Get a player's form: totals over their last N batting and last N bowling innings, as of a date"""
+    index = get_game_log_index()
+    person = get_person(index, player_name)
+    return Response(content=encode_json({
+        "player": index.names[person],
+        "innings": innings,
+        "to": iso(date_to),
+        **index.form(person, innings, iso(date_to))
+    }), media_type="application/json")
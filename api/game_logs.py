@@ -0,0 +1,142 @@
+import numpy as np
+from npz import map_npz
+from snapshot import normalize_name
+
+# Counting columns with prefix sums in game_logs.npz
+TOTALS = ("runs", "balls_faced", "fours", "sixes", "dismissed", "batted",
+          "balls_bowled", "runs_conceded", "wickets_taken", "bowled")
+# Columns a log row is built from
+ROW_COLUMNS = TOTALS + ("match_id", "season", "venue", "team", "opponent", "innings", "dismissal_kind")
+
+def load_game_logs(path):
+    """Memory-map the game logs written by parse_and_aggregate.py --columnar"""
+    return map_npz(path)
+
+def rate(numerator, denominator, scale=1):
+    """numerator * scale / denominator rounded to 2 places, or None when undefined"""
+    return round(numerator * scale / denominator, 2) if denominator else None
+
+class GameLogIndex:
+    """
+    Per-innings game logs with running totals. A player's rows are one
+    contiguous, date-ordered range, so a date window is two binary
+    searches within it and its totals are differences of the prefix sums;
+    the last N innings are found the same way on the innings counts. The
+    columns stay memory-mapped; a request converts only its own rows.
+    """
+
+    def __init__(self, logs):
+        self.logs = logs
+        self.names = [str(name) for name in logs["person_name"]]
+        self.indptr = logs["person_indptr"]
+        # Every name a person played under resolves to them; the person with
+        # more innings wins when two people share a name
+        activity = np.diff(logs["person_indptr"])
+        self.people = {}
+        for alias, person in sorted(zip(logs["alias_name"], logs["alias_person"]), key=lambda item: activity[item[1]]):
+            self.people[normalize_name(str(alias))] = int(person)
+        self.dates = logs["date"]
+        self.cum = {name: logs[f"cum_{name}"] for name in TOTALS}
+        self.venue_names = logs["venue_name"].tolist()
+        self.team_names = logs["team_name"].tolist()
+        self.wicket_kinds = logs["wicket_kind_name"].tolist()
+
+    def person(self, player_name):
+        """Person index for a player name or alias, or None"""
+        return self.people.get(normalize_name(player_name))
+
+    def window(self, person, date_from=None, date_to=None):
+        """Row range [start, end) of a person's innings between two ISO dates, both inclusive"""
+        start, end = int(self.indptr[person]), int(self.indptr[person + 1])
+        if date_from is not None:
+            start += int(np.searchsorted(self.dates[start:end], np.datetime64(date_from), "left"))
+        if date_to is not None:
+            end = start + int(np.searchsorted(self.dates[start:end], np.datetime64(date_to), "right"))
+        return start, end
+
+    def totals(self, start, end):
+        """Batting and bowling totals over rows [start, end), from the prefix sums"""
+        total = {name: int(self.cum[name][end] - self.cum[name][start]) for name in TOTALS}
+        batting = {
+            "innings": total["batted"],
+            "runs": total["runs"],
+            "balls": total["balls_faced"],
+            "4s": total["fours"],
+            "6s": total["sixes"],
+            "dismissals": total["dismissed"],
+            "average": rate(total["runs"], total["dismissed"]),
+            "strike_rate": rate(total["runs"], total["balls_faced"], 100),
+        }
+        bowling = {
+            "innings": total["bowled"],
+            "balls": total["balls_bowled"],
+            "runs_conceded": total["runs_conceded"],
+            "wickets": total["wickets_taken"],
+            "economy": rate(total["runs_conceded"], total["balls_bowled"], 6),
+            "average": rate(total["runs_conceded"], total["wickets_taken"]),
+            "strike_rate": rate(total["balls_bowled"], total["wickets_taken"]),
+        }
+        return batting, bowling
+
+    def rows(self, start, end):
+        """Innings [start, end) of the log; batting or bowling is None if the player did not bat or bowl"""
+        logs = self.logs
+        # One slice and conversion per column instead of one NumPy lookup per value
+        columns = {name: logs[name][start:end].tolist() for name in ROW_COLUMNS}
+        dates = self.dates[start:end].astype(str).tolist()
+        rows = []
+        for i in range(end - start):
+            row = {
+                "match_id": columns["match_id"][i],
+                "date": dates[i],
+                "season": columns["season"][i],
+                "venue": self.venue_names[columns["venue"][i]],
+                "team": self.team_names[columns["team"][i]],
+                "opponent": self.team_names[columns["opponent"][i]],
+                "innings": columns["innings"][i],
+                "batting": None,
+                "bowling": None,
+            }
+            if columns["batted"][i]:
+                kind = columns["dismissal_kind"][i]
+                row["batting"] = {
+                    "runs": columns["runs"][i],
+                    "balls": columns["balls_faced"][i],
+                    "4s": columns["fours"][i],
+                    "6s": columns["sixes"][i],
+                    "dismissal": self.wicket_kinds[kind] if kind >= 0 else None,
+                }
+            if columns["bowled"][i]:
+                row["bowling"] = {
+                    "balls": columns["balls_bowled"][i],
+                    "runs_conceded": columns["runs_conceded"][i],
+                    "wickets": columns["wickets_taken"][i],
+                }
+            rows.append(row)
+        return rows
+
+    def log(self, person, date_from=None, date_to=None):
+        """A person's innings between two ISO dates (inclusive), oldest first, with their totals"""
+        start, end = self.window(person, date_from, date_to)
+        batting, bowling = self.totals(start, end)
+        return {"batting": batting, "bowling": bowling, "innings": self.rows(start, end)}
+
+    def last_innings(self, person, counter, n, date_to=None):
+        """Row range of a person's last n innings counted by counter ('batted' or 'bowled') up to date_to"""
+        start, end = self.window(person, None, date_to)
+        cum = self.cum[counter]
+        # The row holding the (count - n + 1)th innings, if the person has that many
+        first = start + int(np.searchsorted(cum[start:end + 1], cum[end] - n, "right")) - 1
+        return max(first, start), end
+
+    def form(self, person, n, date_to=None):
+        """Totals over a person's last n batting and last n bowling innings up to date_to, with each innings"""
+        form = {}
+        for role, counter in (("batting", "batted"), ("bowling", "bowled")):
+            start, end = self.last_innings(person, counter, n, date_to)
+            form[role] = self.totals(start, end)[role == "bowling"]
+            form[role]["recent"] = [
+                {"match_id": row["match_id"], "date": row["date"], "opponent": row["opponent"], **row[role]}
+                for row in self.rows(start, end) if row[role] is not None
+            ]
+        return form
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from data_loader import current_dataset, encode_json, filter_key
+from leaderboards import ALL_TIME, METRICS, board_page
+
+router = APIRouter()
+
+@router.get("/leaderboards/{scope}/{metric}")
+def get_leaderboard(
+    scope: str,
+    metric: str,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    min_balls: int = Query(0, ge=0),
+    min_innings: int = Query(0, ge=0)
+):
+    """
+    Get one page of a season ('2016') or 'all-time' leaderboard for runs,
+    average, strike_rate, sixes, wickets or economy, optionally limited to
+    players with at least min_balls balls and min_innings innings
+    """
+    dataset = current_dataset()
+    if dataset is None:
+        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    if metric not in METRICS:
+        raise HTTPException(status_code=404, detail=f"Unknown metric '{metric}'. Choose from: {', '.join(METRICS)}")
+    
+    board = dataset.view("leaderboards", filter_key(scope.lower(), metric))
+    if board is None:
+        raise HTTPException(status_code=404, detail=f"No data found for season {scope}")
+    
+    rows, next_offset = board_page(board, offset, limit, min_balls, min_innings)
+    header = encode_json({
+        "scope": ALL_TIME if scope.lower() == ALL_TIME else int(scope),
+        "metric": metric,
+        "stats": METRICS[metric][0],
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset,
+        "leaderboard": []
+    })
+    # Splice the pre-encoded rows into the empty list closing the header
+    return Response(content=header[:-2] + b",".join(rows) + b"]}", media_type="application/json")
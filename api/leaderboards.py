@@ -0,0 +1,71 @@
+import struct
+
+# metric -> (stats the board ranks, ascending). "average" and "strike_rate"
+# rank batters; "economy" ranks bowlers. Qualification filters apply to balls
+# faced/innings batted on batting boards and balls/innings bowled on bowling ones.
+METRICS = {
+    "runs": ("batting", False),
+    "average": ("batting", False),
+    "strike_rate": ("batting", False),
+    "sixes": ("batting", False),
+    "wickets": ("bowling", False),
+    "economy": ("bowling", True),
+}
+
+ALL_TIME = "all-time"
+
+# A board is one packed block with its rows already in rank order:
+#   uint32 count | count x (uint32 balls, uint32 innings) |
+#   (count + 1) x uint32 row offsets | row JSON bytes
+# Row JSON omits the rank, which depends on the qualification filters and is
+# spliced in when a page is served.
+QUALIFIERS = struct.Struct("<II")
+OFFSET = struct.Struct("<I")
+
+def encode_board(rows):
+    """Pack (balls, innings, row JSON bytes) tuples, already in rank order, into a board block"""
+    offsets = [0]
+    for _, _, row in rows:
+        offsets.append(offsets[-1] + len(row))
+    return b"".join([
+        OFFSET.pack(len(rows)),
+        *(QUALIFIERS.pack(balls, innings) for balls, innings, _ in rows),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        *(row for _, _, row in rows)
+    ])
+
+def board_page(board, offset, limit, min_balls=0, min_innings=0):
+    """
+    Return (rows, next_offset) for one page of a board: up to limit
+    encoded rows with their rank, after skipping the first offset
+    qualifying rows. next_offset is None on the last page.
+
+    Without qualification filters a page is a direct slice of the
+    precomputed order, so its cost depends only on limit. With filters,
+    rows are walked in rank order only until the page is full.
+    """
+    (count,) = OFFSET.unpack_from(board, 0)
+    offsets_start = OFFSET.size + QUALIFIERS.size * count
+    rows_start = offsets_start + OFFSET.size * (count + 1)
+
+    def ranked_row(rank, i):
+        start, end = struct.unpack_from("<2I", board, offsets_start + OFFSET.size * i)
+        return b'{"rank":%d,' % rank + bytes(board[rows_start + start + 1:rows_start + end])
+
+    if not min_balls and not min_innings:
+        end = min(offset + limit, count)
+        return [ranked_row(i + 1, i) for i in range(offset, end)], (end if end < count else None)
+
+    page = []
+    qualifying = 0
+    for i in range(count):
+        balls, innings = QUALIFIERS.unpack_from(board, OFFSET.size + QUALIFIERS.size * i)
+        if balls < min_balls or innings < min_innings:
+            continue
+        if qualifying >= offset + limit:
+            # At least one more qualifying row lies past this page
+            return page, offset + limit
+        qualifying += 1
+        if qualifying > offset:
+            page.append(ranked_row(qualifying, i))
+    return page, None
@@ -1,9 +1,41 @@
+import os
+import time
+import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import data_loader
+from http_cache import HTTPCacheMiddleware
+from metrics import MetricsMiddleware
 from player_routes import router
+from team_routes import router as team_router
+from leaderboard_routes import router as leaderboard_router
+from matchup_routes import router as matchup_router
+from game_log_routes import router as game_log_router
+from match_routes import router as match_router
+from admin_routes import router as admin_router
+from metrics_routes import router as metrics_router
+
+print(data_loader.startup_report(time.perf_counter() - import_started))
 
 app = FastAPI()
 app.include_router(router)
+app.include_router(team_router)
+app.include_router(leaderboard_router)
+app.include_router(matchup_router)
+app.include_router(game_log_router)
+app.include_router(match_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+
+# Pick up new pipeline output without a restart (seconds between checks of player_data/)
+if os.environ.get("IPL_RELOAD_INTERVAL"):
+    data_loader.watch_data(float(os.environ["IPL_RELOAD_INTERVAL"]))
+# Follow snapshots published by other workers' reloads, so every worker serves the same version
+data_loader.follow_snapshot()
+
+# ETags, Cache-Control and precompressed bodies keyed by the dataset version
+app.add_middleware(HTTPCacheMiddleware, get_version=data_loader.current_version, routes=app.routes)
 
 # Add CORS middleware
 app.add_middleware(
@@ -14,6 +46,10 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Outermost, so it times the CORS, cache and route layers together: per-route
+# histograms for /metrics and a Server-Timing header on every response
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+
 @app.get("/")
 def root():
     return {"message": "Welcome to IPL Reference API!"}
\ No newline at end of file
@@ -0,0 +1,283 @@
+import os
+import json
+import mmap
+import zlib
+import hashlib
+import argparse
+import tempfile
+try:
+    # pipeline.py imports this module from the repo root as api.match_archive
+    from .cricsheet import BOWLER_WICKET_KINDS, normalize_season, team_names
+    from .snapshot import (
+        MATCH_ARCHIVE_PATH, RAW_DATA_DIR, Snapshot, encode_json, filter_key, normalize_name, snapshot_chunks,
+        write_snapshot_chunks
+    )
+except ImportError:
+    # The API (and this module's command line) run from api/
+    from cricsheet import BOWLER_WICKET_KINDS, normalize_season, team_names
+    from snapshot import (
+        MATCH_ARCHIVE_PATH, RAW_DATA_DIR, Snapshot, encode_json, filter_key, normalize_name, snapshot_chunks,
+        write_snapshot_chunks
+    )
+
+# Packed match archive: every CricSheet match file in ipl_data/, compacted and
+# optionally zlib-compressed per match, in the snapshot's sorted key -> bytes
+# table layout. A scorecard then costs one binary search and one byte range
+# of a memory-mapped file instead of opening and parsing a JSON file.
+#
+# Tables:
+#   matches    match id -> match JSON (raw, or zlib-compressed when built with --compress)
+#   by_date    date|match id -> match summary
+#   by_season  season|date|match id -> match summary
+#   by_team    normalized team|date|match id -> match summary (one entry per team)
+ARCHIVE_MAGIC = b"IPLMATCH"
+ARCHIVE_FORMAT = 1
+
+# Retirements that are not wickets at all
+NOT_OUT_KINDS = ("retired hurt", "retired not out")
+
+def match_summary(match_id, info):
+    """The small per-match record stored in every index"""
+    return {
+        "match_id": match_id,
+        "date": info["dates"][0],
+        "season": normalize_season(info["season"]),
+        "teams": info["teams"],
+        "venue": info["venue"],
+        "result": result_text(info.get("outcome", {})),
+    }
+
+class MatchArchiveBuilder:
+    """
+    Collects matches into archive tables, one parsed match file at a time.
+    Each match body is appended to an anonymous spool file next to the
+    archive as it arrives and only its (offset, length) is kept, so memory
+    holds the small summary indexes rather than every match.
+    """
+
+    def __init__(self, compress=False, spool_dir=None):
+        self.compress = compress
+        self.digest = hashlib.sha256()
+        self.spool = tempfile.TemporaryFile(dir=spool_dir or MATCH_ARCHIVE_PATH.parent)
+        self.spooled = 0
+        self.tables = {"matches": {}, "by_date": {}, "by_season": {}, "by_team": {}}
+
+    def add(self, match_id, raw, match):
+        """Add one match from its file contents and parsed JSON"""
+        self.digest.update(match_id.encode("utf-8"))
+        self.digest.update(raw)
+        body = encode_json(match)
+        if self.compress:
+            body = zlib.compress(body, 6)
+        self.spool.write(body)
+        self.tables["matches"][match_id] = (self.spooled, len(body))
+        self.spooled += len(body)
+
+        summary = match_summary(match_id, match["info"])
+        encoded = encode_json(summary)
+        self.tables["by_date"][filter_key(summary["date"], match_id)] = encoded
+        self.tables["by_season"][filter_key(summary["season"], summary["date"], match_id)] = encoded
+        for team in summary["teams"]:
+            self.tables["by_team"][filter_key(normalize_name(team), summary["date"], match_id)] = encoded
+
+    def read_spooled(self, offset, length):
+        self.spool.seek(offset)
+        return self.spool.read(length)
+
+    def write(self, path=MATCH_ARCHIVE_PATH):
+        """Write the archive atomically, streaming match bodies from the spool; the version is a hash of the source files"""
+        version = self.digest.hexdigest()[:16]
+        chunks = snapshot_chunks(version, self.tables, magic=ARCHIVE_MAGIC, format=ARCHIVE_FORMAT, read=self.read_spooled)
+        write_snapshot_chunks(path, chunks)
+        self.spool.close()
+        return len(self.tables["matches"])
+
+def build_match_archive(data_dir=RAW_DATA_DIR, compress=False):
+    """Pack every match file in data_dir into a MatchArchiveBuilder"""
+    builder = MatchArchiveBuilder(compress)
+    for name in sorted(f for f in os.listdir(data_dir) if f.endswith(".json")):
+        with open(os.path.join(data_dir, name), "rb") as f:
+            raw = f.read()
+        builder.add(name[:-len(".json")], raw, json.loads(raw))
+    return builder
+
+def open_match_archive(path=MATCH_ARCHIVE_PATH):
+    """Memory-map a match archive read-only"""
+    with open(path, "rb") as f:
+        return MatchArchive(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+class MatchArchive:
+    """Read-only access to a packed match archive; only the bytes of the matches asked for are read"""
+
+    def __init__(self, buffer):
+        self.snapshot = Snapshot(buffer, magic=ARCHIVE_MAGIC, format=ARCHIVE_FORMAT)
+        self.version = self.snapshot.version
+
+    def match(self, match_id):
+        """The CricSheet JSON of one match, or None"""
+        body = self.snapshot.view("matches", match_id)
+        if body is None:
+            return None
+        # Compressed entries start with a zlib header, raw ones with '{'
+        return json.loads(bytes(body) if body[:1] == b"{" else zlib.decompress(body))
+
+    def matches(self, season=None, team=None, date=None):
+        """
+        Encoded summaries of matches by season, team (full name or
+        abbreviation) and/or date (YYYY-MM-DD), oldest first
+        """
+        if team is not None:
+            table, prefixes = "by_team", [filter_key(normalize_name(name), "") for name in team_names(team)]
+        elif season is not None:
+            table, prefixes = "by_season", [filter_key(season, "")]
+        else:
+            table, prefixes = "by_date", [""]
+        found = []
+        for prefix in prefixes:
+            for key, value in self.snapshot.table(table).scan_prefix(prefix):
+                parts = key.split("|")
+                if season is not None and table == "by_team" and not parts[1].startswith(str(season)):
+                    continue
+                if date is not None and parts[-2] != date:
+                    continue
+                found.append((parts[-2], parts[-1], value))
+        # A franchise that was renamed spans several prefixes; keep date order across them
+        if len(prefixes) > 1:
+            found.sort(key=lambda item: item[:2])
+        return [value for _, _, value in found]
+
+def overs_text(balls, balls_per_over=6):
+    """Legal balls as cricket overs, e.g. 118 -> '19.4'"""
+    return f"{balls // balls_per_over}.{balls % balls_per_over}" if balls % balls_per_over else str(balls // balls_per_over)
+
+def result_text(outcome):
+    """One-line match result from a CricSheet outcome"""
+    if "winner" in outcome:
+        text = f"{outcome['winner']} won"
+        for unit, margin in outcome.get("by", {}).items():
+            text += f" by {margin} {unit if margin != 1 else unit.rstrip('s')}"
+        if outcome.get("method"):
+            text += f" ({outcome['method']})"
+        return text
+    if outcome.get("result") == "tie":
+        return f"Match tied ({outcome['eliminator']} won the super over)" if outcome.get("eliminator") else "Match tied"
+    return (outcome.get("result") or "no result").capitalize()
+
+def fielder_names(wicket):
+    return [
+        f"sub ({fielder['name']})" if fielder.get("substitute") else fielder["name"]
+        for fielder in wicket.get("fielders", []) if "name" in fielder
+    ]
+
+def dismissal_text(wicket, bowler):
+    """Scorecard description of a dismissal, e.g. 'c Kohli b Chahal'"""
+    kind, fielders = wicket["kind"], fielder_names(wicket)
+    if kind == "caught":
+        return f"c {fielders[0]} b {bowler}" if fielders else f"c ? b {bowler}"
+    if kind == "caught and bowled":
+        return f"c & b {bowler}"
+    if kind == "bowled":
+        return f"b {bowler}"
+    if kind == "lbw":
+        return f"lbw b {bowler}"
+    if kind == "stumped":
+        return f"st {fielders[0]} b {bowler}" if fielders else f"st ? b {bowler}"
+    if kind == "hit wicket":
+        return f"hit wicket b {bowler}"
+    if kind == "run out":
+        return f"run out ({'/'.join(fielders)})" if fielders else "run out"
+    return kind
+
+def render_innings(innings, squad, balls_per_over):
+    """Batting and bowling card, extras, total and fall of wickets of one innings"""
+    batting, bowling, fall = {}, {}, []
+    extras = {"byes": 0, "legbyes": 0, "wides": 0, "noballs": 0, "penalty": 0}
+    runs = wickets = balls = 0
+
+    def batter_row(name):
+        return batting.setdefault(name, {"batter": name, "dismissal": "not out", "runs": 0, "balls": 0, "4s": 0, "6s": 0})
+
+    for over in innings["overs"]:
+        over_balls = {}
+        for delivery in over["deliveries"]:
+            batter = batter_row(delivery["batter"])
+            batter_row(delivery["non_striker"])
+            bowler = bowling.setdefault(delivery["bowler"], {
+                "bowler": delivery["bowler"], "balls": 0, "maidens": 0, "runs": 0, "wickets": 0, "wides": 0, "noballs": 0
+            })
+            delivery_extras = delivery.get("extras", {})
+            for kind in extras:
+                extras[kind] += delivery_extras.get(kind, 0)
+            hit = delivery["runs"]["batter"]
+            runs += delivery["runs"]["total"]
+            conceded = hit + delivery_extras.get("wides", 0) + delivery_extras.get("noballs", 0)
+            bowler["runs"] += conceded
+            bowler["wides"] += 1 if "wides" in delivery_extras else 0
+            bowler["noballs"] += 1 if "noballs" in delivery_extras else 0
+            legal = "wides" not in delivery_extras and "noballs" not in delivery_extras
+            bowler["balls"] += legal
+            balls += legal
+            legal_balls, over_conceded = over_balls.get(delivery["bowler"], (0, 0))
+            over_balls[delivery["bowler"]] = (legal_balls + legal, over_conceded + conceded)
+            if "wides" not in delivery_extras:
+                batter["balls"] += 1
+            batter["runs"] += hit
+            batter["4s"] += hit == 4
+            batter["6s"] += hit == 6
+
+            for wicket in delivery.get("wickets", []):
+                batter_row(wicket["player_out"])["dismissal"] = dismissal_text(wicket, delivery["bowler"])
+                if wicket["kind"] in BOWLER_WICKET_KINDS:
+                    bowler["wickets"] += 1
+                if wicket["kind"] not in NOT_OUT_KINDS:
+                    wickets += 1
+                    fall.append({
+                        "wicket": wickets, "score": runs, "batter": wicket["player_out"],
+                        "over": overs_text(balls, balls_per_over)
+                    })
+        # A maiden is a full over from one bowler that conceded nothing
+        for name, (legal_balls, over_conceded) in over_balls.items():
+            if legal_balls == balls_per_over and over_conceded == 0:
+                bowling[name]["maidens"] += 1
+
+    for row in batting.values():
+        row["strike_rate"] = round(row["runs"] * 100 / row["balls"], 2) if row["balls"] else None
+    for row in bowling.values():
+        bowled = row.pop("balls")
+        row["overs"] = overs_text(bowled, balls_per_over)
+        row["economy"] = round(row["runs"] * balls_per_over / bowled, 2) if bowled else None
+    target = innings.get("target")
+    return {
+        "team": innings["team"],
+        "super_over": innings.get("super_over", False),
+        "batting": list(batting.values()),
+        "did_not_bat": [player for player in squad if player not in batting],
+        "extras": {**extras, "total": sum(extras.values())},
+        "total": {"runs": runs, "wickets": wickets, "overs": overs_text(balls, balls_per_over)},
+        "target": {"runs": target.get("runs"), "overs": target.get("overs")} if target else None,
+        "fall_of_wickets": fall,
+        "bowling": list(bowling.values()),
+    }
+
+def render_scorecard(match_id, match):
+    """Full scorecard of one CricSheet match"""
+    info = match["info"]
+    balls_per_over = info.get("balls_per_over", 6)
+    players = info.get("players", {})
+    return {
+        **match_summary(match_id, info),
+        "city": info.get("city"),
+        "toss": info.get("toss"),
+        "player_of_match": info.get("player_of_match", []),
+        "innings": [
+            render_innings(innings, players.get(innings["team"], []), balls_per_over)
+            for innings in match["innings"]
+        ],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack ipl_data/ into the match archive served by the API")
+    parser.add_argument("--compress", action="store_true", help="zlib-compress each match (smaller file, a little slower per cold scorecard)")
+    args = parser.parse_args()
+    count = build_match_archive(compress=args.compress).write()
+    print(f"Packed {count} matches into {MATCH_ARCHIVE_PATH} ({MATCH_ARCHIVE_PATH.stat().st_size / 1e6:.1f} MB)")
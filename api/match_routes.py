@@ -0,0 +1,35 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from data_loader import current_dataset
+
+router = APIRouter()
+
+def get_dataset_with_archive():
+    """The active dataset, or a 500 if it or its match archive has not been built"""
+    dataset = current_dataset()
+    if dataset is None:
+        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    if dataset.match_archive is None:
+        raise HTTPException(status_code=500, detail="Match archive not built. Please run api/match_archive.py first.")
+    return dataset
+
+@router.get("/matches")
+def get_matches(
+    season: Optional[int] = None,
+    team: Optional[str] = None,
+    match_date: Optional[date] = Query(None, alias="date")
+):
+    """Get match summaries, oldest first, optionally for one season, team (full name or abbreviation) and/or date"""
+    archive = get_dataset_with_archive().match_archive
+    summaries = archive.matches(season, team, match_date.isoformat() if match_date is not None else None)
+    return Response(content=b'{"matches":[' + b",".join(summaries) + b"]}", media_type="application/json")
+
+@router.get("/match/{match_id}/scorecard")
+def get_scorecard(match_id: str):
+    """Get a match's full scorecard: batting and bowling cards, extras, totals and fall of wickets"""
+    scorecard = get_dataset_with_archive().scorecard_response(match_id)
+    if scorecard is None:
+        raise HTTPException(status_code=404, detail=f"Match '{match_id}' not found")
+    
+    return Response(content=scorecard, media_type="application/json")
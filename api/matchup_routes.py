@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from data_loader import current_dataset, encode_json
+
+router = APIRouter()
+
+# Sort options -> matrix stat (kept in step with matchups.MATCHUP_STATS, which
+# is not imported here so NumPy stays off the startup path)
+SORTS = {"balls": "balls", "runs": "runs", "dots": "dots", "dismissals": "dismissals", "4s": "fours", "6s": "sixes"}
+ROLES = ("batter", "bowler")
+
+def get_matchup_index():
+    """The active dataset's matchup index, or a 500 if it has not been built"""
+    dataset = current_dataset()
+    if dataset is None:
+        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    index = dataset.matchup_index
+    if index is None:
+        raise HTTPException(status_code=500, detail="Matchup data not built. Please run parse_and_aggregate.py --columnar first.")
+    return index
+
+def get_person(index, player_name: str) -> int:
+    person = index.person(player_name)
+    if person is None:
+        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
+    return person
+
+@router.get("/matchup/{batter}/{bowler}")
+def get_matchup(batter: str, bowler: str):
+    """Get head-to-head stats for a batter against a bowler"""
+    index = get_matchup_index()
+    batter_person, bowler_person = get_person(index, batter), get_person(index, bowler)
+    return Response(content=encode_json({
+        "batter": index.names[batter_person],
+        "bowler": index.names[bowler_person],
+        **index.matchup(batter_person, bowler_person)
+    }), media_type="application/json")
+
+@router.get("/player/{player_name}/matchups")
+def get_player_matchups(
+    player_name: str,
+    role: str = "batter",
+    sort: str = "balls",
+    limit: int = Query(10, ge=1, le=100)
+):
+    """Get a player's top matchups as a batter (against bowlers) or as a bowler (against batters)"""
+    if role not in ROLES:
+        raise HTTPException(status_code=400, detail=f"Unknown role '{role}'. Choose from: {', '.join(ROLES)}")
+    if sort not in SORTS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort '{sort}'. Choose from: {', '.join(SORTS)}")
+    
+    index = get_matchup_index()
+    person = get_person(index, player_name)
+    return Response(content=encode_json({
+        "player": index.names[person],
+        "role": role,
+        "sort": sort,
+        "matchups": index.top(person, role, SORTS[sort], limit)
+    }), media_type="application/json")
@@ -0,0 +1,61 @@
+import numpy as np
+from npz import map_npz
+from snapshot import normalize_name
+
+MATCHUP_STATS = ("balls", "runs", "dots", "fours", "sixes", "dismissals")
+
+def load_matchups(path):
+    """Memory-map the matchup matrix written by parse_and_aggregate.py --columnar"""
+    return map_npz(path)
+
+class MatchupIndex:
+    """
+    Head-to-head lookups over the sparse batter x bowler matrix. A pair is
+    a binary search within one CSR row; a player's matchups are that row
+    (as batter) or column (as bowler), so nothing scales with players².
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.names = [str(name) for name in matrix["person_name"]]
+        # Every name a person played under resolves to them; the most active
+        # person wins when two people share a name
+        activity = np.diff(matrix["indptr"]) + np.diff(matrix["bowler_indptr"])
+        self.people = {}
+        for alias, person in sorted(zip(matrix["alias_name"], matrix["alias_person"]), key=lambda item: activity[item[1]]):
+            self.people[normalize_name(str(alias))] = int(person)
+
+    def person(self, player_name):
+        """Person index for a player name or alias, or None"""
+        return self.people.get(normalize_name(player_name))
+
+    def row(self, pair):
+        """Stats of one stored pair, with rates derived"""
+        row = {stat: int(self.matrix[stat][pair]) for stat in MATCHUP_STATS}
+        row["4s"], row["6s"] = row.pop("fours"), row.pop("sixes")
+        row["strike_rate"] = round(row["runs"] * 100 / row["balls"], 2) if row["balls"] else None
+        row["average"] = round(row["runs"] / row["dismissals"], 2) if row["dismissals"] else None
+        return row
+
+    def matchup(self, batter, bowler):
+        """Head-to-head stats for two person indexes (all zeros if they never met)"""
+        indptr = self.matrix["indptr"]
+        start, end = int(indptr[batter]), int(indptr[batter + 1])
+        i = start + int(np.searchsorted(self.matrix["indices"][start:end], bowler))
+        if i < end and self.matrix["indices"][i] == bowler:
+            return self.row(i)
+        return {"balls": 0, "runs": 0, "dots": 0, "dismissals": 0, "4s": 0, "6s": 0, "strike_rate": None, "average": None}
+
+    def top(self, person, role, sort="balls", limit=10):
+        """A person's opponents as batter or bowler, ordered by sort, one of MATCHUP_STATS (most first)"""
+        if role == "batter":
+            start, end = int(self.matrix["indptr"][person]), int(self.matrix["indptr"][person + 1])
+            pairs = np.arange(start, end)
+            opponents = self.matrix["indices"][start:end]
+        else:
+            start, end = int(self.matrix["bowler_indptr"][person]), int(self.matrix["bowler_indptr"][person + 1])
+            pairs = self.matrix["bowler_pairs"][start:end]
+            opponents = self.matrix["bowler_indices"][start:end]
+        # Stable sort on the negated stat keeps ties in opponent order
+        order = np.argsort(-self.matrix[sort][pairs], kind="stable")[:limit]
+        return [{"opponent": self.names[opponents[i]], **self.row(int(pairs[i]))} for i in order]
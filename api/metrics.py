@@ -0,0 +1,206 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from starlette.routing import Match
+
+# Per-route request metrics kept in process memory and exposed on /metrics in
+# the Prometheus text format. Each worker process keeps its own counters and a
+# scrape is answered by whichever worker accepts it, so /metrics describes one
+# worker: its totals only cover all traffic when the server runs one worker.
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Server-Timing stages of one request: filled in by the layers that do the
+# work (HTTPCacheMiddleware, data_loader.encode_json) and read back by
+# MetricsMiddleware. Route handlers run in a threadpool with a copy of this
+# context, so they add to the same RequestTimings object.
+request_timings = ContextVar("request_timings", default=None)
+
+class RequestTimings:
+    """Seconds per stage of one request, plus how the response cache answered it"""
+
+    def __init__(self):
+        self.stages = {}
+        self.cache = None
+
+def record_timing(stage, seconds):
+    """Add seconds to a stage of the current request; a no-op outside a request"""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.stages[stage] = timings.stages.get(stage, 0.0) + seconds
+
+def record_cache(result):
+    """Note whether the current request was a response cache hit, miss or revalidation"""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.cache = result
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.total:.6f}"
+        yield f"{name}_count{{{labels}}} {cumulative}"
+
+class RouteMetrics:
+    """Counts, latency and size histograms and stage totals of one route"""
+
+    def __init__(self):
+        self.requests = {}  # (method, status) -> count
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.stages = {}  # stage -> seconds
+        self.cache = {}  # hit/miss/revalidated -> count
+
+def label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def server_timing(timings, total):
+    """Server-Timing header value: lookup vs serialize vs compress, and the total, in ms"""
+    stages = dict(timings.stages)
+    route = stages.pop("route", None)
+    parts = []
+    if route is not None:
+        # The route's own time minus the JSON encoding it did is the lookup
+        parts.append(f"lookup;dur={(route - stages.get('serialize', 0.0)) * 1000:.3f}")
+    parts.extend(f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in stages.items())
+    if timings.cache:
+        parts.append(f'cache;desc="{timings.cache}"')
+    parts.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(parts)
+
+class MetricsMiddleware:
+    """
+    Records every HTTP request under its route template (so
+    /player/{player_name}/batting is one series, not one per player) and
+    adds a Server-Timing header splitting where the time went. Requests
+    that match no route are recorded as "unmatched".
+    """
+
+    def __init__(self, app, routes, registry=None):
+        self.app = app
+        self.routes = routes  # the app's live route list; /metrics is added after the middleware
+        self.registry = registry or metrics_registry
+
+    def route_template(self, scope):
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        response = {"status": 500, "size": 0}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                value = server_timing(timings, time.perf_counter() - start)
+                headers.append((b"server-timing", value.encode("latin-1")))
+                headers.append((b"timing-allow-origin", b"*"))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            self.registry.observe(
+                self.route_template(scope), scope["method"], response["status"], response["size"],
+                time.perf_counter() - start, timings
+            )
+
+class MetricsRegistry:
+    """Per-route metrics of this process"""
+
+    def __init__(self):
+        self.metrics = {}  # route template -> RouteMetrics
+        self.started = time.time()
+
+    def observe(self, route, method, status, size, seconds, timings):
+        metrics = self.metrics.get(route)
+        if metrics is None:
+            metrics = self.metrics[route] = RouteMetrics()
+        key = (method, status)
+        metrics.requests[key] = metrics.requests.get(key, 0) + 1
+        metrics.latency.observe(seconds)
+        metrics.size.observe(size)
+        for stage, stage_seconds in timings.stages.items():
+            metrics.stages[stage] = metrics.stages.get(stage, 0.0) + stage_seconds
+        if timings.cache:
+            metrics.cache[timings.cache] = metrics.cache.get(timings.cache, 0) + 1
+
+    def render(self, extra_lines=()):
+        """Everything recorded so far in the Prometheus text exposition format"""
+        lines = [
+            "# HELP ipl_http_requests_total HTTP requests by route, method and status.",
+            "# TYPE ipl_http_requests_total counter",
+        ]
+        routes = sorted(self.metrics.items())
+        for route, metrics in routes:
+            for (method, status), count in sorted(metrics.requests.items()):
+                lines.append(f'ipl_http_requests_total{{route="{label(route)}",method="{method}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP ipl_http_request_duration_seconds Time from receiving a request to sending its last byte.",
+            "# TYPE ipl_http_request_duration_seconds histogram",
+        ]
+        for route, metrics in routes:
+            lines.extend(metrics.latency.lines("ipl_http_request_duration_seconds", f'route="{label(route)}"'))
+
+        lines += [
+            "# HELP ipl_http_response_size_bytes Response body size as sent (after compression).",
+            "# TYPE ipl_http_response_size_bytes histogram",
+        ]
+        for route, metrics in routes:
+            lines.extend(metrics.size.lines("ipl_http_response_size_bytes", f'route="{label(route)}"'))
+
+        lines += [
+            "# HELP ipl_http_stage_seconds_total Time spent per request stage (route handler, JSON encoding, compression).",
+            "# TYPE ipl_http_stage_seconds_total counter",
+        ]
+        for route, metrics in routes:
+            for stage, seconds in sorted(metrics.stages.items()):
+                lines.append(f'ipl_http_stage_seconds_total{{route="{label(route)}",stage="{stage}"}} {seconds:.6f}')
+
+        lines += [
+            "# HELP ipl_http_cache_responses_total Data responses by response cache outcome.",
+            "# TYPE ipl_http_cache_responses_total counter",
+        ]
+        for route, metrics in routes:
+            for result, count in sorted(metrics.cache.items()):
+                lines.append(f'ipl_http_cache_responses_total{{route="{label(route)}",result="{result}"}} {count}')
+
+        lines += [
+            "# HELP ipl_process_start_time_seconds Unix time the metrics started recording.",
+            "# TYPE ipl_process_start_time_seconds gauge",
+            f"ipl_process_start_time_seconds {self.started:.3f}",
+        ]
+        lines.extend(extra_lines)
+        return "\n".join(lines) + "\n"
+
+metrics_registry = MetricsRegistry()
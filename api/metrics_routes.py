@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Response
+import data_loader
+from metrics import label, metrics_registry
+
+router = APIRouter()
+
+def dataset_metrics():
+    """Startup stage timings, the served data version and the per-version response LRUs"""
+    lines = [
+        "# HELP ipl_startup_seconds Seconds spent in each stage of loading the data at startup.",
+        "# TYPE ipl_startup_seconds gauge",
+    ]
+    lines += [f'ipl_startup_seconds{{stage="{label(stage)}"}} {seconds:.6f}' for stage, seconds in data_loader.startup_timings.items()]
+    dataset = data_loader.current_dataset()
+    if dataset is None:
+        return lines
+
+    lines += [
+        "# HELP ipl_data_version_info Version of the data being served.",
+        "# TYPE ipl_data_version_info gauge",
+        f'ipl_data_version_info{{version="{label(dataset.version)}"}} 1',
+        "# HELP ipl_response_lru_requests_total Lookups in the per-version response LRUs by result.",
+        "# TYPE ipl_response_lru_requests_total counter",
+    ]
+    for name in ("search", "splits", "scorecard"):
+        info = getattr(dataset, f"{name}_response").cache_info()
+        lines.append(f'ipl_response_lru_requests_total{{cache="{name}",result="hit"}} {info.hits}')
+        lines.append(f'ipl_response_lru_requests_total{{cache="{name}",result="miss"}} {info.misses}')
+    return lines
+
+@router.get("/metrics")
+def get_metrics():
+    """Request counts, latency and size histograms per route, in the Prometheus text format"""
+    return Response(
+        content=metrics_registry.render(dataset_metrics()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
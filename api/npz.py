@@ -0,0 +1,45 @@
+import mmap
+import struct
+import zipfile
+import numpy as np
+
+# np.load ignores mmap_mode for .npz archives and reads every member into the
+# process. The pipeline writes them uncompressed (np.savez), so each member is
+# a plain .npy file at a fixed offset of the archive and can be viewed in
+# place: every worker then shares one copy of the arrays in the page cache.
+
+NPY_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+def map_npz(path):
+    """
+    {name: read-only array} for every member of an .npz, memory-mapped
+    where the member is stored uncompressed and holds no Python objects,
+    and read into memory otherwise.
+    """
+    arrays = {}
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with zipfile.ZipFile(f) as archive:
+            for info in archive.infolist():
+                name = info.filename[:-len(".npy")] if info.filename.endswith(".npy") else info.filename
+                array = None
+                if info.compress_type == zipfile.ZIP_STORED:
+                    # Local file header: 30 fixed bytes, then the file name and extra field
+                    name_length, extra_length = struct.unpack_from("<HH", buffer, info.header_offset + 26)
+                    buffer.seek(info.header_offset + 30 + name_length + extra_length)
+                    read_header = NPY_HEADER_READERS.get(np.lib.format.read_magic(buffer))
+                    if read_header is not None:
+                        shape, fortran_order, dtype = read_header(buffer)
+                        if not dtype.hasobject:
+                            count = int(np.prod(shape))
+                            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=buffer.tell()).reshape(
+                                shape, order="F" if fortran_order else "C"
+                            )
+                if array is None:
+                    with archive.open(info) as member:
+                        array = np.lib.format.read_array(member, allow_pickle=False)
+                arrays[name] = array
+    return arrays
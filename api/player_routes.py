@@ -1,102 +1,132 @@
-from fastapi import APIRouter, HTTPException
-from data_loader import batting_df, bowling_df, career_batting_df, career_bowling_df
-from typing import List
+import json
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Optional
+from data_loader import current_dataset, encode_json, filter_key, normalize_name
+from search_index import fold
+from compare import COMPARE_METRICS, DEFAULT_METRICS, MAX_PLAYERS, align_series
+
+# Kept in step with splits.SPLITS, which is not imported here so NumPy stays off the startup path
+SPLITS = ("phase", "venue", "opponent", "innings")
 
 router = APIRouter()
 
+def require_dataset():
+    """The active dataset, or a 500 if the pipeline has not been run"""
+    dataset = current_dataset()
+    if dataset is None:
+        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    return dataset
+
 @router.get("/players")
 def get_all_players():
     """Get list of all players"""
-    if career_batting_df is None:
-        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    return Response(content=require_dataset().get("meta", "players"), media_type="application/json")
+
+@router.get("/players/directory")
+def get_player_directory(team: Optional[str] = None, season: Optional[int] = None):
+    """Get every player's name, season span, teams and last-name sort key in one response"""
+    payload = require_dataset().get("directory", filter_key(team.upper() if team else None, season))
+    if payload is None:
+        payload = encode_json({"count": 0, "players": []})
+    return Response(content=payload, media_type="application/json")
+
+@router.get("/search")
+def search_players(q: str = "", limit: int = Query(10, ge=1, le=50)):
+    """Autocomplete player names: surname/full-name/alias prefixes, with typo-tolerant fallback"""
+    # Cached per folded query and data version, so repeated keystrokes are free
+    return Response(content=require_dataset().search_response(fold(q), limit), media_type="application/json")
+
+def lookup_player(player_name: str, payload: str) -> Response:
+    """Return a player's pre-encoded payload from the player tables"""
+    content = require_dataset().get(payload, normalize_name(player_name))
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
     
-    players = career_batting_df['player'].unique().tolist()
-    return {"players": players}
+    return Response(content=content, media_type="application/json")
 
 @router.get("/player/{player_name}/batting")
 def get_player_batting(player_name: str):
     """Get batting statistics for a specific player across all seasons"""
-    if batting_df is None:
-        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
-    
-    data = batting_df[batting_df["player"].str.lower() == player_name.lower()]
-    if data.empty:
-        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
-    
-    return {
-        "player": player_name,
-        "batting_stats": data.to_dict(orient="records")
-    }
+    return lookup_player(player_name, "batting")
 
 @router.get("/player/{player_name}/bowling")
 def get_player_bowling(player_name: str):
     """Get bowling statistics for a specific player across all seasons"""
-    if bowling_df is None:
-        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
-    
-    data = bowling_df[bowling_df["player"].str.lower() == player_name.lower()]
-    if data.empty:
-        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
-    
-    return {
-        "player": player_name,
-        "bowling_stats": data.to_dict(orient="records")
-    }
+    return lookup_player(player_name, "bowling")
 
 @router.get("/player/{player_name}/career")
 def get_player_career(player_name: str):
     """Get career batting and bowling statistics for a specific player"""
-    if career_batting_df is None or career_bowling_df is None:
-        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
-    
-    bat = career_batting_df[career_batting_df["player"].str.lower() == player_name.lower()]
-    bowl = career_bowling_df[career_bowling_df["player"].str.lower() == player_name.lower()]
-    
-    if bat.empty and bowl.empty:
-        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
-    
-    return {
-        "player": player_name,
-        "career_batting": bat.to_dict(orient="records") if not bat.empty else [],
-        "career_bowling": bowl.to_dict(orient="records") if not bowl.empty else []
-    }
+    return lookup_player(player_name, "career")
+
+@router.get("/player/{player_name}/profile")
+def get_player_profile(player_name: str):
+    """Get a player's career summary and season-by-season batting and bowling in one response"""
+    return lookup_player(player_name, "profile")
+
+@router.get("/compare")
+def compare_players(players: str, metrics: Optional[str] = None):
+    """Compare players season by season: per metric, one value per season for each player"""
+    names = list(dict.fromkeys(name.strip() for name in players.split(",") if name.strip()))
+    if not names:
+        raise HTTPException(status_code=400, detail="No players given")
+    if len(names) > MAX_PLAYERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PLAYERS} players can be compared")
+    selected = list(dict.fromkeys(metric.strip() for metric in (metrics or "").split(",") if metric.strip())) or list(DEFAULT_METRICS)
+    for metric in selected:
+        if metric not in COMPARE_METRICS:
+            raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}'. Choose from: {', '.join(COMPARE_METRICS)}")
+
+    # Every name in one sorted walk of the series table
+    keys = {name: normalize_name(name) for name in names}
+    found = require_dataset().get_many("series", keys.values())
+    for name, key in keys.items():
+        if found[key] is None:
+            raise HTTPException(status_code=404, detail=f"Player '{name}' not found")
 
+    series = [json.loads(found[key]) for key in dict.fromkeys(keys.values())]
+    seasons, aligned = align_series(series, selected)
+    return Response(content=encode_json({
+        "players": [entry["player"] for entry in series],
+        "metrics": selected,
+        "seasons": seasons,
+        "series": aligned
+    }), media_type="application/json")
 
+@router.get("/player/{player_name}/splits")
+def get_player_splits(player_name: str, by: str = "phase", season: Optional[int] = None):
+    """Get a player's batting and bowling split by phase, venue, opponent or innings, optionally for one season"""
+    if by not in SPLITS:
+        raise HTTPException(status_code=400, detail=f"Unknown split '{by}'. Choose from: {', '.join(SPLITS)}")
+    
+    dataset = require_dataset()
+    if dataset.splits_engine is None:
+        raise HTTPException(status_code=500, detail="Delivery data not built. Please run parse_and_aggregate.py --columnar first.")
+    
+    content = dataset.splits_response(normalize_name(player_name), by, season)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
+    
+    return Response(content=content, media_type="application/json")
 
 @router.get("/seasons/{year}/batting")
-def get_season_batting(year: str):
+def get_season_batting(year: int):
     """Get batting leaderboard for a specific season"""
-    if batting_df is None:
-        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
-    
-    season_data = batting_df[batting_df['season'] == year]
+    season_data = require_dataset().get("season_batting", str(year))
     
-    if season_data.empty:
+    if season_data is None:
         raise HTTPException(status_code=404, detail=f"No data found for season {year}")
     
-    # Sort by runs scored (descending)
-    season_data = season_data.sort_values('runs', ascending=False)
-    
-    return {
-        "season": year,
-        "batting_leaderboard": season_data.to_dict(orient="records")
-    }
+    # Pre-sorted by runs scored (descending)
+    return Response(content=season_data, media_type="application/json")
 
 @router.get("/seasons/{year}/bowling")
-def get_season_bowling(year: str):
+def get_season_bowling(year: int):
     """Get bowling leaderboard for a specific season"""
-    if bowling_df is None:
-        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    season_data = require_dataset().get("season_bowling", str(year))
     
-    season_data = bowling_df[bowling_df['season'] == year]
-    
-    if season_data.empty:
+    if season_data is None:
         raise HTTPException(status_code=404, detail=f"No data found for season {year}")
     
-    # Sort by wickets taken (descending)
-    season_data = season_data.sort_values('wickets', ascending=False)
-    
-    return {
-        "season": year,
-        "bowling_leaderboard": season_data.to_dict(orient="records")
-    }
+    # Pre-sorted by wickets taken (descending)
+    return Response(content=season_data, media_type="application/json")
@@ -1,14 +1,25 @@
+import os
+import argparse
 import uvicorn
 from main import app
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the IPL Statistics API")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes sharing the memory-mapped snapshot (0 = one per CPU)")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
     print("Starting IPL Statistics API...")
     print("Loading data...")
-    
+    # Importing main above already loaded the data, so the serving snapshot is
+    # up to date on disk before any worker starts and maps it
+
     # Start the server
     uvicorn.run(
-        "main:app", 
+        "main:app",
         host="0.0.0.0",  # Allow external connections
         port=8000,        # Port number
-        reload=True        # Auto-reload on code changes
-    ) 
\ No newline at end of file
+        reload=workers == 1,  # Auto-reload on code changes (single process only)
+        workers=workers
+    )
@@ -0,0 +1,145 @@
+import csv
+import json
+from array import array
+from collections import Counter
+
+# Ranking tiers, best first
+EXACT, SURNAME_PREFIX, NAME_PREFIX, TOKEN_PREFIX, FUZZY = range(5)
+
+def fold(text):
+    """Lower-case and strip punctuation so 'A.B. de Villiers' and 'ab de villiers' compare equal"""
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in text.lower()).split())
+
+def trigrams(text):
+    """Character trigrams of a folded string, padded so short names still get some"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def load_aliases(path):
+    """Map each player name to the other names CricSheet's registry uses for the same person"""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            people = list(csv.DictReader(f))
+    except FileNotFoundError:
+        return {}
+    names_by_id = {}
+    for row in people:
+        names_by_id.setdefault(row["registry_id"], []).append(row["name"])
+    aliases = {}
+    for names in names_by_id.values():
+        for name in names:
+            others = [other for other in names if other != name]
+            if others:
+                aliases[name] = others
+    return aliases
+
+def position_key(i):
+    """Fixed-width table key for a player's directory position, so key order is position order"""
+    return f"{i:06d}"
+
+def encode_positions(positions):
+    """Pack player positions as uint32s"""
+    return array("I", sorted(positions)).tobytes()
+
+def decode_positions(value):
+    return array("I", value)
+
+def build_search_tables(directory_entries, aliases=None):
+    """
+    Build the autocomplete index over the player directory as snapshot
+    tables, so every worker reads it from the shared file.
+
+    - search_tokens: every word of every name and alias, plus each full
+      folded name -> players, so any prefix is a bisect and a short scan.
+    - search_grams: trigram -> players (over full names and single words),
+      for typo-tolerant fallback matching.
+    - search_forms / search_entries: each player's folded names, and their
+      directory entry.
+    Players are referenced by position in directory_entries, which is
+    sorted by last name, so position order is also the tie-break order.
+    """
+    aliases = aliases or {}
+    tokens = {}
+    grams = {}
+    tables = {"search_forms": {}, "search_entries": {}}
+    for i, entry in enumerate(directory_entries):
+        names = [entry["name"], *aliases.get(entry["name"], [])]
+        player_forms = [fold(name) for name in names]
+        tables["search_forms"][position_key(i)] = json.dumps(player_forms).encode("utf-8")
+        tables["search_entries"][position_key(i)] = json.dumps(entry).encode("utf-8")
+        for form in player_forms:
+            for token in (form, *form.split()):
+                tokens.setdefault(token, set()).add(i)
+                for gram in trigrams(token):
+                    grams.setdefault(gram, set()).add(i)
+    tables["search_tokens"] = {token: encode_positions(players) for token, players in tokens.items()}
+    tables["search_grams"] = {gram: encode_positions(players) for gram, players in grams.items()}
+    return tables
+
+def prefix_players(snapshot, prefix):
+    """Players with any indexed token starting with prefix"""
+    players = set()
+    for _, value in snapshot.table("search_tokens").scan_prefix(prefix):
+        players.update(decode_positions(value))
+    return players
+
+def player_forms(snapshot, i):
+    return json.loads(snapshot.get("search_forms", position_key(i)))
+
+def search(snapshot, query, limit=10):
+    """
+    Return up to limit directory entries matching query, best first.
+
+    Every query word must prefix-match some word of the player's name or
+    an alias, in any order ("gayle ch" finds "CH Gayle"). Results are
+    ranked exact name, then surname prefix, then full-name prefix, then
+    any word prefix. If nothing matches by prefix, names sharing enough
+    trigrams with the query are returned instead, which tolerates small
+    typos.
+    """
+    folded = fold(query)
+    if not folded:
+        return []
+    words = folded.split()
+
+    candidates = None
+    for word in words:
+        matched = prefix_players(snapshot, word)
+        candidates = matched if candidates is None else candidates & matched
+        if not candidates:
+            break
+
+    ranked = {}
+    for i in candidates or ():
+        tier = TOKEN_PREFIX
+        for form in player_forms(snapshot, i):
+            if form == folded:
+                tier = EXACT
+            elif form.split()[-1].startswith(words[0]) and tier > SURNAME_PREFIX:
+                tier = SURNAME_PREFIX
+            elif form.startswith(folded) and tier > NAME_PREFIX:
+                tier = NAME_PREFIX
+        ranked[i] = (tier, 0.0)
+
+    if not ranked and len(folded) >= 3:
+        # Dice coefficient over trigrams
+        query_grams = trigrams(folded)
+        overlap = Counter()
+        for gram in query_grams:
+            players = snapshot.get("search_grams", gram)
+            if players is not None:
+                overlap.update(decode_positions(players))
+        for i, shared in overlap.items():
+            if i in ranked or shared < 2:
+                continue
+            # Compare against each full name and each word, so "gaile" can match "Gayle"
+            best = max(
+                2 * len(query_grams & piece_grams) / (len(query_grams) + len(piece_grams))
+                for form in player_forms(snapshot, i)
+                for piece_grams in map(trigrams, (form, *form.split()))
+            )
+            if best >= 0.45:
+                ranked[i] = (FUZZY, -best)
+
+    order = sorted(ranked, key=lambda i: (ranked[i], i))
+    return [json.loads(snapshot.get("search_entries", position_key(i))) for i in order[:limit]]
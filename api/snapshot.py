@@ -0,0 +1,247 @@
+import json
+import hashlib
+import struct
+from pathlib import Path
+
+# Binary serving snapshot: every API response the data can produce, pre-encoded
+# and stored in sorted key -> bytes tables, so serving needs neither pandas nor
+# any per-process index building.
+#
+# Layout (little-endian, tables 8-byte aligned):
+#   MAGIC | uint32 header length | JSON header | table 1 | table 2 | ...
+# Header: {"format": FORMAT, "version": data version, "tables": {name: [count, offset]}}
+# Table:  (count + 1) uint64 key offsets | (count + 1) uint64 value offsets |
+#         key bytes | value bytes
+# Keys are UTF-8 and sorted bytewise, so a lookup is a binary search over the
+# offset arrays and reads only the probed keys and the one value it returns.
+MAGIC = b"IPLSNAP1"
+
+# Bump whenever the set, shape or derivation of tables changes, so older snapshot files
+# are rebuilt instead of served
+FORMAT = 5
+
+BASE_DIR = Path(__file__).resolve().parent.parent  # repo root
+PLAYER_DATA_DIR = BASE_DIR / "player_data"
+SNAPSHOT_PATH = PLAYER_DATA_DIR / "serving.snap"
+DATA_FILES = [
+    "batting_stats.csv", "bowling_stats.csv",
+    "career_batting_stats.csv", "career_bowling_stats.csv", "people.csv"
+]
+# Binary pipeline artifacts loaded on demand. They are only ever rewritten
+# whole, so their size and mtime stand in for their content in the version
+ARTIFACT_FILES = ["deliveries.npz", "matchups.npz", "game_logs.npz", "matches.archive"]
+DELIVERY_STORE_PATH = PLAYER_DATA_DIR / "deliveries.npz"
+MATCHUPS_PATH = PLAYER_DATA_DIR / "matchups.npz"
+GAME_LOGS_PATH = PLAYER_DATA_DIR / "game_logs.npz"
+MATCH_ARCHIVE_PATH = PLAYER_DATA_DIR / "matches.archive"
+RAW_DATA_DIR = BASE_DIR / "ipl_data"
+
+class SnapshotError(Exception):
+    """The snapshot file is missing pieces or was written by another format version"""
+
+def compute_data_version(data_dir=PLAYER_DATA_DIR):
+    """Hash the served data files; the version changes exactly when the pipeline output does"""
+    digest = hashlib.sha256()
+    for name in DATA_FILES:
+        path = data_dir / name
+        if path.exists():
+            digest.update(name.encode("utf-8"))
+            digest.update(path.read_bytes())
+    for name in ARTIFACT_FILES:
+        path = data_dir / name
+        if path.exists():
+            stat = path.stat()
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def normalize_name(name):
+    """Normalize a player name for lookups: case-insensitive, collapsed whitespace"""
+    return " ".join(name.lower().split())
+
+def encode_json(content):
+    """Encode a payload exactly the way FastAPI's JSONResponse does"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def filter_key(*parts):
+    """Table key for a composite filter such as (team, season), with None as the empty string"""
+    return "|".join("" if part is None else str(part) for part in parts)
+
+def encode_snapshot(version, tables, magic=MAGIC, format=FORMAT):
+    """Serialize {table name: {key: bytes}} into a snapshot buffer (other magics reuse the layout)"""
+    return b"".join(snapshot_chunks(version, tables, magic, format))
+
+def snapshot_chunks(version, tables, magic=MAGIC, format=FORMAT, read=None):
+    """
+    Yield the bytes of a snapshot in file order. A table value is either
+    bytes or, when read is given, an (offset, length) span that
+    read(offset, length) returns the bytes of, so large values can be
+    streamed from a spool file instead of being held in memory.
+    """
+    header = {"format": format, "version": version, "tables": {}}
+    sections = []
+    for name in sorted(tables):
+        items = sorted((key.encode("utf-8"), value) for key, value in tables[name].items())
+        key_offsets, value_offsets = [0], [0]
+        for key, value in items:
+            key_offsets.append(key_offsets[-1] + len(key))
+            value_offsets.append(value_offsets[-1] + (value[1] if isinstance(value, tuple) else len(value)))
+        count = len(items)
+        keys = b"".join(key for key, _ in items)
+        head = b"".join([
+            struct.pack(f"<{count + 1}Q", *key_offsets),
+            struct.pack(f"<{count + 1}Q", *value_offsets),
+            keys + b"\0" * (-len(keys) % 8)
+        ])
+        sections.append((name, count, head, items, len(head) + value_offsets[-1]))
+
+    # The header records absolute table offsets, which depend on the header's own
+    # length; offsets only ever grow the header, so this settles in a few passes
+    start = 0
+    while True:
+        offset = start
+        for name, count, _, _, size in sections:
+            header["tables"][name] = [count, offset]
+            offset += size + (-size % 8)
+        encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        prefix = len(magic) + 4 + len(encoded)
+        if start == prefix + (-prefix % 8):
+            break
+        start = prefix + (-prefix % 8)
+
+    yield b"".join([magic, struct.pack("<I", len(encoded)), encoded, b"\0" * (start - prefix)])
+    for _, _, head, items, size in sections:
+        yield head
+        for _, value in items:
+            yield read(*value) if isinstance(value, tuple) else value
+        yield b"\0" * (-size % 8)
+
+def write_snapshot(path, buffer):
+    """Write a snapshot buffer atomically, so readers never see a half-written file"""
+    write_snapshot_chunks(path, [buffer])
+
+def write_snapshot_chunks(path, chunks):
+    """Write a snapshot from an iterable of byte chunks, atomically"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    tmp_path.replace(path)
+
+class Table:
+    """Read-only view of one sorted key -> bytes table inside a snapshot buffer"""
+
+    def __init__(self, buffer, count, offset):
+        self.buffer = buffer
+        self.count = count
+        self.key_offsets = offset
+        self.value_offsets = offset + 8 * (count + 1)
+        self.keys_start = self.value_offsets + 8 * (count + 1)
+        keys_length = self.offset_at(self.key_offsets, count)
+        self.values_start = self.keys_start + keys_length + (-keys_length % 8)
+
+    def offset_at(self, base, i):
+        return struct.unpack_from("<Q", self.buffer, base + 8 * i)[0]
+
+    def key_at(self, i):
+        start = self.keys_start + self.offset_at(self.key_offsets, i)
+        return bytes(self.buffer[start:self.keys_start + self.offset_at(self.key_offsets, i + 1)])
+
+    def view_at(self, i):
+        start = self.values_start + self.offset_at(self.value_offsets, i)
+        return self.buffer[start:self.values_start + self.offset_at(self.value_offsets, i + 1)]
+
+    def value_at(self, i):
+        return bytes(self.view_at(i))
+
+    def bisect(self, key, low=0):
+        """Position of the first key >= key (UTF-8 encoded), at or after low"""
+        high = self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.key_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def find(self, key):
+        """Position of key, or None"""
+        key = key.encode("utf-8")
+        i = self.bisect(key)
+        if i < self.count and self.key_at(i) == key:
+            return i
+        return None
+
+    def get(self, key):
+        """Return the value stored under key, or None"""
+        i = self.find(key)
+        return self.value_at(i) if i is not None else None
+
+    def view(self, key):
+        """Zero-copy memoryview of the value stored under key, or None"""
+        i = self.find(key)
+        return self.view_at(i) if i is not None else None
+
+    def get_many(self, keys):
+        """
+        {key: value or None} for several keys in one sorted walk: each binary
+        search starts where the previous key was found
+        """
+        values = {}
+        low = 0
+        # UTF-8 byte order is code point order, so sorting the strings sorts the keys
+        for key in sorted(set(keys)):
+            encoded = key.encode("utf-8")
+            low = self.bisect(encoded, low)
+            values[key] = self.value_at(low) if low < self.count and self.key_at(low) == encoded else None
+        return values
+
+    def scan_prefix(self, prefix):
+        """Yield (key, value) for every key starting with prefix, in key order"""
+        prefix = prefix.encode("utf-8")
+        i = self.bisect(prefix)
+        while i < self.count:
+            key = self.key_at(i)
+            if not key.startswith(prefix):
+                break
+            yield key.decode("utf-8"), self.value_at(i)
+            i += 1
+
+    def keys(self):
+        """All keys in sorted order"""
+        return [self.key_at(i).decode("utf-8") for i in range(self.count)]
+
+class Snapshot:
+    """
+    A loaded serving snapshot. Opening one only parses the small header;
+    table contents are read on lookup, straight from the buffer.
+    """
+
+    def __init__(self, buffer, magic=MAGIC, format=FORMAT):
+        self.buffer = memoryview(buffer)
+        if bytes(self.buffer[:len(magic)]) != magic:
+            raise SnapshotError("Not a serving snapshot (bad magic)")
+        (header_length,) = struct.unpack_from("<I", self.buffer, len(magic))
+        start = len(magic) + 4
+        header = json.loads(bytes(self.buffer[start:start + header_length]))
+        if header.get("format") != format:
+            raise SnapshotError(f"Snapshot format {header.get('format')} does not match {format}")
+        self.version = header["version"]
+        self.tables = {name: Table(self.buffer, count, offset) for name, (count, offset) in header["tables"].items()}
+
+    def table(self, name):
+        if name not in self.tables:
+            raise SnapshotError(f"Snapshot has no '{name}' table")
+        return self.tables[name]
+
+    def get(self, table, key):
+        """Return the bytes stored under key in table, or None"""
+        return self.table(table).get(key)
+
+    def view(self, table, key):
+        """Return a zero-copy view of the value under key in table, or None"""
+        return self.table(table).view(key)
+
+    def get_many(self, table, keys):
+        """Return {key: bytes or None} for several keys in table"""
+        return self.table(table).get_many(keys)
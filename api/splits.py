@@ -0,0 +1,147 @@
+import numpy as np
+from cricsheet import BOWLER_WICKET_KINDS
+from npz import map_npz
+from snapshot import normalize_name
+
+SPLITS = ("phase", "venue", "opponent", "innings")
+
+# Innings split labels, from the point of view of the player's team
+BATTING_INNINGS = {1: "batting first", 2: "chasing"}
+BOWLING_INNINGS = {1: "chasing", 2: "batting first"}
+
+def load_store(path):
+    """Memory-map the delivery store written by parse_and_aggregate.py --columnar"""
+    return map_npz(path)
+
+def group_sum(groups, n_groups, values=None):
+    """Sum values (or count rows) per group code"""
+    return np.bincount(groups, weights=values, minlength=n_groups).astype(np.int64)
+
+def rate(numerator, denominator, scale=1):
+    """numerator * scale / denominator rounded to 2 places, or None when undefined"""
+    return round(float(numerator) * scale / float(denominator), 2) if denominator else None
+
+class SplitsEngine:
+    """
+    Phase, venue, opponent and innings splits over the columnar delivery
+    store. The store stays memory-mapped and shared between workers: a
+    query finds the player's deliveries, derives the match and innings
+    context of just those rows, and sums them with a handful of bincounts.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        # Deliveries of wickets credited to the bowler, once per wicket
+        kinds = list(store["wicket_kind_name"])
+        credited = np.isin(store["wicket_kind"], [kinds.index(kind) for kind in BOWLER_WICKET_KINDS])
+        self.credited_deliveries = store["wicket_delivery"][credited]
+
+        # Normalized name -> (name, player codes). A name covers every code of
+        # every registry person it is used for, so aliases share their splits
+        codes_by_id = {}
+        for code, registry_id in enumerate(store["people_id"]):
+            codes_by_id.setdefault(str(registry_id), []).append(code)
+        self.players = {}
+        for code, (registry_id, name) in enumerate(zip(store["people_id"], store["people_name"])):
+            name, codes = str(name), codes_by_id[str(registry_id)] if registry_id else [code]
+            _, known = self.players.setdefault(normalize_name(name), (name, []))
+            known.extend(c for c in codes if c not in known)
+
+    def scoped(self, rows, season):
+        """The delivery rows in scope (no super overs, and the season if given), with their match and innings"""
+        store = self.store
+        match, innings = store["match"][rows], store["innings"][rows]
+        keep = ~store["innings_super_over"][innings]
+        if season is not None:
+            keep &= store["match_season"][match] == season
+        return rows[keep], match[keep], innings[keep]
+
+    def labels(self, by, role, rows, match, innings):
+        """Split codes of the given deliveries and the label of each code, for a batting or bowling split"""
+        store = self.store
+        if by == "phase":
+            return store["phase"][rows], [str(name) for name in store["phase_name"]]
+        if by == "venue":
+            return store["match_venue"][match], [str(name) for name in store["venue_name"]]
+        if by == "opponent":
+            batting_team = store["innings_team"][innings]
+            if role == "batting":
+                team1, team2 = store["match_team1"][match], store["match_team2"][match]
+                team = np.where(team1 == batting_team, team2, team1)
+            else:
+                team = batting_team
+            return team, [str(name) for name in store["team_name"]]
+        names = BATTING_INNINGS if role == "batting" else BOWLING_INNINGS
+        return store["innings_number"][innings], [names.get(number) for number in range(max(names) + 1)]
+
+    def batting(self, codes, by, season):
+        store = self.store
+        rows, match, innings = self.scoped(np.flatnonzero(np.isin(store["batter"], codes)), season)
+        labels, names = self.labels(by, "batting", rows, match, innings)
+        n = len(names)
+        group = labels.astype(np.int64)
+        runs = store["runs_batter"][rows].astype(np.int64)
+        faced = store["wides"][rows] == 0
+        # Dismissals (including run outs at the non-striker's end) fall in the split of their delivery
+        out = self.scoped(store["wicket_delivery"][np.isin(store["wicket_player_out"], codes)], season)
+        n_innings = len(store["innings_team"])
+        stats = {
+            "innings": group_sum(np.unique(group * n_innings + innings) // n_innings, n),
+            "runs": group_sum(group, n, runs),
+            "balls": group_sum(group, n, faced),
+            "dots": group_sum(group, n, faced & (runs == 0)),
+            "4s": group_sum(group, n, runs == 4),
+            "6s": group_sum(group, n, runs == 6),
+            "dismissals": group_sum(self.labels(by, "batting", *out)[0].astype(np.int64), n),
+        }
+        rows = []
+        for i in np.flatnonzero(stats["balls"] + stats["runs"] + stats["dismissals"]):
+            row = {"split": names[i], **{stat: int(values[i]) for stat, values in stats.items()}}
+            row["strike_rate"] = rate(row["runs"], row["balls"], 100)
+            row["average"] = rate(row["runs"], row["dismissals"])
+            rows.append(row)
+        return rows
+
+    def bowling(self, codes, by, season):
+        store = self.store
+        rows, match, innings = self.scoped(np.flatnonzero(np.isin(store["bowler"], codes)), season)
+        labels, names = self.labels(by, "bowling", rows, match, innings)
+        n = len(names)
+        group = labels.astype(np.int64)
+        wides, noballs = store["wides"][rows], store["noballs"][rows]
+        legal = (wides == 0) & (noballs == 0)
+        conceded = store["runs_batter"][rows].astype(np.int64) + wides + noballs
+        wickets = self.credited_deliveries[np.isin(store["bowler"][self.credited_deliveries], codes)]
+        n_innings = len(store["innings_team"])
+        stats = {
+            "innings": group_sum(np.unique(group * n_innings + innings) // n_innings, n),
+            "balls": group_sum(group, n, legal),
+            "runs_conceded": group_sum(group, n, conceded),
+            "dots": group_sum(group, n, legal & (conceded == 0)),
+            "wickets": group_sum(self.labels(by, "bowling", *self.scoped(wickets, season))[0].astype(np.int64), n),
+        }
+        rows = []
+        for i in np.flatnonzero(stats["innings"]):
+            row = {"split": names[i], **{stat: int(values[i]) for stat, values in stats.items()}}
+            row["economy"] = rate(row["runs_conceded"], row["balls"], 6)
+            row["average"] = rate(row["runs_conceded"], row["wickets"])
+            row["strike_rate"] = rate(row["balls"], row["wickets"])
+            rows.append(row)
+        return rows
+
+    def splits(self, player_name, by, season=None):
+        """
+        Batting and bowling splits for a player, or None if the player is
+        not in the store. Phase and innings splits keep their natural
+        order; venue and opponent splits are ordered by balls, most first.
+        """
+        player = self.players.get(normalize_name(player_name))
+        if player is None:
+            return None
+        name, codes = player
+        batting = self.batting(codes, by, season)
+        bowling = self.bowling(codes, by, season)
+        if by in ("venue", "opponent"):
+            batting.sort(key=lambda row: -row["balls"])
+            bowling.sort(key=lambda row: -row["balls"])
+        return {"player": name, "by": by, "season": season, "batting": batting, "bowling": bowling}
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException, Response
+from data_loader import current_dataset, filter_key
+
+router = APIRouter()
+
+def get_team_payload(table: str, *key) -> bytes:
+    """Look up a team response (abbreviations are case-insensitive)"""
+    dataset = current_dataset()
+    if dataset is None:
+        raise HTTPException(status_code=500, detail="Data not loaded. Please run data processing scripts first.")
+    
+    return dataset.get(table, filter_key(*key))
+
+@router.get("/teams")
+def get_teams():
+    """Get every team with its first and last season"""
+    return Response(content=get_team_payload("meta", "teams"), media_type="application/json")
+
+@router.get("/teams/{team}/seasons")
+def get_team_seasons(team: str):
+    """Get the seasons a team played, newest first, with roster sizes"""
+    seasons = get_team_payload("team_seasons", team.upper())
+    if seasons is None:
+        raise HTTPException(status_code=404, detail=f"Team '{team}' not found")
+    
+    return Response(content=seasons, media_type="application/json")
+
+@router.get("/teams/{team}/seasons/{year}")
+def get_team_season_roster(team: str, year: int):
+    """Get a team's complete roster for one season with each player's batting and bowling rows"""
+    roster = get_team_payload("team_rosters", team.upper(), year)
+    if roster is None:
+        if get_team_payload("team_seasons", team.upper()) is None:
+            raise HTTPException(status_code=404, detail=f"Team '{team}' not found")
+        raise HTTPException(status_code=404, detail=f"No data found for {team} in season {year}")
+    
+    return Response(content=roster, media_type="application/json")
@@ -0,0 +1,175 @@
+import os
+import json
+import random
+import hashlib
+import argparse
+
+# Synthetic CricSheet-shaped match files for benchmarking. The output has the
+# fields the pipeline and the API read (info.players/registry/season/dates,
+# innings with powerplays, targets, extras, wickets and fielders) with
+# roughly T20 scoring rates. It is random data, not a model of real cricket.
+
+BASE_MATCHES = 1170  # about the size of ipl_data/, i.e. scale 1
+MATCHES_PER_SEASON = 70
+SQUAD_SIZE = 25
+CAREER_SEASONS = 8  # each squad slot gets a new player every 8 seasons, staggered
+
+TEAMS = [
+    "Chennai Super Kings", "Delhi Capitals", "Gujarat Titans", "Kolkata Knight Riders",
+    "Lucknow Super Giants", "Mumbai Indians", "Punjab Kings", "Rajasthan Royals",
+    "Royal Challengers Bengaluru", "Sunrisers Hyderabad"
+]
+VENUES = [f"Synthetic Stadium {i}" for i in range(1, 21)]
+
+# (outcome, weight) per delivery; "W" is a wicket, "wd"/"nb"/"lb"/"b" extras
+OUTCOMES = [
+    (0, 36), (1, 34), (2, 7), (3, 0.5), (4, 11), (6, 5),
+    ("W", 5), ("wd", 3), ("nb", 0.4), ("lb", 2), ("b", 0.5)
+]
+WICKET_KINDS = [
+    ("caught", 60), ("bowled", 17), ("lbw", 7), ("run out", 8), ("stumped", 3),
+    ("caught and bowled", 3), ("hit wicket", 0.5), ("retired hurt", 0.2)
+]
+
+def player_name(team, slot, generation):
+    return f"{''.join(word[0] for word in team.split())} P{slot} G{generation}"
+
+def registry_id(name):
+    return hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+
+def squad(team, season_index):
+    """A team's squad for a season; every slot is refilled every CAREER_SEASONS seasons"""
+    return [player_name(team, slot, (season_index + slot) // CAREER_SEASONS) for slot in range(SQUAD_SIZE)]
+
+def simulate_innings(rng, batting, bowling, target=None):
+    """Ball-by-ball innings: batting is the XI in order, the last five of bowling bowl"""
+    bowlers = bowling[-5:] + bowling[-6:-5]
+    striker, non_striker, next_batter = 0, 1, 2
+    overs, runs, wickets, all_out = [], 0, 0, False
+    outcomes, weights = zip(*OUTCOMES)
+    kinds, kind_weights = zip(*WICKET_KINDS)
+    overs_bowled, last_bowler = {}, None
+    for over in range(20):
+        bowler = rng.choice([b for b in bowlers if b != last_bowler and overs_bowled.get(b, 0) < 4])
+        overs_bowled[bowler] = overs_bowled.get(bowler, 0) + 1
+        last_bowler = bowler
+        deliveries, legal = [], 0
+        while legal < 6:
+            outcome = rng.choices(outcomes, weights)[0]
+            delivery = {"batter": batting[striker], "bowler": bowler, "non_striker": batting[non_striker]}
+            batter_runs, extras = 0, {}
+            if outcome == "wd":
+                extras["wides"] = 1
+            elif outcome == "nb":
+                extras["noballs"] = 1
+                batter_runs = rng.choice([0, 0, 1, 4])
+            elif outcome in ("lb", "b"):
+                extras["legbyes" if outcome == "lb" else "byes"] = rng.choice([1, 1, 4])
+            elif outcome != "W":
+                batter_runs = outcome
+            extra_runs = sum(extras.values())
+            delivery["runs"] = {"batter": batter_runs, "extras": extra_runs, "total": batter_runs + extra_runs}
+            if extras:
+                delivery["extras"] = extras
+            runs += batter_runs + extra_runs
+            if "wides" not in extras and "noballs" not in extras:
+                legal += 1
+
+            if outcome == "W":
+                kind = rng.choices(kinds, kind_weights)[0]
+                wicket = {"player_out": batting[striker], "kind": kind}
+                if kind in ("caught", "run out", "stumped"):
+                    wicket["fielders"] = [{"name": rng.choice(bowling)}]
+                delivery["wickets"] = [wicket]
+                wickets += kind != "retired hurt"
+                if next_batter == len(batting):
+                    deliveries.append(delivery)
+                    all_out = True
+                    break
+                striker, next_batter = next_batter, next_batter + 1
+            elif (batter_runs + extras.get("legbyes", 0) + extras.get("byes", 0)) % 2:
+                striker, non_striker = non_striker, striker
+            deliveries.append(delivery)
+            if target is not None and runs >= target:
+                break
+        overs.append({"over": over, "deliveries": deliveries})
+        if all_out or (target is not None and runs >= target):
+            break
+        striker, non_striker = non_striker, striker
+    return overs, runs, wickets
+
+def generate_match(rng, number, season_index):
+    """One synthetic match of season 2008 + season_index"""
+    home, away = rng.sample(TEAMS, 2)
+    season = 2008 + season_index
+    day = number % MATCHES_PER_SEASON
+    elevens = {team: rng.sample(squad(team, season_index), 11) for team in (home, away)}
+    toss_winner = rng.choice([home, away])
+    decision = rng.choice(["bat", "field"])
+    first = toss_winner if decision == "bat" else (away if toss_winner == home else home)
+    second = away if first == home else home
+
+    overs1, runs1, _ = simulate_innings(rng, elevens[first], elevens[second])
+    overs2, runs2, wickets2 = simulate_innings(rng, elevens[second], elevens[first], target=runs1 + 1)
+    if runs2 > runs1:
+        outcome = {"winner": second, "by": {"wickets": 10 - wickets2}}
+    elif runs1 > runs2:
+        outcome = {"winner": first, "by": {"runs": runs1 - runs2}}
+    else:
+        outcome = {"result": "tie"}
+
+    people = {name: registry_id(name) for team in elevens for name in elevens[team]}
+    return {
+        "meta": {"data_version": "1.1.0", "created": f"{season}-06-01", "revision": 1},
+        "info": {
+            "balls_per_over": 6,
+            "city": "Synthetic City",
+            "dates": [f"{season}-{4 + day // 30:02d}-{1 + day % 30:02d}"],
+            "event": {"match_number": day + 1, "name": "Indian Premier League"},
+            "gender": "male",
+            "match_type": "T20",
+            "outcome": outcome,
+            "overs": 20,
+            "player_of_match": [rng.choice(elevens[first] + elevens[second])],
+            "players": {home: elevens[home], away: elevens[away]},
+            "registry": {"people": dict(sorted(people.items()))},
+            "season": season,
+            "team_type": "club",
+            "teams": [home, away],
+            "toss": {"decision": decision, "winner": toss_winner},
+            "venue": rng.choice(VENUES),
+        },
+        "innings": [
+            {"team": first, "overs": overs1, "powerplays": [{"from": 0.1, "to": 5.6, "type": "mandatory"}]},
+            {
+                "team": second, "overs": overs2, "powerplays": [{"from": 0.1, "to": 5.6, "type": "mandatory"}],
+                "target": {"overs": 20, "runs": runs1 + 1}
+            },
+        ],
+    }
+
+def generate_dataset(out_dir, scale=1, seed=0):
+    """
+    Write BASE_MATCHES * scale synthetic match files to out_dir, with the
+    number of seasons (and so of players) growing with the scale. Returns
+    (matches, deliveries) written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    n_matches = int(BASE_MATCHES * scale)
+    deliveries = 0
+    for number in range(n_matches):
+        match = generate_match(rng, number, number // MATCHES_PER_SEASON)
+        deliveries += sum(len(over["deliveries"]) for innings in match["innings"] for over in innings["overs"])
+        with open(os.path.join(out_dir, f"{9000000 + number}.json"), "w") as f:
+            json.dump(match, f, separators=(",", ":"))
+    return n_matches, deliveries
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic CricSheet-shaped IPL match files")
+    parser.add_argument("out_dir", help="directory to write match JSON files to")
+    parser.add_argument("--scale", type=float, default=1, help=f"multiple of {BASE_MATCHES} matches (default 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    n_matches, deliveries = generate_dataset(args.out_dir, args.scale, args.seed)
+    print(f"Wrote {n_matches} matches ({deliveries} deliveries) to {args.out_dir}")
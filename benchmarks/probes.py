@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import resource
+
+# Measurements run_benchmarks.py starts in a fresh process each, inside a
+# scratch copy of the repo, so peak memory and startup are per measurement.
+# Every probe prints one JSON object on its last line of output.
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is in KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def probe_ingest():
+    """Dictionary-based season aggregation (parse_and_aggregate.py default mode)"""
+    from parse_and_aggregate import count_matches_and_innings, iter_matches, save_match_counts
+    start = time.perf_counter()
+    player_stats = count_matches_and_innings(iter_matches())
+    seconds = time.perf_counter() - start
+    save_match_counts(player_stats)
+    return {"seconds": seconds, "peak_rss_mb": peak_rss_mb()}
+
+def probe_pipeline():
+    """The single-pass pipeline, without the serving snapshot (timed by api_startup)"""
+    from pipeline import MemorySampler, run_pipeline
+    profile = {"memory": MemorySampler()}
+    timings = run_pipeline(snapshot=False, profile=profile)
+    return {
+        "seconds": sum(timings.values()),
+        "stages": timings,
+        "stage_peak_rss_mb": {name: profile[name]["peak_rss_mb"] for name in timings},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def probe_career_rollup():
+    """career_stats.load_career_stats over the pipeline's season CSVs"""
+    from career_stats import load_career_stats
+    start = time.perf_counter()
+    load_career_stats()
+    return {"seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}
+
+def probe_api_startup():
+    """Import the app (run from api/): builds the snapshot if missing, else maps it"""
+    start = time.perf_counter()
+    import data_loader
+    import main  # noqa: F401
+    return {
+        "seconds": time.perf_counter() - start,
+        "stages": dict(data_loader.startup_timings),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def percentiles(samples):
+    """Latency summary in milliseconds"""
+    samples = sorted(samples)
+    def at(fraction):
+        return round(samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 3)
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": at(0.50),
+        "p90_ms": at(0.90),
+        "p99_ms": at(0.99),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+def endpoint_urls(client_get, rng, requests):
+    """Request URLs per endpoint, drawn from the data the API actually serves"""
+    players = json.loads(client_get("/players"))["players"]
+    teams = json.loads(client_get("/teams"))["teams"]
+    matches = json.loads(client_get("/matches"))["matches"]
+    seasons = sorted({match["season"] for match in matches})
+
+    def pick(make):
+        return [make() for _ in range(requests)]
+
+    def player():
+        return rng.choice(players)
+
+    def team_season():
+        team = rng.choice(teams)
+        return f"/teams/{team['team']}/seasons/{rng.randint(team['first_season'], team['last_season'])}"
+
+    return {
+        "players": pick(lambda: "/players"),
+        "search": pick(lambda: f"/search?q={player()[:rng.randint(2, 5)]}"),
+        "player_batting": pick(lambda: f"/player/{player()}/batting"),
+        "player_bowling": pick(lambda: f"/player/{player()}/bowling"),
+        "player_career": pick(lambda: f"/player/{player()}/career"),
+        "player_profile": pick(lambda: f"/player/{player()}/profile"),
+        "compare": pick(lambda: f"/compare?players={','.join(rng.sample(players, 5))}"),
+        "player_splits": pick(lambda: f"/player/{player()}/splits?by={rng.choice(['phase', 'venue', 'opponent', 'innings'])}"),
+        "player_log": pick(lambda: f"/player/{player()}/log"),
+        "player_form": pick(lambda: f"/player/{player()}/form?innings=10"),
+        "player_matchups": pick(lambda: f"/player/{player()}/matchups"),
+        "matchup": pick(lambda: f"/matchup/{player()}/{player()}"),
+        "season_batting": pick(lambda: f"/seasons/{rng.choice(seasons)}/batting"),
+        "leaderboard": pick(lambda: f"/leaderboards/{rng.choice(['all-time', str(rng.choice(seasons))])}/{rng.choice(['runs', 'wickets', 'economy'])}"),
+        "team_roster": pick(team_season),
+        "scorecard": pick(lambda: f"/match/{rng.choice(matches)['match_id']}/scorecard"),
+    }
+
+def probe_endpoints():
+    """
+    Per-endpoint latency under concurrent load, in process: requests go
+    straight to the ASGI app (middleware included) without a socket.
+    Configured through BENCH_REQUESTS and BENCH_CONCURRENCY.
+    """
+    import httpx
+    from fastapi.testclient import TestClient
+    from main import app
+    requests = int(os.environ.get("BENCH_REQUESTS", 200))
+    concurrency = int(os.environ.get("BENCH_CONCURRENCY", 16))
+    with TestClient(app) as client:
+        urls = endpoint_urls(lambda url: client.get(url).content, random.Random(0), requests)
+
+    async def run():
+        limit = asyncio.Semaphore(concurrency)
+        results = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def timed(url):
+                async with limit:
+                    start = time.perf_counter()
+                    response = await client.get(url)
+                    elapsed = time.perf_counter() - start
+                    return elapsed, response.status_code, len(response.content)
+
+            for name, endpoint_urls_ in urls.items():
+                start = time.perf_counter()
+                outcomes = await asyncio.gather(*(timed(url) for url in endpoint_urls_))
+                wall = time.perf_counter() - start
+                results[name] = {
+                    **percentiles([elapsed for elapsed, _, _ in outcomes]),
+                    "requests_per_second": round(len(outcomes) / wall, 1),
+                    "errors": sum(status >= 500 for _, status, _ in outcomes),
+                    "mean_bytes": round(sum(size for _, _, size in outcomes) / len(outcomes)),
+                }
+        return results
+
+    return {"concurrency": concurrency, "endpoints": asyncio.run(run()), "peak_rss_mb": peak_rss_mb()}
+
+PROBES = {
+    "ingest": probe_ingest,
+    "pipeline": probe_pipeline,
+    "career_rollup": probe_career_rollup,
+    "api_startup": probe_api_startup,
+    "endpoints": probe_endpoints,
+}
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.getcwd())
+    result = PROBES[sys.argv[1]]()
+    print(json.dumps(result))
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import glob
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from generate_matches import generate_dataset
+
+# Benchmarks the whole stack on synthetic data at several multiples of the
+# real dataset: ingest throughput and peak memory, the career rollup, API
+# startup (cold snapshot build and warm mmap) and per-endpoint latency
+# under concurrent in-process load. Each scale runs in a scratch copy of
+# the repo so the real player_data/ is never touched, and each measurement
+# runs in its own process so peak memory is its own.
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBES_PATH = os.path.join(REPO_DIR, "benchmarks", "probes.py")
+DEFAULT_OUTPUT = os.path.join(REPO_DIR, "benchmark_results.json")
+
+def make_workspace(root, scale, seed):
+    """A scratch copy of the code with a generated ipl_data/ and an empty player_data/"""
+    for pattern in ("*.py", os.path.join("api", "*.py")):
+        for path in glob.glob(os.path.join(REPO_DIR, pattern)):
+            target = os.path.join(root, os.path.relpath(path, REPO_DIR))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy(path, target)
+    os.makedirs(os.path.join(root, "player_data"), exist_ok=True)
+    return generate_dataset(os.path.join(root, "ipl_data"), scale, seed)
+
+def run_probe(name, cwd, env=None):
+    """Run one probe in a fresh interpreter and return its JSON result"""
+    result = subprocess.run(
+        [sys.executable, PROBES_PATH, name], cwd=cwd, capture_output=True, text=True,
+        env={**os.environ, **(env or {})}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} probe failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def benchmark_scale(scale, seed, requests, concurrency):
+    """Every measurement at one scale"""
+    with tempfile.TemporaryDirectory(prefix=f"ipl-bench-{scale}x-") as root:
+        print(f"[{scale}x] generating matches...")
+        matches, deliveries = make_workspace(root, scale, seed)
+        data_bytes = sum(entry.stat().st_size for entry in os.scandir(os.path.join(root, "ipl_data")))
+        api_dir = os.path.join(root, "api")
+        results = {"scale": scale, "matches": matches, "deliveries": deliveries, "data_mb": round(data_bytes / 1e6, 1)}
+
+        print(f"[{scale}x] ingest (dictionary aggregation)...")
+        ingest = run_probe("ingest", root)
+        ingest["deliveries_per_second"] = round(deliveries / ingest["seconds"])
+        results["ingest"] = ingest
+
+        print(f"[{scale}x] pipeline...")
+        pipeline = run_probe("pipeline", root)
+        pipeline["deliveries_per_second"] = round(deliveries / pipeline["stages"]["parse match files"])
+        results["pipeline"] = pipeline
+
+        print(f"[{scale}x] career rollup...")
+        results["career_rollup"] = run_probe("career_rollup", root)
+
+        print(f"[{scale}x] API startup...")
+        results["api_startup_cold"] = run_probe("api_startup", api_dir)
+        results["api_startup_warm"] = run_probe("api_startup", api_dir)
+
+        print(f"[{scale}x] endpoint latency...")
+        results["endpoints"] = run_probe(
+            "endpoints", api_dir, {"BENCH_REQUESTS": str(requests), "BENCH_CONCURRENCY": str(concurrency)}
+        )
+        return results
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def flatten(value, prefix=""):
+    """Numeric leaves of a nested result as {'a.b.c': number}"""
+    if isinstance(value, dict):
+        items = {}
+        for key, child in value.items():
+            items.update(flatten(child, f"{prefix}.{key}" if prefix else str(key)))
+        return items
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: value}
+    return {}
+
+def compare(results, baseline):
+    """Percent change of every numeric metric present in both runs, by scale"""
+    lines = []
+    old_runs = {run["scale"]: run for run in baseline["runs"]}
+    for run in results["runs"]:
+        if run["scale"] not in old_runs:
+            continue
+        old, new = flatten(old_runs[run["scale"]]), flatten(run)
+        for metric in sorted(set(old) & set(new)):
+            if old[metric] and metric not in ("scale", "matches", "deliveries"):
+                change = (new[metric] - old[metric]) * 100 / old[metric]
+                lines.append(f"  {run['scale']}x {metric}: {old[metric]:g} -> {new[metric]:g} ({change:+.1f}%)")
+    return "\n".join(lines)
+
+def summary(run):
+    """A few headline numbers for one scale"""
+    endpoints = run["endpoints"]["endpoints"]
+    slowest = max(endpoints, key=lambda name: endpoints[name]["p99_ms"])
+    return (
+        f"{run['scale']}x: {run['matches']} matches, {run['deliveries']} deliveries\n"
+        f"  ingest   {run['ingest']['deliveries_per_second']:>10,} deliveries/s, peak {run['ingest']['peak_rss_mb']:.0f} MB\n"
+        f"  pipeline {run['pipeline']['deliveries_per_second']:>10,} deliveries/s parsed, {run['pipeline']['seconds']:.1f}s total, "
+        f"peak {run['pipeline']['peak_rss_mb']:.0f} MB\n"
+        f"  career rollup {run['career_rollup']['seconds'] * 1000:.0f}ms\n"
+        f"  API startup cold {run['api_startup_cold']['seconds'] * 1000:.0f}ms, warm {run['api_startup_warm']['seconds'] * 1000:.0f}ms\n"
+        f"  slowest endpoint p99: {slowest} {endpoints[slowest]['p99_ms']:.1f}ms"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ingest, rollups, startup and the API on synthetic data")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1], help="dataset sizes as multiples of ipl_data/ (e.g. 1 10 100)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint (default 200)")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight at once (default 16)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--baseline", help="an earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "runs": [
+            benchmark_scale(int(scale) if scale == int(scale) else scale, args.seed, args.requests, args.concurrency)
+            for scale in args.scales
+        ],
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print()
+    for run in results["runs"]:
+        print(summary(run))
+    print(f"\nWrote {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            print(f"\nChange from {args.baseline}:")
+            print(compare(results, json.load(f)) or "  (no common scales)")
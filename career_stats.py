@@ -1,6 +1,19 @@
+import sys
 import pandas as pd
 import numpy as np
 
+BATTING_COLUMNS = [
+    'player', 'team', 'matches', 'innings', 'not_outs', 'runs', 'balls',
+    'batting_average', 'strike_rate', 'high_score', '50s', '100s',
+    '4s', '6s', 'catches', 'stumpings'
+]
+
+BOWLING_COLUMNS = [
+    'player', 'team', 'matches', 'innings', 'balls_bowled',
+    'runs_conceded', 'wickets', 'bowling_average', 'economy_rate',
+    'strike_rate', '3w_hauls', '4w_hauls', '5w_hauls', 'best_bowling'
+]
+
 def load_career_stats():
     """
     Load and aggregate career stats from existing CSV files.
@@ -12,6 +25,46 @@ def load_career_stats():
     # Load the existing CSV files
     batting_df = pd.read_csv("player_data/batting_stats.csv")
     bowling_df = pd.read_csv("player_data/bowling_stats.csv")
+    return aggregate_career_stats(batting_df, bowling_df)
+
+def first_per_player(codes, *sort_keys):
+    """
+    Return the row positions of each player's top-ranked row.
+
+    sort_keys are applied most significant first and sorted ascending,
+    so negate a key to rank it descending. A single lexsort replaces a
+    boolean filter per player.
+    """
+    order = np.lexsort(tuple(reversed((codes,) + sort_keys)))
+    ranked = codes[order]
+    is_first = np.ones(len(order), dtype=bool)
+    is_first[1:] = ranked[1:] != ranked[:-1]
+    return order[is_first]
+
+def career_teams(season_df, codes, n_players):
+    """Join each player's teams in the order they first played for them"""
+    team_codes, team_names = pd.factorize(season_df['team'])
+    seasons = pd.to_numeric(season_df['season'], errors='coerce').to_numpy()
+    # Keep each (player, team) pair's earliest season, then order by player and that season
+    firsts = first_per_player(codes * (len(team_names) + 1) + team_codes, seasons)
+    firsts = firsts[np.lexsort((seasons[firsts], codes[firsts]))]
+    player_of, team_of = codes[firsts], team_names.to_numpy(dtype=object)[team_codes[firsts]]
+
+    # One column per team slot, then concatenate the columns instead of joining group by group
+    is_start = np.ones(len(firsts), dtype=bool)
+    is_start[1:] = player_of[1:] != player_of[:-1]
+    slot = np.arange(len(firsts)) - np.maximum.accumulate(np.where(is_start, np.arange(len(firsts)), 0))
+    joined = np.full(n_players, '', dtype=object)
+    for position in range(slot.max() + 1 if len(slot) else 0):
+        in_slot = slot == position
+        separator = '' if position == 0 else ', '
+        joined[player_of[in_slot]] = joined[player_of[in_slot]] + separator + team_of[in_slot]
+    return joined
+
+def aggregate_career_stats(batting_df, bowling_df):
+    """Aggregate season batting and bowling rows into one career row per player"""
+    batting_df = batting_df.copy()
+    bowling_df = bowling_df.copy()
 
     # Ensure numeric columns are correct type
     batting_numeric_cols = ['matches', 'innings', 'not_outs', 'runs', 'balls', '50s', '100s', '4s', '6s', 'catches', 'stumpings']
@@ -21,34 +74,21 @@ def load_career_stats():
     bowling_numeric_cols = ['matches', 'innings', 'balls_bowled', 'runs_conceded', 'wickets', '3w_hauls', '4w_hauls', '5w_hauls']
     for col in bowling_numeric_cols:
         bowling_df[col] = pd.to_numeric(bowling_df[col], errors='coerce')
+
+    # Integer player codes in name order; every group-by and ranking below works on these
+    batting_codes, batting_players = pd.factorize(batting_df['player'], sort=True)
+    bowling_codes, bowling_players = pd.factorize(bowling_df['player'], sort=True)
     
     # Group by player and aggregate career stats
-    career_batting = batting_df.groupby('player').agg({
-        'team': lambda x: ', '.join(set(x)),  # All teams played for
-        'matches': 'sum',
-        'innings': 'sum',
-        'not_outs': 'sum',
-        'runs': 'sum',
-        'balls': 'sum',
-        '50s': 'sum',
-        '100s': 'sum',
-        '4s': 'sum',
-        '6s': 'sum',
-        'catches': 'sum',
-        'stumpings': 'sum'
-    }).reset_index()
-    
-    career_bowling = bowling_df.groupby('player').agg({
-        'team': lambda x: ', '.join(set(x)),  # All teams played for
-        'matches': 'sum',
-        'innings': 'sum',
-        'balls_bowled': 'sum',
-        'runs_conceded': 'sum',
-        'wickets': 'sum',
-        '3w_hauls': 'sum',
-        '4w_hauls': 'sum',
-        '5w_hauls': 'sum'
-    }).reset_index()
+    career_batting = batting_df[batting_numeric_cols].groupby(batting_codes).sum()
+    career_batting.insert(0, 'player', batting_players[career_batting.index])
+    career_batting.insert(1, 'team', career_teams(batting_df, batting_codes, len(batting_players)))
+    career_batting = career_batting.reset_index(drop=True)
+
+    career_bowling = bowling_df[bowling_numeric_cols].groupby(bowling_codes).sum()
+    career_bowling.insert(0, 'player', bowling_players[career_bowling.index])
+    career_bowling.insert(1, 'team', career_teams(bowling_df, bowling_codes, len(bowling_players)))
+    career_bowling = career_bowling.reset_index(drop=True)
     
     # Calculate career averages and rates
     career_batting['batting_average'] = np.where(
@@ -81,110 +121,93 @@ def load_career_stats():
         0.0
     )
     
-    # Find career best bowling from individual season data
-    best_bowling_data = bowling_df[bowling_df['best_bowling'] != ''].copy()
-    if not best_bowling_data.empty:
-        best_bowling_data['wickets'] = best_bowling_data['best_bowling'].str.extract(r'BB: (\d+)/').astype('Int64')
-        best_bowling_data['runs'] = best_bowling_data['best_bowling'].str.extract(r'/(\d+)').astype('Int64')
-        
-        # Find best bowling for each player
-        career_best_list = []
-        for player in career_bowling['player']:
-            player_data = best_bowling_data[best_bowling_data['player'] == player]
-            if not player_data.empty:
-                # Find the best bowling (most wickets, then least runs)
-                try:
-                    best_idx = player_data['wickets'].idxmax()
-                    if pd.isna(best_idx):
-                        best_idx = player_data['runs'].idxmin()
-                    career_best_list.append({
-                        'player': player,
-                        'best_bowling': player_data.loc[best_idx, 'best_bowling']
-                    })
-                except (ValueError, KeyError):
-                    career_best_list.append({
-                        'player': player,
-                        'best_bowling': ''
-                    })
-            else:
-                career_best_list.append({
-                    'player': player,
-                    'best_bowling': ''
-                })
-        
-        career_best_df = pd.DataFrame(career_best_list)
-        career_bowling = career_bowling.merge(career_best_df, on='player', how='left')
-    else:
-        career_bowling['best_bowling'] = ''
-    
-    # Find career high score from individual season data
-    high_score_data = batting_df.copy()
-    high_score_data['high_score_num'] = pd.to_numeric(high_score_data['high_score'].str.replace('*', ''), errors='coerce')
-    
-    # Find high score for each player
-    career_high_score_list = []
-    for player in career_batting['player']:
-        player_data = high_score_data[high_score_data['player'] == player]
-        if not player_data.empty:
-            # Find the highest score
-            try:
-                best_idx = player_data['high_score_num'].idxmax()
-                if not pd.isna(best_idx):
-                    career_high_score_list.append({
-                        'player': player,
-                        'high_score': player_data.loc[best_idx, 'high_score']
-                    })
-                else:
-                    career_high_score_list.append({
-                        'player': player,
-                        'high_score': ''
-                    })
-            except (ValueError, KeyError):
-                career_high_score_list.append({
-                    'player': player,
-                    'high_score': ''
-                })
-        else:
-            career_high_score_list.append({
-                'player': player,
-                'high_score': ''
-            })
-    
-    career_high_score_df = pd.DataFrame(career_high_score_list)
-    career_batting = career_batting.merge(career_high_score_df, on='player', how='left')
+    # Career best bowling: rank every season best by most wickets, then fewest runs.
+    # Only seasons with a wicket can hold a best figure, so only those strings are parsed.
+    with_wickets = np.flatnonzero((bowling_df['wickets'] > 0).to_numpy())
+    figures = bowling_df['best_bowling'].iloc[with_wickets].astype(str).str.extract(r'(\d+)/(\d+)')
+    best_wickets = pd.to_numeric(figures[0], errors='coerce').to_numpy()
+    best_runs = pd.to_numeric(figures[1], errors='coerce').to_numpy()
+    parsed = with_wickets[~np.isnan(best_wickets) & ~np.isnan(best_runs)]
+    parsed_mask = np.isin(with_wickets, parsed)
+    best_rows = parsed[first_per_player(
+        bowling_codes[parsed], -best_wickets[parsed_mask], best_runs[parsed_mask]
+    )]
+    career_best = np.full(len(bowling_players), '', dtype=object)
+    career_best[bowling_codes[best_rows]] = bowling_df['best_bowling'].to_numpy()[best_rows]
+    career_bowling['best_bowling'] = career_best
+
+    # Career high score: highest season high score, preferring the not-out version on ties
+    batted = np.flatnonzero((batting_df['innings'] > 0).to_numpy())
+    high_score = batting_df['high_score'].iloc[batted].astype(str)
+    high_score_runs = pd.to_numeric(high_score.str.rstrip('*'), errors='coerce').to_numpy()
+    not_out = high_score.str.endswith('*').to_numpy()
+    valid = ~np.isnan(high_score_runs)
+    high_rows = batted[valid][first_per_player(
+        batting_codes[batted[valid]], -high_score_runs[valid], ~not_out[valid]
+    )]
+    career_high = np.full(len(batting_players), '', dtype=object)
+    career_high[batting_codes[high_rows]] = batting_df['high_score'].to_numpy()[high_rows]
+    career_batting['high_score'] = career_high
     
     # After all calculations, set '-' for batsmen with 0 innings
+    dash_bat = ['not_outs', 'high_score', 'strike_rate', 'batting_average']
+    career_batting[dash_bat] = career_batting[dash_bat].astype(object)
     mask_bat = career_batting['innings'] == 0
-    career_batting.loc[mask_bat, ['not_outs', 'high_score', 'strike_rate', 'batting_average']] = '-'
+    career_batting.loc[mask_bat, dash_bat] = '-'
 
     # For bowlers with 0 innings, set '-' for bowling_average, strike_rate, best_bowling
+    dash_bowl = ['bowling_average', 'strike_rate', 'best_bowling']
+    career_bowling[dash_bowl] = career_bowling[dash_bowl].astype(object)
     mask_bowl = career_bowling['innings'] == 0
-    career_bowling.loc[mask_bowl, ['bowling_average', 'strike_rate', 'best_bowling']] = '-'
+    career_bowling.loc[mask_bowl, dash_bowl] = '-'
 
     return career_batting, career_bowling
 
+def update_career_stats(players):
+    """
+    Recompute career rows for only the given players.
+
+    Season rows for those players are re-aggregated and spliced into
+    the saved career tables; every other player's career row is kept
+    as it was written.
+    """
+    players = set(players)
+    batting_df = pd.read_csv("player_data/batting_stats.csv")
+    bowling_df = pd.read_csv("player_data/bowling_stats.csv")
+    updated_batting, updated_bowling = aggregate_career_stats(
+        batting_df[batting_df['player'].isin(players)],
+        bowling_df[bowling_df['player'].isin(players)]
+    )
+
+    career_batting = pd.read_csv("player_data/career_batting_stats.csv", dtype=str, keep_default_na=False)
+    career_bowling = pd.read_csv("player_data/career_bowling_stats.csv", dtype=str, keep_default_na=False)
+    career_batting = pd.concat([career_batting[~career_batting['player'].isin(players)], updated_batting[BATTING_COLUMNS]])
+    career_bowling = pd.concat([career_bowling[~career_bowling['player'].isin(players)], updated_bowling[BOWLING_COLUMNS]])
+
+    # Keep the same player ordering a full rebuild produces
+    return (
+        career_batting.sort_values('player', kind='stable').reset_index(drop=True),
+        career_bowling.sort_values('player', kind='stable').reset_index(drop=True)
+    )
+
 def save_career_stats(career_batting, career_bowling):
     """Save career stats to CSV files"""
-    
-    # Reorder columns for better readability
-    batting_columns = [
-        'player', 'team', 'matches', 'innings', 'not_outs', 'runs', 'balls',
-        'batting_average', 'strike_rate', 'high_score', '50s', '100s', 
-        '4s', '6s', 'catches', 'stumpings'
-    ]
-    
-    bowling_columns = [
-        'player', 'team', 'matches', 'innings', 'balls_bowled', 
-        'runs_conceded', 'wickets', 'bowling_average', 'economy_rate', 
-        'strike_rate', '3w_hauls', '4w_hauls', '5w_hauls', 'best_bowling'
-    ]
-    
-    career_batting[batting_columns].to_csv("player_data/career_batting_stats.csv", index=False)
-    career_bowling[bowling_columns].to_csv("player_data/career_bowling_stats.csv", index=False)
+    career_batting[BATTING_COLUMNS].to_csv("player_data/career_batting_stats.csv", index=False)
+    career_bowling[BOWLING_COLUMNS].to_csv("player_data/career_bowling_stats.csv", index=False)
     
     print("Career stats saved to player_data/career_batting_stats.csv and player_data/career_bowling_stats.csv")
 
 if __name__ == "__main__":
+    if "--incremental" in sys.argv[1:]:
+        # Only players touched by the last `parse_and_aggregate.py --incremental` run
+        from parse_and_aggregate import load_ingest_state
+        players = load_ingest_state()["changed_players"]
+        print(f"Updating career stats for {len(players)} players...")
+        if players:
+            save_career_stats(*update_career_stats(players))
+        print("Done!")
+        sys.exit(0)
+
     print("Loading and aggregating career stats...")
     career_batting, career_bowling = load_career_stats()
     
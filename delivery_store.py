@@ -0,0 +1,609 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from api.cricsheet import BOWLER_WICKET_KINDS, TEAM_ABBREVIATIONS, WICKET_KINDS, normalize_season
+
+DATA_PATH = "ipl_data/"
+STORE_PATH = "player_data/deliveries.npz"
+MATCHUPS_PATH = "player_data/matchups.npz"
+GAME_LOGS_PATH = "player_data/game_logs.csv"
+GAME_LOG_INDEX_PATH = "player_data/game_logs.npz"
+PEOPLE_PATH = "player_data/people.csv"
+
+UNKNOWN_TEAM = "Unknown"  # substitutes who only fielded have no team sheet entry
+
+# Column order of player_data/batting_stats.csv and bowling_stats.csv
+SEASON_BATTING_COLUMNS = [
+    "player", "team", "season", "matches", "innings", "not_outs", "runs", "high_score", "balls",
+    "strike_rate", "batting_average", "50s", "100s", "4s", "6s", "catches", "stumpings"
+]
+SEASON_BOWLING_COLUMNS = [
+    "player", "team", "season", "matches", "innings", "balls_bowled", "runs_conceded", "wickets",
+    "bowling_average", "economy_rate", "strike_rate", "3w_hauls", "4w_hauls", "5w_hauls", "best_bowling"
+]
+
+# Innings phases, stored per delivery as an index into this tuple
+PHASES = ("powerplay", "middle", "death")
+DEATH_OVERS_FROM = 15  # overs 16-20
+
+class _Interner:
+    """Assign consecutive integer codes to hashable values in first-seen order"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def __call__(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+def powerplay_overs(inning):
+    """
+    0-based over numbers inside the innings' powerplays. CricSheet lists
+    them as over.ball ranges (e.g. 0.1-5.6); a partly covered over counts
+    as powerplay. Innings without the field use the standard first six overs.
+    """
+    powerplays = inning.get("powerplays")
+    if not powerplays:
+        return set(range(6))
+    overs = set()
+    for powerplay in powerplays:
+        overs.update(range(int(powerplay["from"]), int(powerplay["to"]) + 1))
+    return overs
+
+def build_delivery_store(data_path=DATA_PATH, files=None, on_match=None):
+    """
+    Parse CricSheet match files into a columnar delivery table.
+
+    Every delivery becomes one row across a set of parallel NumPy arrays.
+    Players are interned through each match's info.registry, so a code
+    identifies a (registry id, name) pair and the same person keeps the
+    same code across matches. Match, innings, appearance, wicket and
+    fielder rows live in their own small tables that the delivery
+    arrays point into. on_match(match key, file bytes, parsed match), if
+    given, sees every match as it is read, so other outputs can be built
+    in the same pass.
+    """
+    if files is None:
+        files = sorted(f for f in os.listdir(data_path) if f.endswith(".json"))
+
+    people = _Interner()
+    venues = _Interner()
+    teams = _Interner()
+
+    match_key, match_season, match_date, match_venue = [], [], [], []
+    match_team1, match_team2 = [], []
+    appearance_match, appearance_player, appearance_team = [], [], []
+    innings_match, innings_number, innings_team, innings_super_over = [], [], [], []
+    d_match, d_innings, d_over, d_ball, d_phase = [], [], [], [], []
+    d_batter, d_bowler, d_non_striker = [], [], []
+    d_runs_batter, d_runs_extras = [], []
+    d_wides, d_noballs, d_byes, d_legbyes = [], [], [], []
+    wicket_delivery, wicket_player_out, wicket_kind = [], [], []
+    fielder_wicket, fielder_player = [], []
+
+    for fname in files:
+        with open(os.path.join(data_path, fname), "rb") as f:
+            raw = f.read()
+        match = json.loads(raw)
+        if on_match is not None:
+            on_match(os.path.splitext(fname)[0], raw, match)
+        info = match["info"]
+        registry = info.get("registry", {}).get("people", {})
+
+        def player_code(name):
+            return people((registry.get(name, ""), name))
+
+        m = len(match_key)
+        match_key.append(os.path.splitext(fname)[0])
+        match_season.append(normalize_season(info["season"]))
+        match_date.append(info["dates"][0])
+        match_venue.append(venues(info["venue"]))
+        match_team1.append(teams(info["teams"][0]))
+        match_team2.append(teams(info["teams"][1]))
+
+        for team, players in info["players"].items():
+            team_code = teams(team)
+            for player in players:
+                appearance_match.append(m)
+                appearance_player.append(player_code(player))
+                appearance_team.append(team_code)
+
+        for number, inning in enumerate(match["innings"], start=1):
+            i = len(innings_match)
+            innings_match.append(m)
+            innings_number.append(number)
+            innings_team.append(teams(inning["team"]))
+            innings_super_over.append(bool(inning.get("super_over", False)))
+            powerplay = powerplay_overs(inning)
+
+            for over in inning["overs"]:
+                for ball, delivery in enumerate(over["deliveries"], start=1):
+                    d = len(d_match)
+                    extras = delivery.get("extras", {})
+                    d_match.append(m)
+                    d_innings.append(i)
+                    d_over.append(over["over"])
+                    d_ball.append(ball)
+                    if over["over"] in powerplay:
+                        d_phase.append(PHASES.index("powerplay"))
+                    elif over["over"] >= DEATH_OVERS_FROM:
+                        d_phase.append(PHASES.index("death"))
+                    else:
+                        d_phase.append(PHASES.index("middle"))
+                    d_batter.append(player_code(delivery["batter"]))
+                    d_bowler.append(player_code(delivery["bowler"]))
+                    non_striker = delivery.get("non_striker", "")
+                    d_non_striker.append(player_code(non_striker) if non_striker else -1)
+                    d_runs_batter.append(delivery["runs"]["batter"])
+                    d_runs_extras.append(delivery["runs"]["extras"])
+                    d_wides.append(extras.get("wides", 0))
+                    d_noballs.append(extras.get("noballs", 0))
+                    d_byes.append(extras.get("byes", 0))
+                    d_legbyes.append(extras.get("legbyes", 0))
+
+                    for wicket in delivery.get("wickets", []):
+                        w = len(wicket_delivery)
+                        wicket_delivery.append(d)
+                        wicket_player_out.append(player_code(wicket["player_out"]))
+                        wicket_kind.append(WICKET_KINDS.index(wicket["kind"]))
+                        for fielder in wicket.get("fielders", []):
+                            if "name" in fielder:
+                                fielder_wicket.append(w)
+                                fielder_player.append(player_code(fielder["name"]))
+
+    return {
+        # Lookup tables
+        "people_id": np.array([pid for pid, _ in people.values], dtype=str),
+        "people_name": np.array([name for _, name in people.values], dtype=str),
+        "venue_name": np.array(venues.values, dtype=str),
+        "team_name": np.array(teams.values, dtype=str),
+        "phase_name": np.array(PHASES, dtype=str),
+        "wicket_kind_name": np.array(WICKET_KINDS, dtype=str),
+        # One row per match
+        "match_key": np.array(match_key, dtype=str),
+        "match_season": np.array(match_season, dtype=np.int16),
+        "match_date": np.array(match_date, dtype="datetime64[D]"),
+        "match_venue": np.array(match_venue, dtype=np.int32),
+        "match_team1": np.array(match_team1, dtype=np.int32),
+        "match_team2": np.array(match_team2, dtype=np.int32),
+        # One row per player listed in info.players
+        "appearance_match": np.array(appearance_match, dtype=np.int32),
+        "appearance_player": np.array(appearance_player, dtype=np.int32),
+        "appearance_team": np.array(appearance_team, dtype=np.int32),
+        # One row per innings (including super overs)
+        "innings_match": np.array(innings_match, dtype=np.int32),
+        "innings_number": np.array(innings_number, dtype=np.int8),
+        "innings_team": np.array(innings_team, dtype=np.int32),
+        "innings_super_over": np.array(innings_super_over, dtype=bool),
+        # One row per delivery
+        "match": np.array(d_match, dtype=np.int32),
+        "innings": np.array(d_innings, dtype=np.int32),
+        "over": np.array(d_over, dtype=np.int8),
+        "ball": np.array(d_ball, dtype=np.int8),
+        "phase": np.array(d_phase, dtype=np.int8),
+        "batter": np.array(d_batter, dtype=np.int32),
+        "bowler": np.array(d_bowler, dtype=np.int32),
+        "non_striker": np.array(d_non_striker, dtype=np.int32),
+        "runs_batter": np.array(d_runs_batter, dtype=np.int16),
+        "runs_extras": np.array(d_runs_extras, dtype=np.int16),
+        "wides": np.array(d_wides, dtype=np.int16),
+        "noballs": np.array(d_noballs, dtype=np.int16),
+        "byes": np.array(d_byes, dtype=np.int16),
+        "legbyes": np.array(d_legbyes, dtype=np.int16),
+        # One row per dismissal, and one row per fielder credited in a dismissal
+        "wicket_delivery": np.array(wicket_delivery, dtype=np.int32),
+        "wicket_player_out": np.array(wicket_player_out, dtype=np.int32),
+        "wicket_kind": np.array(wicket_kind, dtype=np.int8),
+        "fielder_wicket": np.array(fielder_wicket, dtype=np.int32),
+        "fielder_player": np.array(fielder_player, dtype=np.int32),
+    }
+
+def savez_atomic(path, **arrays):
+    """
+    np.savez to a temporary file, then rename it over path. The API
+    memory-maps these files, and rewriting one in place would change the
+    pages under a running worker; a rename leaves its mapping intact.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+def save_delivery_store(store, path=STORE_PATH):
+    """Save the delivery table as an uncompressed .npz the API can memory-map"""
+    savez_atomic(path, **store)
+
+def load_delivery_store(path=STORE_PATH):
+    """Load a delivery table written by save_delivery_store"""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+def save_people_table(store, path=PEOPLE_PATH):
+    """Save every (registry id, name) pair seen in the matches, so the API can resolve aliases"""
+    pd.DataFrame({
+        "registry_id": store["people_id"],
+        "name": store["people_name"]
+    }).sort_values(["registry_id", "name"]).to_csv(path, index=False)
+
+def registry_people(store):
+    """
+    Merge player codes into registry people (codes without a registry id
+    stand alone). Returns each person's id and display name (their most
+    active name) and the person of every player code.
+    """
+    ids = np.where(store["people_id"] != "", store["people_id"], np.char.add("name:", store["people_name"]))
+    person_ids, person_of = np.unique(ids, return_inverse=True)
+    activity = np.bincount(store["batter"], minlength=len(ids)) + np.bincount(store["bowler"], minlength=len(ids))
+    by_activity = np.lexsort((-activity, person_of))
+    first = np.ones(len(ids), dtype=bool)
+    first[1:] = person_of[by_activity][1:] != person_of[by_activity][:-1]
+    return person_ids, store["people_name"][by_activity[first]], person_of
+
+def build_matchup_matrix(store):
+    """
+    Build the batter x bowler head-to-head matrix from the delivery table.
+
+    Rows and columns are registry people (player codes sharing a registry
+    id are merged, so aliases count as one person). Only pairs that have
+    actually faced each other are stored, in CSR form: the pairs of
+    batter b are indptr[b]:indptr[b + 1], with the bowler in indices and
+    the stats in the parallel data arrays. bowler_indptr/bowler_indices
+    index the same pairs by bowler, through bowler_pairs, so "best against"
+    queries work from either side without a second copy of the stats.
+    """
+    # Display name: the person's most active name; every name resolves to its person
+    person_ids, person_name, person_of = registry_people(store)
+    n_people = len(person_ids)
+
+    batter = person_of[store["batter"]].astype(np.int64)
+    bowler = person_of[store["bowler"]].astype(np.int64)
+    pairs, pair_of = np.unique(batter * n_people + bowler, return_inverse=True)
+    n_pairs = len(pairs)
+    runs = store["runs_batter"].astype(np.int64)
+    faced = store["wides"] == 0
+
+    # Dismissals of the striker credited to the bowler of the delivery
+    wicket_delivery = store["wicket_delivery"]
+    credited = np.isin(store["wicket_kind"], [WICKET_KINDS.index(kind) for kind in BOWLER_WICKET_KINDS])
+    striker_out = person_of[store["wicket_player_out"]] == batter[wicket_delivery]
+    dismissed = wicket_delivery[credited & striker_out]
+
+    pair_batter, pair_bowler = pairs // n_people, pairs % n_people
+    by_bowler = np.lexsort((pair_batter, pair_bowler))
+    return {
+        "person_id": person_ids,
+        "person_name": person_name,
+        "alias_name": store["people_name"],
+        "alias_person": person_of.astype(np.int32),
+        # CSR by batter
+        "indptr": np.searchsorted(pair_batter, np.arange(n_people + 1)).astype(np.int64),
+        "indices": pair_bowler.astype(np.int32),
+        "balls": _group_sum(pair_of, n_pairs, faced).astype(np.int32),
+        "runs": _group_sum(pair_of, n_pairs, runs).astype(np.int32),
+        "dots": _group_sum(pair_of, n_pairs, faced & (runs == 0)).astype(np.int32),
+        "fours": _group_sum(pair_of, n_pairs, runs == 4).astype(np.int32),
+        "sixes": _group_sum(pair_of, n_pairs, runs == 6).astype(np.int32),
+        "dismissals": _group_sum(pair_of[dismissed], n_pairs).astype(np.int32),
+        # The same pairs by bowler
+        "bowler_indptr": np.searchsorted(pair_bowler[by_bowler], np.arange(n_people + 1)).astype(np.int64),
+        "bowler_indices": pair_batter[by_bowler].astype(np.int32),
+        "bowler_pairs": by_bowler.astype(np.int32),
+    }
+
+def save_matchup_matrix(matrix, path=MATCHUPS_PATH):
+    """Save the matchup matrix as an uncompressed .npz"""
+    savez_atomic(path, **matrix)
+
+# Counting columns of a game log row that get per-player prefix sums
+GAME_LOG_TOTALS = ("runs", "balls_faced", "fours", "sixes", "dismissed", "batted",
+                   "balls_bowled", "runs_conceded", "wickets_taken", "bowled")
+
+def build_game_logs(store):
+    """
+    One row per player per innings they batted or bowled in (super overs
+    excluded), keyed by CricSheet match id and date and sorted by player,
+    then date. Players are registry people, so a renamed player keeps one
+    log. Alongside the rows, person_indptr gives each player's row range
+    and cum_<column> holds running totals over the rows. A player's totals
+    over any range of their innings are two lookups, start and end.
+    """
+    person_ids, person_name, person_of = registry_people(store)
+    n_people = len(person_ids)
+    n_innings = len(store["innings_match"])
+    innings = store["innings"].astype(np.int64)
+    regular = ~store["innings_super_over"][innings]
+    runs = store["runs_batter"].astype(np.int64)
+    faced = store["wides"] == 0
+    legal = faced & (store["noballs"] == 0)
+
+    # Batting rows: anyone who faced a ball or stood at the non-striker's end
+    batter = person_of[store["batter"]].astype(np.int64)
+    bowler = person_of[store["bowler"]].astype(np.int64)
+    has_non_striker = regular & (store["non_striker"] >= 0)
+    bat_keys = np.unique(np.concatenate([
+        batter[regular] * n_innings + innings[regular],
+        person_of[store["non_striker"][has_non_striker]].astype(np.int64) * n_innings + innings[has_non_striker]
+    ]))
+    bowl_keys = np.unique(bowler[regular] * n_innings + innings[regular])
+    keys = np.union1d(bat_keys, bowl_keys)
+    n_rows = len(keys)
+
+    def rows_of(key_values):
+        return np.searchsorted(keys, key_values)
+
+    bat_row = rows_of(batter[regular] * n_innings + innings[regular])
+    bowl_row = rows_of(bowler[regular] * n_innings + innings[regular])
+    columns = {
+        "runs": _group_sum(bat_row, n_rows, runs[regular]),
+        "balls_faced": _group_sum(bat_row, n_rows, faced[regular]),
+        "fours": _group_sum(bat_row, n_rows, runs[regular] == 4),
+        "sixes": _group_sum(bat_row, n_rows, runs[regular] == 6),
+        "balls_bowled": _group_sum(bowl_row, n_rows, legal[regular]),
+        "runs_conceded": _group_sum(bowl_row, n_rows, (runs + store["wides"] + store["noballs"])[regular]),
+    }
+    columns["batted"] = np.isin(keys, bat_keys).astype(np.int64)
+    columns["bowled"] = np.isin(keys, bowl_keys).astype(np.int64)
+
+    # Dismissals go to the player out; wickets to the bowler when the kind is credited to them
+    wicket_delivery = store["wicket_delivery"]
+    wicket_innings = innings[wicket_delivery]
+    in_regular = regular[wicket_delivery]
+    out_keys = person_of[store["wicket_player_out"]].astype(np.int64) * n_innings + wicket_innings
+    out_rows = rows_of(out_keys[in_regular])
+    columns["dismissed"] = _group_sum(out_rows, n_rows)
+    dismissal_kind = np.full(n_rows, -1, dtype=np.int8)
+    dismissal_kind[out_rows] = store["wicket_kind"][in_regular]
+    credited = in_regular & np.isin(store["wicket_kind"], [WICKET_KINDS.index(kind) for kind in BOWLER_WICKET_KINDS])
+    columns["wickets_taken"] = _group_sum(rows_of(bowler[wicket_delivery[credited]] * n_innings + wicket_innings[credited]), n_rows)
+
+    # Match context of each row; a bowling-only row belongs to the fielding team
+    row_person, row_innings = keys // n_innings, keys % n_innings
+    match = store["innings_match"][row_innings]
+    batting_team = store["innings_team"][row_innings]
+    team1, team2 = store["match_team1"][match], store["match_team2"][match]
+    other_team = np.where(team1 == batting_team, team2, team1)
+    team = np.where(columns["batted"] == 1, batting_team, other_team)
+    opponent = np.where(columns["batted"] == 1, other_team, batting_team)
+
+    # Player, then date, then match and innings order
+    date = store["match_date"][match]
+    order = np.lexsort((store["innings_number"][row_innings], store["match_key"][match], date, row_person))
+    logs = {
+        "person_id": person_ids,
+        "person_name": person_name,
+        "alias_name": store["people_name"],
+        "alias_person": person_of.astype(np.int32),
+        "person_indptr": np.searchsorted(row_person[order], np.arange(n_people + 1)).astype(np.int64),
+        "person": row_person[order].astype(np.int32),
+        "match_id": store["match_key"][match][order],
+        "date": date[order],
+        "season": store["match_season"][match][order],
+        "venue": store["match_venue"][match][order],
+        "team": team[order].astype(np.int32),
+        "opponent": opponent[order].astype(np.int32),
+        "innings": store["innings_number"][row_innings][order],
+        "dismissal_kind": dismissal_kind[order],
+    }
+    for name, values in columns.items():
+        logs[name] = values[order].astype(np.int32)
+    for name in GAME_LOG_TOTALS:
+        logs[f"cum_{name}"] = np.concatenate([[0], np.cumsum(logs[name], dtype=np.int64)])
+    return logs
+
+def save_game_logs(store, logs, csv_path=GAME_LOGS_PATH, index_path=GAME_LOG_INDEX_PATH):
+    """
+    Save the game logs as a readable CSV and as the uncompressed .npz the
+    API serves from, which also carries the venue, team and wicket kind
+    names needed to decode the rows
+    """
+    kinds = np.array(("",) + WICKET_KINDS)
+    registry_ids = logs["person_id"][logs["person"]]
+    pd.DataFrame({
+        "match_id": logs["match_id"],
+        "date": logs["date"],
+        "season": logs["season"],
+        "venue": store["venue_name"][logs["venue"]],
+        "player": logs["person_name"][logs["person"]],
+        "registry_id": np.where(np.char.startswith(registry_ids, "name:"), "", registry_ids),
+        "team": store["team_name"][logs["team"]],
+        "opponent": store["team_name"][logs["opponent"]],
+        "innings": logs["innings"],
+        "batted": logs["batted"].astype(bool),
+        "runs": logs["runs"],
+        "balls_faced": logs["balls_faced"],
+        "fours": logs["fours"],
+        "sixes": logs["sixes"],
+        "dismissal_type": kinds[logs["dismissal_kind"] + 1],
+        "bowled": logs["bowled"].astype(bool),
+        "balls_bowled": logs["balls_bowled"],
+        "runs_conceded": logs["runs_conceded"],
+        "wickets_taken": logs["wickets_taken"],
+    }).to_csv(csv_path, index=False)
+    savez_atomic(
+        index_path, **logs,
+        venue_name=store["venue_name"],
+        team_name=store["team_name"],
+        wicket_kind_name=store["wicket_kind_name"]
+    )
+
+def _group_sum(groups, n_groups, values=None):
+    """Sum values (or count rows) per group code"""
+    return np.bincount(groups, weights=values, minlength=n_groups).astype(np.int64)
+
+def _ratio(numerator, denominator):
+    """numerator / denominator rounded to 2 places where the denominator is positive, else 0.0"""
+    # Python's round() rounds the exact binary value (6.825 -> 6.83), unlike np.round
+    return np.array([round(n / d, 2) if d > 0 else 0.0 for n, d in zip(numerator.tolist(), denominator.tolist())])
+
+def _placeholder(values, missing):
+    """Values as an object column, with '-' where missing"""
+    column = values.astype(object)
+    column[missing] = "-"
+    return column
+
+def season_stat_tables(store):
+    """
+    The season batting and bowling tables served by the API
+    (player_data/batting_stats.csv and bowling_stats.csv), computed from
+    the delivery table in one set of group-bys.
+
+    Rows are (player name, season), with the team abbreviation from that
+    season's team sheets. Super overs are left out. A bowler's wickets
+    count only the dismissals credited to them. Hauls count
+    innings of exactly 3 and 4 wickets and of 5 or more, and best bowling
+    is "BB: wickets/runs". Undefined values are '-'. Players come in the
+    order they first appear in the match files, and each player's seasons
+    in the order they first played them.
+    """
+    names, name_of = np.unique(store["people_name"], return_inverse=True)
+    seasons, season_of_match = np.unique(store["match_season"], return_inverse=True)
+    n_seasons = len(seasons)
+    n_groups = len(names) * n_seasons
+    n_matches = len(store["match_key"])
+
+    def group(players, matches):
+        return name_of[players].astype(np.int64) * n_seasons + season_of_match[matches]
+
+    def per_match(players, matches):
+        return name_of[players].astype(np.int64) * n_matches + matches
+
+    def match_group(keys):
+        return (keys // n_matches) * n_seasons + season_of_match[keys % n_matches]
+
+    regular = ~store["innings_super_over"][store["innings"]]
+    match = store["match"][regular]
+    batter, bowler = store["batter"][regular], store["bowler"][regular]
+    non_striker = store["non_striker"][regular]
+    runs = store["runs_batter"][regular].astype(np.int64)
+    faced = store["wides"][regular] == 0
+    legal = faced & (store["noballs"][regular] == 0)
+    conceded = runs + store["wides"][regular] + store["noballs"][regular]
+    wicket_delivery = store["wicket_delivery"]
+    wicket_regular = regular[wicket_delivery]
+    wicket_match = store["match"][wicket_delivery]
+
+    # Matches and team from the team sheets; a name on two teams in a season
+    # (two people sharing it) takes the team it played more matches for
+    appearance_group = group(store["appearance_player"], store["appearance_match"])
+    matches_played = _group_sum(appearance_group, n_groups)
+    n_teams = len(store["team_name"])
+    team_counts = np.unique(appearance_group * n_teams + store["appearance_team"], return_counts=True)
+    by_count = np.lexsort((team_counts[0], team_counts[1]))
+    team_of_group = np.full(n_groups, -1, dtype=np.int64)
+    team_of_group[team_counts[0][by_count] // n_teams] = team_counts[0][by_count] % n_teams
+
+    # Batting: anyone who faced or stood at the non-striker's end batted in that match
+    batter_group = group(batter, match)
+    batting_runs = _group_sum(batter_group, n_groups, runs)
+    balls = _group_sum(batter_group, n_groups, faced)
+    fours = _group_sum(batter_group, n_groups, runs == 4)
+    sixes = _group_sum(batter_group, n_groups, runs == 6)
+    has_non_striker = non_striker >= 0
+    batted = np.unique(np.concatenate([per_match(batter, match), per_match(non_striker[has_non_striker], match[has_non_striker])]))
+    batted_runs = np.bincount(np.searchsorted(batted, per_match(batter, match)), weights=runs, minlength=len(batted)).astype(np.int64)
+    dismissed = np.unique(per_match(store["wicket_player_out"][wicket_regular], wicket_match[wicket_regular]))
+    not_out = ~np.isin(batted, dismissed)
+    batted_group = match_group(batted)
+    innings = _group_sum(batted_group, n_groups)
+    not_outs = _group_sum(batted_group, n_groups, not_out)
+    fifties = _group_sum(batted_group, n_groups, (batted_runs >= 50) & (batted_runs < 100))
+    hundreds = _group_sum(batted_group, n_groups, batted_runs >= 100)
+    # High score prefers the not-out version on ties: rank by runs, then not-out flag
+    best_score = np.zeros(n_groups, dtype=np.int64)
+    np.maximum.at(best_score, batted_group, batted_runs * 2 + not_out)
+    high_score, high_score_not_out = best_score // 2, best_score % 2 == 1
+
+    # Fielding: catches and stumpings go to the credited fielder
+    fielder_kind = store["wicket_kind"][store["fielder_wicket"]]
+    fielding = wicket_regular[store["fielder_wicket"]] & np.isin(fielder_kind, [WICKET_KINDS.index("caught"), WICKET_KINDS.index("stumped")])
+    fielder_wicket = store["fielder_wicket"][fielding]
+    fielder_group = group(store["fielder_player"][fielding], wicket_match[fielder_wicket])
+    catches = _group_sum(fielder_group, n_groups, fielder_kind[fielding] == WICKET_KINDS.index("caught"))
+    stumpings = _group_sum(fielder_group, n_groups, fielder_kind[fielding] == WICKET_KINDS.index("stumped"))
+
+    # Bowling, with wickets and figures per (bowler, match)
+    bowler_group = group(bowler, match)
+    balls_bowled = _group_sum(bowler_group, n_groups, legal)
+    runs_conceded = _group_sum(bowler_group, n_groups, conceded)
+    spells, spell_of = np.unique(per_match(bowler, match), return_inverse=True)
+    credited = wicket_regular & np.isin(store["wicket_kind"], [WICKET_KINDS.index(kind) for kind in BOWLER_WICKET_KINDS])
+    spell_wickets = np.bincount(
+        np.searchsorted(spells, per_match(store["bowler"][wicket_delivery[credited]], wicket_match[credited])),
+        minlength=len(spells)
+    )
+    spell_runs = np.bincount(spell_of, weights=conceded, minlength=len(spells)).astype(np.int64)
+    spell_group = match_group(spells)
+    bowling_innings = _group_sum(spell_group, n_groups)
+    wickets = _group_sum(spell_group, n_groups, spell_wickets)
+    hauls = [_group_sum(spell_group, n_groups, haul) for haul in (spell_wickets == 3, spell_wickets == 4, spell_wickets >= 5)]
+    # Best figures: most wickets, then fewest runs
+    ranked = np.lexsort((spell_runs, -spell_wickets, spell_group))
+    best = ranked[np.concatenate([[True], spell_group[ranked][1:] != spell_group[ranked][:-1]])] if len(ranked) else ranked
+    best = best[spell_wickets[best] > 0]
+    best_bowling = np.full(n_groups, "-", dtype=object)
+    best_bowling[spell_group[best]] = [f"BB: {w}/{r}" for w, r in zip(spell_wickets[best], spell_runs[best])]
+
+    # Row order: by when the player, then the player-season, first appears. Within
+    # a match the team sheets come before the fielders (substitutes) of its deliveries
+    n_appearances = len(store["appearance_match"])
+    event_group = np.concatenate([appearance_group, fielder_group])
+    event_order = np.concatenate([
+        store["appearance_match"].astype(np.int64) * (n_appearances + len(fielder_group)) + np.arange(n_appearances),
+        wicket_match[fielder_wicket].astype(np.int64) * (n_appearances + len(fielder_group)) + n_appearances + np.arange(len(fielder_group))
+    ])
+    first_seen = np.full(n_groups, np.iinfo(np.int64).max)
+    np.minimum.at(first_seen, event_group, event_order)
+    rows = np.flatnonzero(first_seen < np.iinfo(np.int64).max)
+    player_first_seen = first_seen.reshape(len(names), n_seasons).min(axis=1)
+    rows = rows[np.lexsort((first_seen[rows], player_first_seen[rows // n_seasons]))]
+
+    team_names = np.array([TEAM_ABBREVIATIONS.get(str(team), str(team)) for team in store["team_name"]] + [UNKNOWN_TEAM], dtype=object)
+    did_not_bat = innings[rows] == 0
+    batting_df = pd.DataFrame({
+        "player": names[rows // n_seasons],
+        "team": team_names[team_of_group[rows]],
+        "season": seasons[rows % n_seasons],
+        "matches": matches_played[rows],
+        "innings": innings[rows],
+        "not_outs": _placeholder(not_outs[rows], did_not_bat),
+        "runs": batting_runs[rows],
+        "high_score": _placeholder(
+            np.char.add(high_score[rows].astype(str), np.where(high_score_not_out[rows], "*", "")), did_not_bat
+        ),
+        "balls": balls[rows],
+        "strike_rate": _placeholder(_ratio(batting_runs[rows] * 100, balls[rows]), did_not_bat | (balls[rows] == 0)),
+        "batting_average": _placeholder(
+            _ratio(batting_runs[rows], innings[rows] - not_outs[rows]), innings[rows] == not_outs[rows]
+        ),
+        "50s": fifties[rows],
+        "100s": hundreds[rows],
+        "4s": fours[rows],
+        "6s": sixes[rows],
+        "catches": catches[rows],
+        "stumpings": stumpings[rows],
+    })
+    no_wickets = wickets[rows] == 0
+    bowling_df = pd.DataFrame({
+        "player": batting_df["player"],
+        "team": batting_df["team"],
+        "season": batting_df["season"],
+        "matches": matches_played[rows],
+        "innings": bowling_innings[rows],
+        "balls_bowled": balls_bowled[rows],
+        "runs_conceded": runs_conceded[rows],
+        "wickets": wickets[rows],
+        "bowling_average": _placeholder(_ratio(runs_conceded[rows], wickets[rows]), no_wickets),
+        "economy_rate": _placeholder(_ratio(runs_conceded[rows], balls_bowled[rows] / 6), balls_bowled[rows] == 0),
+        "strike_rate": _placeholder(_ratio(balls_bowled[rows], wickets[rows]), no_wickets),
+        "3w_hauls": hauls[0][rows],
+        "4w_hauls": hauls[1][rows],
+        "5w_hauls": hauls[2][rows],
+        "best_bowling": best_bowling[rows],
+    })
+    return batting_df, bowling_df
@@ -1,18 +1,70 @@
 import os
+import io
 import json
+import pickle
+import argparse
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+try:
+    import ijson  # Optional: only needed for --stream
+except ImportError:
+    ijson = None
+from delivery_store import (
+    STORE_PATH, PEOPLE_PATH, MATCHUPS_PATH, GAME_LOGS_PATH, GAME_LOG_INDEX_PATH, build_delivery_store, save_delivery_store, save_people_table,
+    build_matchup_matrix, save_matchup_matrix, build_game_logs, save_game_logs, season_stat_tables,
+    SEASON_BATTING_COLUMNS, SEASON_BOWLING_COLUMNS
+)
+from api.cricsheet import normalize_season
 
 DATA_PATH = "ipl_data/"
+STATE_PATH = "player_data/ingest_state.pkl"
+BATTING_STATS_PATH = "player_data/batting_stats.csv"
+BOWLING_STATS_PATH = "player_data/bowling_stats.csv"
+# Bump when the shape of the ingest state changes; older state files are ignored
+STATE_FORMAT = 2
+# Built from every match by pipeline.py / --columnar; --incremental does not refresh them
+FULL_BUILD_ARTIFACTS = [STORE_PATH, MATCHUPS_PATH, GAME_LOGS_PATH, GAME_LOG_INDEX_PATH, "player_data/matches.archive"]
 
-def load_matches():
+def list_match_files():
+    """List match JSON file paths in the ipl_data directory, in directory order"""
+    return [os.path.join(DATA_PATH, fname) for fname in os.listdir(DATA_PATH) if fname.endswith(".json")]
+
+def iter_matches(paths=None):
+    """Yield match JSON files one at a time so only one parsed match is alive at once"""
+    if paths is None:
+        paths = list_match_files()
+    for path in paths:
+        with open(path) as f:
+            yield json.load(f)
+
+def load_matches(paths=None):
     """Load all match JSON files from the ipl_data directory"""
-    matches = []
-    for fname in os.listdir(DATA_PATH):
-        if fname.endswith(".json"):
-            with open(os.path.join(DATA_PATH, fname)) as f:
-                matches.append(json.load(f))
-    return matches
+    return list(iter_matches(paths))
+
+def iter_match_streams(paths=None):
+    """
+    Yield (info, deliveries) per match file using the incremental ijson parser.
+
+    Only the small info block is built as a dict; deliveries are parsed
+    from the file lazily, one at a time, so even a very large match file
+    is never held in memory as a whole.
+    """
+    if ijson is None:
+        raise RuntimeError("Streaming ingest needs the ijson package: pip install ijson")
+    if paths is None:
+        paths = list_match_files()
+    for path in paths:
+        with open(path, "rb") as f:
+            info = next(ijson.items(f, "info", use_float=True))
+        with open(path, "rb") as f:
+            yield info, ijson.items(f, "innings.item.overs.item.deliveries.item", use_float=True)
+
+def iter_deliveries(match):
+    """Yield every delivery of a parsed match, innings by innings"""
+    for inning in match["innings"]:
+        for over in inning["overs"]:
+            yield from over["deliveries"]
 
 def is_legal_delivery(delivery):
     """Check if delivery is legal (not wide) - no-balls count as balls faced"""
@@ -41,117 +93,283 @@ def count_matches_and_innings(matches):
     }))
     
     for match in matches:
-        match_id = f"{match['info']['dates'][0]}_{match['info']['venue']}"
-        # Normalize season to string and fix season formats
-        season = str(match["info"]["season"])
-        if season == "2020/21":
-            season = "2020"
-        elif season == "2007/08":
-            season = "2008"
-        elif season == "2009/10":
-            season = "2010"
-        
-        # Get all players from both teams for match count
-        for team, players in match["info"]["players"].items():
-            for player in players:
-                player_stats[player][season]["matches"].add(match_id)
-        
-        # Track innings, dismissals, and runs for batting stats
-        batters_in_match = set()  # Track who batted in this match
-        dismissed_in_match = set()  # Track who was dismissed in this match
-        runs_in_match = defaultdict(int)  # Track runs per player in this match
-        bowlers_in_match = set()  # Track who bowled in this match
-        
-        for inning in match["innings"]:
-            for over in inning["overs"]:
-                for delivery in over["deliveries"]:
-                    batter = delivery["batter"]
-                    bowler = delivery["bowler"]
-                    non_striker = delivery.get("non_striker", "")
-                    
-                    # Add innings for batter and non_striker (unique per match)
-                    for player in [batter, non_striker]:
-                        if player:  # Skip empty non_striker
-                            batters_in_match.add(player)
-                    
-                    # Add bowling innings (unique per match)
-                    bowlers_in_match.add(bowler)
-                    
-                    # Add balls delivered (excluding wides and no-balls)
-                    if is_legal_delivery(delivery):
-                        player_stats[bowler][season]["balls_bowled"] += 1
-                    
-                    # Add runs conceded (batter runs + wides + no-balls only)
-                    runs_conceded = delivery["runs"]["batter"]  # Batter's runs
-                    if "extras" in delivery:
-                        for extra_type, extra_data in delivery["extras"].items():
-                            if extra_type in ["wides", "noballs"]:
-                                runs_conceded += extra_data.get("runs", 0)
-                    player_stats[bowler][season]["runs_conceded"] += runs_conceded
-                    
-                    # Add runs scored by the batter
-                    runs_scored = delivery["runs"]["batter"]
-                    player_stats[batter][season]["runs"] += runs_scored
-                    runs_in_match[batter] += runs_scored
-                    
-                    # Count 4s and 6s
-                    if runs_scored == 4:
-                        player_stats[batter][season]["fours"] += 1
-                    elif runs_scored == 6:
-                        player_stats[batter][season]["sixes"] += 1
-                    
-                    # Add balls faced (only legal deliveries)
-                    if is_legal_delivery(delivery):
-                        player_stats[batter][season]["balls"] += 1
-                    
-                    # Check for dismissals and fielding stats
-                    if "wickets" in delivery:
-                        for wicket in delivery["wickets"]:
-                            dismissed_in_match.add(wicket["player_out"])
-                            
-                            # Track catches and stumpings
-                            if wicket["kind"] == "caught" and "fielders" in wicket:
-                                for fielder in wicket["fielders"]:
-                                    player_stats[fielder["name"]][season]["catches"] += 1
-                            elif wicket["kind"] == "stumped" and "fielders" in wicket:
-                                for fielder in wicket["fielders"]:
-                                    player_stats[fielder["name"]][season]["stumpings"] += 1
-        
-        # Calculate not outs and update high scores
-        not_outs = batters_in_match - dismissed_in_match
-        for player in not_outs:
-            player_stats[player][season]["not_outs"].add(match_id)
-        
-        # Update high scores and count 50s and 100s for all batters in this match
-        for player in batters_in_match:
-            runs_in_this_match = runs_in_match[player]
-            was_not_out = player in not_outs
-            
-            # Check if this is a new high score
-            if runs_in_this_match > player_stats[player][season]["high_score"]:
-                player_stats[player][season]["high_score"] = runs_in_this_match
-                player_stats[player][season]["high_score_not_out"] = was_not_out
-            elif runs_in_this_match == player_stats[player][season]["high_score"]:
-                # If same score, prefer not out version
-                if was_not_out and not player_stats[player][season]["high_score_not_out"]:
-                    player_stats[player][season]["high_score_not_out"] = True
-            
-            # Count 50s and 100s
-            if runs_in_this_match >= 100:
-                player_stats[player][season]["hundreds"] += 1
-            elif runs_in_this_match >= 50:
-                player_stats[player][season]["fifties"] += 1
-        
-        # Add innings count for batting
-        for player in batters_in_match:
-            player_stats[player][season]["innings"].add(match_id)
-        
-        # Add bowling innings count
-        for player in bowlers_in_match:
-            player_stats[player][season]["bowling_innings"].add(match_id)
-    
+        add_match(player_stats, match["info"], iter_deliveries(match))
+
     return player_stats
 
+def add_match(player_stats, info, deliveries):
+    """Fold one match into player_stats; deliveries may be any iterable, including a stream"""
+    match_id = f"{info['dates'][0]}_{info['venue']}"
+    # Seasons are keyed by their year as a string
+    season = str(normalize_season(info["season"]))
+
+    # Get all players from both teams for match count
+    for team, players in info["players"].items():
+        for player in players:
+            player_stats[player][season]["matches"].add(match_id)
+
+    # Track innings, dismissals, and runs for batting stats
+    batters_in_match = set()  # Track who batted in this match
+    dismissed_in_match = set()  # Track who was dismissed in this match
+    runs_in_match = defaultdict(int)  # Track runs per player in this match
+    bowlers_in_match = set()  # Track who bowled in this match
+
+    for delivery in deliveries:
+        batter = delivery["batter"]
+        bowler = delivery["bowler"]
+        non_striker = delivery.get("non_striker", "")
+
+        # Add innings for batter and non_striker (unique per match)
+        for player in [batter, non_striker]:
+            if player:  # Skip empty non_striker
+                batters_in_match.add(player)
+
+        # Add bowling innings (unique per match)
+        bowlers_in_match.add(bowler)
+
+        # Add balls delivered (excluding wides and no-balls)
+        if is_legal_delivery(delivery):
+            player_stats[bowler][season]["balls_bowled"] += 1
+
+        # Add runs conceded (batter runs + wides + no-balls only)
+        runs_conceded = delivery["runs"]["batter"]  # Batter's runs
+        if "extras" in delivery:
+            for extra_type, extra_runs in delivery["extras"].items():
+                if extra_type in ["wides", "noballs"]:
+                    runs_conceded += extra_runs
+        player_stats[bowler][season]["runs_conceded"] += runs_conceded
+
+        # Add runs scored by the batter
+        runs_scored = delivery["runs"]["batter"]
+        player_stats[batter][season]["runs"] += runs_scored
+        runs_in_match[batter] += runs_scored
+
+        # Count 4s and 6s
+        if runs_scored == 4:
+            player_stats[batter][season]["fours"] += 1
+        elif runs_scored == 6:
+            player_stats[batter][season]["sixes"] += 1
+
+        # Add balls faced (only legal deliveries)
+        if is_legal_delivery(delivery):
+            player_stats[batter][season]["balls"] += 1
+
+        # Check for dismissals and fielding stats
+        if "wickets" in delivery:
+            for wicket in delivery["wickets"]:
+                dismissed_in_match.add(wicket["player_out"])
+
+                # Track catches and stumpings
+                if wicket["kind"] == "caught" and "fielders" in wicket:
+                    for fielder in wicket["fielders"]:
+                        player_stats[fielder["name"]][season]["catches"] += 1
+                elif wicket["kind"] == "stumped" and "fielders" in wicket:
+                    for fielder in wicket["fielders"]:
+                        player_stats[fielder["name"]][season]["stumpings"] += 1
+
+    # Calculate not outs and update high scores
+    not_outs = batters_in_match - dismissed_in_match
+    for player in not_outs:
+        player_stats[player][season]["not_outs"].add(match_id)
+
+    # Update high scores and count 50s and 100s for all batters in this match
+    for player in batters_in_match:
+        runs_in_this_match = runs_in_match[player]
+        was_not_out = player in not_outs
+
+        # Check if this is a new high score
+        if runs_in_this_match > player_stats[player][season]["high_score"]:
+            player_stats[player][season]["high_score"] = runs_in_this_match
+            player_stats[player][season]["high_score_not_out"] = was_not_out
+        elif runs_in_this_match == player_stats[player][season]["high_score"]:
+            # If same score, prefer not out version
+            if was_not_out and not player_stats[player][season]["high_score_not_out"]:
+                player_stats[player][season]["high_score_not_out"] = True
+
+        # Count 50s and 100s
+        if runs_in_this_match >= 100:
+            player_stats[player][season]["hundreds"] += 1
+        elif runs_in_this_match >= 50:
+            player_stats[player][season]["fifties"] += 1
+
+    # Add innings count for batting
+    for player in batters_in_match:
+        player_stats[player][season]["innings"].add(match_id)
+
+    # Add bowling innings count
+    for player in bowlers_in_match:
+        player_stats[player][season]["bowling_innings"].add(match_id)
+
+
+def merge_player_stats(merged, partial):
+    """
+    Fold one partial player_stats result into another.
+
+    Match-id sets are unioned, counters are summed and the high score
+    keeps the larger value, preferring the not-out version on ties.
+    Players and seasons are added in the order the partial first saw
+    them, so merging shards in file order reproduces the serial order.
+    """
+    for player, seasons in partial.items():
+        merged_seasons = merged.setdefault(player, {})
+        for season, stats in seasons.items():
+            current = merged_seasons.get(season)
+            if current is None:
+                # Copy so later merges never mutate the partial we were handed
+                merged_seasons[season] = {
+                    key: set(value) if isinstance(value, set) else value
+                    for key, value in stats.items()
+                }
+                continue
+            for key, value in stats.items():
+                if key in ("high_score", "high_score_not_out"):
+                    continue
+                if isinstance(value, set):
+                    current[key] |= value
+                else:
+                    current[key] += value
+            if stats["high_score"] > current["high_score"]:
+                current["high_score"] = stats["high_score"]
+                current["high_score_not_out"] = stats["high_score_not_out"]
+            elif stats["high_score"] == current["high_score"] and stats["high_score_not_out"]:
+                current["high_score_not_out"] = True
+    return merged
+
+def count_shard(paths):
+    """Worker entry point: aggregate one shard of match files into plain (picklable) dicts"""
+    player_stats = count_matches_and_innings(iter_matches(paths))
+    return {player: dict(seasons) for player, seasons in player_stats.items()}
+
+def count_matches_and_innings_parallel(paths=None, workers=None):
+    """Aggregate match files across a process pool and merge the per-shard partials"""
+    if paths is None:
+        paths = list_match_files()
+    workers = workers or os.cpu_count() or 1
+    # Several contiguous shards per worker keeps the pool busy when match sizes vary
+    shard_size = max(1, -(-len(paths) // (workers * 4)))
+    shards = [paths[i:i + shard_size] for i in range(0, len(paths), shard_size)]
+
+    player_stats = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so shards merge in file order
+        for partial in pool.map(count_shard, shards):
+            merge_player_stats(player_stats, partial)
+    return player_stats
+
+def load_ingest_state():
+    """Load the incremental ingest state, or an empty state if none (of this format) has been saved yet"""
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH, "rb") as f:
+            state = pickle.load(f)
+        if state.get("format") == STATE_FORMAT:
+            return state
+    return {"format": STATE_FORMAT, "manifest": {}, "changed_players": []}
+
+def save_ingest_state(state):
+    """Persist the incremental ingest state"""
+    with open(STATE_PATH, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def read_season_table(path):
+    """A season CSV as strings, exactly as written, or None if it does not exist yet"""
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+def as_written(df):
+    """df as the strings to_csv writes, so fresh rows compare equal to rows read back from disk"""
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)), dtype=str, keep_default_na=False)
+
+def splice_season_rows(current, rebuilt, seasons):
+    """
+    Replace the rows of the given seasons in a season table with rebuilt
+    ones. Surviving rows keep their position, a player's new seasons go
+    after their last row and new players at the end, which is where a
+    full rebuild puts matches appended to ipl_data/. Returns the spliced
+    table and the (player, season) keys whose rows were added, changed or
+    removed.
+    """
+    rebuilt_rows = {(row["player"], row["season"]): row for row in rebuilt.to_dict(orient="records")}
+    rows, changed = [], set()
+    for row in ([] if current is None else current.to_dict(orient="records")):
+        key = (row["player"], row["season"])
+        if row["season"] not in seasons:
+            rows.append(row)
+            continue
+        new_row = rebuilt_rows.pop(key, None)
+        if new_row != row:
+            changed.add(key)
+        if new_row is not None:
+            rows.append(new_row)
+
+    for key, row in rebuilt_rows.items():
+        changed.add(key)
+        last = max((i for i, existing in enumerate(rows) if existing["player"] == row["player"]), default=len(rows) - 1)
+        rows.insert(last + 1, row)
+    return pd.DataFrame(rows, columns=rebuilt.columns), changed
+
+def update_incremental(state, paths=None):
+    """
+    Re-aggregate only the seasons whose match files are new, revised or
+    removed, and splice their rows into player_data/batting_stats.csv and
+    bowling_stats.csv.
+
+    The manifest records each file's size/mtime, its CricSheet
+    meta.data_version/revision and its season. Files whose size and
+    mtime are unchanged are skipped without being opened; files that
+    were touched but still carry the same version are not re-aggregated.
+    A season row depends on all of that season's matches (team, high
+    score, best bowling), so every season with a changed match is rebuilt
+    from its files with the same season_stat_tables the full pipeline
+    uses. Whole seasons are re-parsed rather than per-(player, season)
+    aggregates stored. Only the season tables are updated: the delivery
+    store, matchups, game logs and match archive need a full rebuild.
+    Returns the (player, season) keys whose rows changed.
+    """
+    if paths is None:
+        paths = list_match_files()
+    manifest = state["manifest"]
+
+    seen = set()
+    seasons = set()  # seasons to rebuild
+    for path in paths:
+        fname = os.path.basename(path)
+        seen.add(fname)
+        file_stat = os.stat(path)
+        entry = manifest.get(fname)
+        if entry and entry["size"] == file_stat.st_size and entry["mtime"] == file_stat.st_mtime:
+            continue
+
+        with open(path) as f:
+            match = json.load(f)
+        version = (match["meta"].get("data_version"), match["meta"].get("revision"))
+        season = normalize_season(match["info"]["season"])
+        if entry is None or entry["version"] != version:
+            seasons.add(season)
+            if entry is not None:
+                seasons.add(entry["season"])
+        manifest[fname] = {"size": file_stat.st_size, "mtime": file_stat.st_mtime, "version": version, "season": season}
+
+    for fname in set(manifest) - seen:
+        seasons.add(manifest.pop(fname)["season"])
+
+    affected = set()
+    if seasons:
+        files = sorted(fname for fname, entry in manifest.items() if entry["season"] in seasons)
+        if files:
+            batting_df, bowling_df = season_stat_tables(build_delivery_store(DATA_PATH, files=files))
+        else:
+            # Every match of these seasons was removed: their rows are just dropped
+            batting_df, bowling_df = pd.DataFrame(columns=SEASON_BATTING_COLUMNS), pd.DataFrame(columns=SEASON_BOWLING_COLUMNS)
+        season_keys = {str(season) for season in seasons}
+        for path, rebuilt in ((BATTING_STATS_PATH, batting_df), (BOWLING_STATS_PATH, bowling_df)):
+            table, changed = splice_season_rows(read_season_table(path), as_written(rebuilt), season_keys)
+            table.to_csv(path, index=False)
+            affected |= changed
+
+    state["changed_players"] = sorted({player for player, _ in affected})
+    return affected
+
 def save_match_counts(player_stats):
     """Save match, innings, not out, run, high score, balls faced, strike rate, 50s, 100s, 4s, 6s, catches, and stumpings counts to CSV files"""
     batting_rows = []
@@ -200,16 +418,72 @@ def save_match_counts(player_stats):
     pd.DataFrame(batting_rows).to_csv("batting_stats.csv", index=False)
     pd.DataFrame(bowling_rows).to_csv("bowling_stats.csv", index=False)
 
+def run_columnar():
+    """Build the columnar delivery store, matchup matrix and game logs, and aggregate season stats from the store"""
+    print("Building columnar delivery store...")
+    store = build_delivery_store(DATA_PATH)
+    save_delivery_store(store)
+    save_people_table(store)
+    print(f"Saved registry ids and names to {PEOPLE_PATH}")
+    print(f"Stored {len(store['match'])} deliveries from {len(store['match_key'])} matches in {STORE_PATH}")
+
+    matchups = build_matchup_matrix(store)
+    save_matchup_matrix(matchups)
+    print(f"Stored {len(matchups['indices'])} batter-bowler pairs in {MATCHUPS_PATH}")
+
+    logs = build_game_logs(store)
+    save_game_logs(store, logs)
+    print(f"Saved {len(logs['person'])} player innings to {GAME_LOGS_PATH} and {GAME_LOG_INDEX_PATH}")
+
+    print("Aggregating season stats from the delivery store...")
+    batting_df, bowling_df = season_stat_tables(store)
+    batting_df.to_csv(BATTING_STATS_PATH, index=False)
+    bowling_df.to_csv(BOWLING_STATS_PATH, index=False)
+    print(f"Done! Created {BATTING_STATS_PATH} and {BOWLING_STATS_PATH}")
+
 if __name__ == "__main__":
-    print("Loading match files...")
-    matches = load_matches()
-    print(f"Loaded {len(matches)} matches.")
-    
-    print("Counting matches, innings, not outs, runs, high scores, balls faced, strike rates, 50s, 100s, 4s, 6s, catches, and stumpings per player per season...")
-    player_stats = count_matches_and_innings(matches)
-    
-    print("Saving to CSV files...")
-    save_match_counts(player_stats)
-    print("Done! Created batting_stats.csv and bowling_stats.csv")
+    parser = argparse.ArgumentParser(description="Aggregate season stats from CricSheet match files")
+    parser.add_argument("--columnar", action="store_true", help="build the columnar delivery store and aggregate from it")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (0 = one per CPU)")
+    parser.add_argument("--stream", action="store_true", help="parse deliveries incrementally with ijson instead of loading whole files")
+    parser.add_argument("--incremental", action="store_true", help=f"only re-aggregate new or revised matches (state kept in {STATE_PATH})")
+    args = parser.parse_args()
+
+    if args.columnar:
+        run_columnar()
+    elif args.incremental:
+        state = load_ingest_state()
+        manifest = dict(state["manifest"])
+        affected = update_incremental(state)
+        save_ingest_state(state)
+        print(f"Updated {len(affected)} player-seasons for {len(state['changed_players'])} players.")
+        print(f"Done! {BATTING_STATS_PATH} and {BOWLING_STATS_PATH} are up to date")
+        stale = [path for path in FULL_BUILD_ARTIFACTS if os.path.exists(path)]
+        if stale and state["manifest"] != manifest:
+            print(f"Warning: {', '.join(stale)} still reflect the previous match files; run pipeline.py to rebuild them")
+    elif args.workers != 1:
+        paths = list_match_files()
+        workers = args.workers or os.cpu_count()
+        print(f"Counting {len(paths)} match files across {workers} worker processes...")
+        player_stats = count_matches_and_innings_parallel(paths, workers)
+
+        print("Saving to CSV files...")
+        save_match_counts(player_stats)
+        print("Done! Created batting_stats.csv and bowling_stats.csv")
+    elif args.stream:
+        print("Streaming deliveries from match files...")
+        player_stats = count_matches_and_innings([])
+        for info, deliveries in iter_match_streams():
+            add_match(player_stats, info, deliveries)
 
+        print("Saving to CSV files...")
+        save_match_counts(player_stats)
+        print("Done! Created batting_stats.csv and bowling_stats.csv")
+    else:
+        # Matches are parsed, folded in and released one at a time
+        print("Counting matches, innings, not outs, runs, high scores, balls faced, strike rates, 50s, 100s, 4s, 6s, catches, and stumpings per player per season...")
+        player_stats = count_matches_and_innings(iter_matches())
 
+        print("Saving to CSV files...")
+        save_match_counts(player_stats)
+        print("Done! Created batting_stats.csv and bowling_stats.csv")
@@ -0,0 +1,165 @@
+import os
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from delivery_store import (
+    DATA_PATH, STORE_PATH, PEOPLE_PATH, MATCHUPS_PATH, GAME_LOGS_PATH, GAME_LOG_INDEX_PATH,
+    build_delivery_store, save_delivery_store, save_people_table, build_matchup_matrix, save_matchup_matrix,
+    build_game_logs, save_game_logs, season_stat_tables
+)
+from career_stats import aggregate_career_stats, save_career_stats
+
+# The serving-side builders (match archive, snapshot) live with the API
+from api.match_archive import MATCH_ARCHIVE_PATH, MatchArchiveBuilder
+from api.snapshot import SNAPSHOT_PATH, compute_data_version, encode_snapshot, write_snapshot
+
+BATTING_STATS_PATH = "player_data/batting_stats.csv"
+BOWLING_STATS_PATH = "player_data/bowling_stats.csv"
+
+class MemorySampler:
+    """
+    Peak resident memory of this process between reset() calls, sampled
+    from /proc/self/statm in a daemon thread (Linux only; elsewhere peak()
+    is None). Unlike tracemalloc this does not slow the stages down, but
+    it can miss spikes shorter than the interval.
+    """
+
+    def __init__(self, interval=0.005):
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.available = os.path.exists("/proc/self/statm")
+        self.max_rss = 0
+        if self.available:
+            threading.Thread(target=self.sample, args=(interval,), name="memory-sampler", daemon=True).start()
+
+    def rss(self):
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * self.page_size
+
+    def sample(self, interval):
+        while True:
+            self.max_rss = max(self.max_rss, self.rss())
+            time.sleep(interval)
+
+    def reset(self):
+        if self.available:
+            self.max_rss = self.rss()
+
+    def peak(self):
+        """Peak RSS in MB since the last reset"""
+        return max(self.max_rss, self.rss()) / 1e6 if self.available else None
+
+@contextmanager
+def stage(timings, name, profile=None):
+    """
+    Time one pipeline stage into timings[name]. With a profile (a dict
+    holding a MemorySampler under "memory") also record the stage's peak
+    RSS and whatever counts the stage sets on the yielded dict, such as
+    the deliveries it processed, into profile[name].
+    """
+    work = {}
+    if profile is not None:
+        profile["memory"].reset()
+    start = time.perf_counter()
+    yield work
+    timings[name] = time.perf_counter() - start
+    if profile is not None:
+        profile[name] = {**work, "peak_rss_mb": profile["memory"].peak()}
+
+def timing_report(timings):
+    """Per-stage timings, one line each, with the total"""
+    width = max(len(name) for name in timings)
+    lines = [f"  {name:<{width}}  {seconds * 1000:8.1f}ms" for name, seconds in timings.items()]
+    lines.append(f"  {'total':<{width}}  {sum(timings.values()) * 1000:8.1f}ms")
+    return "\n".join(lines)
+
+def profile_report(timings, profile):
+    """Per-stage wall time, throughput and peak memory, one line each"""
+    width = max(len(name) for name in timings)
+    lines = [f"  {'stage':<{width}}  {'wall':>9}  {'deliveries':>10}  {'per second':>10}  {'peak RSS':>9}"]
+    for name, seconds in timings.items():
+        deliveries, rss = profile[name].get("deliveries"), profile[name]["peak_rss_mb"]
+        lines.append(
+            f"  {name:<{width}}  {seconds * 1000:7.1f}ms  {deliveries if deliveries else '-':>10}  "
+            f"{f'{deliveries / seconds:,.0f}' if deliveries else '-':>10}  {f'{rss:.1f}MB' if rss else '-':>9}"
+        )
+    return "\n".join(lines)
+
+def run_pipeline(data_path=DATA_PATH, compress_archive=False, snapshot=True, profile=None):
+    """
+    Read every match file in data_path once and write every serving
+    artifact from that single pass: the delivery store and people table,
+    the season and career batting/bowling tables, the matchup matrix,
+    game logs, the match archive and finally the serving snapshot (player,
+    season, team roster, leaderboard and search tables). The season,
+    career, matchup, game log and archive stages work from the in-memory
+    delivery store. The snapshot is the exception: it is compiled from
+    the CSVs just written, the same way the API compiles it on start, so
+    its payloads match one built there byte for byte (the CSV round trip
+    decides how mixed number/'-' columns are typed). Reading the CSVs
+    takes a few tens of milliseconds; encoding the tables is the rest.
+    Returns the seconds spent in each stage; pass
+    profile={"memory": MemorySampler()} to also have each stage's
+    deliveries processed and peak memory recorded in it.
+    """
+    timings = {}
+    archive = MatchArchiveBuilder(compress_archive)
+
+    with stage(timings, "parse match files", profile) as work:
+        store = build_delivery_store(data_path, on_match=archive.add)
+        work["deliveries"] = deliveries = len(store["match"])
+    print(f"Read {deliveries} deliveries from {len(store['match_key'])} matches")
+
+    with stage(timings, "delivery store", profile) as work:
+        work["deliveries"] = deliveries
+        save_delivery_store(store)
+        save_people_table(store)
+    print(f"Saved {STORE_PATH} and {PEOPLE_PATH}")
+
+    with stage(timings, "season tables", profile) as work:
+        work["deliveries"] = deliveries
+        batting_df, bowling_df = season_stat_tables(store)
+        batting_df.to_csv(BATTING_STATS_PATH, index=False)
+        bowling_df.to_csv(BOWLING_STATS_PATH, index=False)
+    print(f"Saved {len(batting_df)} player-seasons to {BATTING_STATS_PATH} and {BOWLING_STATS_PATH}")
+
+    with stage(timings, "career tables", profile):
+        save_career_stats(*aggregate_career_stats(batting_df, bowling_df))
+
+    with stage(timings, "matchups", profile) as work:
+        work["deliveries"] = deliveries
+        matchups = build_matchup_matrix(store)
+        save_matchup_matrix(matchups)
+    print(f"Saved {len(matchups['indices'])} batter-bowler pairs to {MATCHUPS_PATH}")
+
+    with stage(timings, "game logs", profile) as work:
+        work["deliveries"] = deliveries
+        logs = build_game_logs(store)
+        save_game_logs(store, logs)
+    print(f"Saved {len(logs['person'])} player innings to {GAME_LOGS_PATH} and {GAME_LOG_INDEX_PATH}")
+
+    with stage(timings, "match archive", profile):
+        archive.write()
+    print(f"Saved {MATCH_ARCHIVE_PATH}")
+
+    if snapshot:
+        # Last, so the snapshot's version covers every file written above. It is
+        # compiled from the CSVs just written, exactly as the API would on start
+        with stage(timings, "serving snapshot", profile):
+            from api.build_snapshot import build_tables
+            write_snapshot(SNAPSHOT_PATH, encode_snapshot(compute_data_version(), build_tables()))
+        print(f"Saved {SNAPSHOT_PATH}")
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build every serving artifact from the CricSheet match files in one pass")
+    parser.add_argument("--compress-archive", action="store_true", help="zlib-compress each match in the match archive")
+    parser.add_argument("--no-snapshot", action="store_true", help="skip the serving snapshot (the API builds it on start)")
+    parser.add_argument("--profile", action="store_true",
+                        help="also report deliveries/sec and peak memory per stage")
+    args = parser.parse_args()
+
+    profile = {"memory": MemorySampler()} if args.profile else None
+    timings = run_pipeline(compress_archive=args.compress_archive, snapshot=not args.no_snapshot, profile=profile)
+    print("Stage timings:")
+    print(profile_report(timings, profile) if args.profile else timing_report(timings))
@@ -0,0 +1,59 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import data_loader
+from admin_routes import router
+
+def make_client(monkeypatch, served="v1", on_disk="v2"):
+    """The admin route over a stand-in dataset, with load_dataset counting its calls"""
+    loads = []
+
+    def load_dataset():
+        loads.append(on_disk)
+        return SimpleNamespace(version=on_disk)
+
+    monkeypatch.setattr(data_loader, "dataset", SimpleNamespace(version=served))
+    monkeypatch.setattr(data_loader, "compute_data_version", lambda: on_disk)
+    monkeypatch.setattr(data_loader, "load_dataset", load_dataset)
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), loads
+
+def test_reload_swaps_in_the_new_version(monkeypatch):
+    monkeypatch.setenv("IPL_ADMIN_TOKEN", "secret")
+    client, loads = make_client(monkeypatch)
+    old = data_loader.current_dataset()
+
+    response = client.post("/admin/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reloaded"] is True
+    assert body["version"] == "v2" == data_loader.current_version()
+    assert body["scope"] == "worker" and body["pid"] == os.getpid()
+    assert data_loader.current_dataset() is not old
+
+    # Nothing new on disk: the active dataset is kept
+    again = client.post("/admin/reload", headers={"X-Admin-Token": "secret"}).json()
+    assert again["reloaded"] is False and again["version"] == "v2"
+    assert loads == ["v2"]
+
+def test_reload_rejects_a_bad_token(monkeypatch):
+    monkeypatch.setenv("IPL_ADMIN_TOKEN", "secret")
+    client, loads = make_client(monkeypatch)
+
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "guess"}).status_code == 403
+    assert client.post("/admin/reload").status_code == 403
+    assert data_loader.current_version() == "v1"
+    assert loads == []
+
+def test_reload_is_hidden_without_a_configured_token(monkeypatch):
+    monkeypatch.delenv("IPL_ADMIN_TOKEN", raising=False)
+    client, loads = make_client(monkeypatch)
+
+    assert client.post("/admin/reload", headers={"X-Admin-Token": ""}).status_code == 404
+    assert loads == []
@@ -0,0 +1,15 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from build_snapshot import last_name
+
+def test_last_name():
+    assert last_name("CH Gayle") == "Gayle"
+    assert last_name("Rashid Khan") == "Khan"
+    assert last_name("Sachin") == "Sachin"
+
+def test_last_name_ignores_namesake_suffix():
+    assert last_name("Arshad Khan (2)") == "Khan"
+    assert last_name("Arshad Khan (12)") == "Khan"
@@ -0,0 +1,64 @@
+import io
+import os
+import sys
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import data_loader
+from build_snapshot import build_series_table
+from compare import MAX_PLAYERS
+from player_routes import router
+from snapshot import Snapshot, encode_snapshot
+
+BATTING_CSV = """player,team,season,matches,innings,not_outs,runs,high_score,balls,strike_rate,batting_average,50s,100s,4s,6s,catches,stumpings
+A,RCB,2017,5,5,1,200,80,150,133.33,50.0,2,0,10,5,0,0
+A,RCB,2018,5,5,0,100,40,90,111.11,20.0,0,0,8,2,0,0
+C,CSK,2018,2,2,2,100,70*,60,166.67,-,1,0,9,4,0,0
+"""
+
+BOWLING_CSV = """player,team,season,matches,innings,balls_bowled,runs_conceded,wickets,bowling_average,economy_rate,strike_rate,3w_hauls,4w_hauls,5w_hauls,best_bowling
+A,RCB,2017,5,0,0,0,0,-,-,-,0,0,0,-
+A,RCB,2018,5,1,6,12,0,-,12.0,-,0,0,0,-
+C,CSK,2018,2,2,48,60,3,20.0,7.5,16.0,1,0,0,3/20
+"""
+
+@pytest.fixture
+def client(monkeypatch):
+    tables = build_series_table(pd.read_csv(io.StringIO(BATTING_CSV)), pd.read_csv(io.StringIO(BOWLING_CSV)))
+    monkeypatch.setattr(data_loader, "dataset", data_loader.Dataset(Snapshot(encode_snapshot("test", tables))))
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+def test_compare_aligns_seasons(client):
+    body = client.get("/compare", params={"players": "a, C", "metrics": "runs,average,wickets"}).json()
+    assert body["players"] == ["A", "C"]
+    assert body["seasons"] == [2017, 2018]
+    assert body["series"]["runs"] == {"A": [200, 100], "C": [None, 100]}
+    # An undefined average stays null, like a season not played
+    assert body["series"]["average"] == {"A": [50.0, 20.0], "C": [None, None]}
+    assert body["series"]["wickets"] == {"A": [0, 0], "C": [None, 3]}
+
+def test_the_same_player_twice_is_compared_once(client):
+    body = client.get("/compare", params={"players": "A,a,A ", "metrics": "runs"}).json()
+    assert body["players"] == ["A"] and body["series"] == {"runs": {"A": [200, 100]}}
+
+@pytest.mark.parametrize("players", ["", " ", ",", " , ,"])
+def test_no_names_is_a_bad_request(client, players):
+    response = client.get("/compare", params={"players": players})
+    assert response.status_code == 400 and response.json()["detail"] == "No players given"
+
+def test_unknown_names_are_not_found(client):
+    response = client.get("/compare", params={"players": "A,Nobody"})
+    assert response.status_code == 404 and response.json()["detail"] == "Player 'Nobody' not found"
+    assert client.get("/compare", params={"players": "Nobody,Noone"}).status_code == 404
+
+def test_bad_requests(client):
+    assert client.get("/compare").status_code == 422
+    assert client.get("/compare", params={"players": "A", "metrics": "runs,height"}).status_code == 400
+    too_many = ",".join(f"P{i}" for i in range(MAX_PLAYERS + 1))
+    assert client.get("/compare", params={"players": too_many}).status_code == 400
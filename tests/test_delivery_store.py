@@ -0,0 +1,56 @@
+import os
+import sys
+import json
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from delivery_store import PHASES, build_delivery_store, powerplay_overs
+
+def over_phases(tmp_path, powerplays=None):
+    """Phase name of each over of a one-ball-per-over, 20-over innings with the given powerplays"""
+    inning = {
+        "team": "Mumbai Indians",
+        "overs": [
+            {"over": over, "deliveries": [{"batter": "A", "bowler": "B", "non_striker": "C", "runs": {"batter": 1, "extras": 0, "total": 1}}]}
+            for over in range(20)
+        ]
+    }
+    if powerplays is not None:
+        inning["powerplays"] = powerplays
+    match = {
+        "meta": {"data_version": "1.1.0", "revision": 1},
+        "info": {
+            "season": "2020/21", "dates": ["2020-09-19"], "venue": "Wankhede Stadium",
+            "teams": ["Mumbai Indians", "Chennai Super Kings"],
+            "players": {"Mumbai Indians": ["A", "C"], "Chennai Super Kings": ["B"]}
+        },
+        "innings": [inning]
+    }
+    with open(tmp_path / "1.json", "w") as f:
+        json.dump(match, f)
+    store = build_delivery_store(str(tmp_path))
+    return [PHASES[phase] for phase in store["phase"]]
+
+def test_powerplay_overs_from_over_ball_ranges():
+    assert powerplay_overs({"powerplays": [{"from": 0.1, "to": 5.6}]}) == set(range(6))
+    # An over the powerplay only partly covers still counts
+    assert powerplay_overs({"powerplays": [{"from": 0.1, "to": 1.7}]}) == {0, 1}
+    assert powerplay_overs({"powerplays": [{"from": 0.1, "to": 5.6}, {"from": 15.1, "to": 16.6}]}) == {0, 1, 2, 3, 4, 5, 15, 16}
+    assert powerplay_overs({}) == set(range(6))
+
+def test_standard_phases(tmp_path):
+    phases = over_phases(tmp_path, [{"from": 0.1, "to": 5.6, "type": "mandatory"}])
+    assert phases == ["powerplay"] * 6 + ["middle"] * 9 + ["death"] * 5
+
+def test_shortened_powerplay(tmp_path):
+    # A rain-reduced innings whose powerplay ends during the second over
+    phases = over_phases(tmp_path, [{"from": 0.1, "to": 1.7, "type": "mandatory"}])
+    assert phases == ["powerplay"] * 2 + ["middle"] * 13 + ["death"] * 5
+
+def test_powerplay_inside_the_death_overs(tmp_path):
+    phases = over_phases(tmp_path, [{"from": 0.1, "to": 3.6}, {"from": 15.1, "to": 15.6}])
+    assert phases == ["powerplay"] * 4 + ["middle"] * 11 + ["powerplay"] + ["death"] * 4
+
+def test_missing_powerplays_use_the_first_six_overs(tmp_path):
+    assert over_phases(tmp_path) == ["powerplay"] * 6 + ["middle"] * 9 + ["death"] * 5
@@ -0,0 +1,70 @@
+import os
+import sys
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "api"))
+
+from delivery_store import build_delivery_store, build_game_logs, save_game_logs
+from game_logs import GameLogIndex, load_game_logs
+
+# The first twenty matches of 2017, so regular players have more innings than a form window
+MATCH_FILES = [f"{match_id}.json" for match_id in range(1082591, 1082611)]
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("game_logs")
+    store = build_delivery_store(os.path.join(REPO_DIR, "ipl_data"), files=MATCH_FILES)
+    save_game_logs(store, build_game_logs(store), tmp_path / "game_logs.csv", tmp_path / "game_logs.npz")
+    return GameLogIndex(load_game_logs(tmp_path / "game_logs.npz"))
+
+def busiest(index, role):
+    """The person with the most innings in a role, and all their log rows"""
+    def innings(person):
+        return sum(row[role] is not None for row in index.log(person)["innings"])
+    person = max(range(len(index.names)), key=innings)
+    return person, index.log(person)["innings"]
+
+def summed(rows, role):
+    """Form totals of rows, added up one innings at a time"""
+    if role == "batting":
+        runs, balls = sum(row["runs"] for row in rows), sum(row["balls"] for row in rows)
+        return {"innings": len(rows), "runs": runs, "balls": balls, "4s": sum(row["4s"] for row in rows)}
+    return {"innings": len(rows), "balls": sum(row["balls"] for row in rows), "wickets": sum(row["wickets"] for row in rows)}
+
+@pytest.mark.parametrize("role", ["batting", "bowling"])
+def test_form_windows_match_summed_innings(index, role):
+    person, rows = busiest(index, role)
+    played = [row for row in rows if row[role] is not None]
+    assert len(played) > 5
+
+    dates = [row["date"] for row in played]
+    for n in (1, 3, len(played), len(played) + 5):
+        for date_to in (None, dates[0], dates[len(dates) // 2], dates[-1]):
+            eligible = [row for row in played if date_to is None or row["date"] <= date_to]
+            recent = eligible[-n:]
+            form = index.form(person, n, date_to)[role]
+            expected = summed([row[role] for row in recent], role)
+            assert {key: form[key] for key in expected} == expected
+            assert [entry["match_id"] for entry in form["recent"]] == [row["match_id"] for row in recent]
+
+def test_form_before_the_first_innings_is_empty(index):
+    person, rows = busiest(index, "batting")
+    form = index.form(person, 10, "2000-01-01")
+    assert form["batting"]["innings"] == 0 and form["batting"]["recent"] == []
+    assert form["batting"]["average"] is None and form["batting"]["strike_rate"] is None
+
+def test_log_dates_are_inclusive(index):
+    person, rows = busiest(index, "batting")
+    first, last = rows[0]["date"], rows[-1]["date"]
+    assert index.log(person, first, last)["innings"] == rows
+    assert [row["date"] for row in index.log(person, first, first)["innings"]] == [first]
+    assert index.log(person, last, first)["innings"] == []
+    assert index.log(person, "2000-01-01", "2000-12-31")["innings"] == []
+
+    # Window totals are prefix-sum differences; they agree with adding up the rows
+    middle = rows[len(rows) // 2]["date"]
+    window = index.log(person, first, middle)
+    batted = [row["batting"] for row in window["innings"] if row["batting"] is not None]
+    assert {key: window["batting"][key] for key in ("innings", "runs", "balls", "4s")} == summed(batted, "batting")
@@ -0,0 +1,87 @@
+import os
+import sys
+import gzip
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from http_cache import HTTPCacheMiddleware
+
+BODY = b'{"runs":[' + b",".join(b"%d" % i for i in range(400)) + b"]}"
+
+def make_client(max_bytes=1024 * 1024):
+    """A one-route app behind the cache, with a settable version and a count of route calls"""
+    state = {"version": "v1", "calls": 0}
+    app = FastAPI()
+
+    @app.get("/player/{name}/log")
+    def log(name: str, limit: int = 10):
+        state["calls"] += 1
+        return Response(content=BODY, media_type="application/json")
+
+    app.add_middleware(HTTPCacheMiddleware, get_version=lambda: state["version"], routes=app.routes, max_bytes=max_bytes)
+    return TestClient(app), state
+
+def get(client, url, **headers):
+    return client.get(url, headers={"accept-encoding": "identity", **headers})
+
+def test_etag_follows_the_data_version():
+    client, state = make_client()
+    first = get(client, "/player/x/log")
+    assert first.status_code == 200 and first.content == BODY
+    assert first.headers["x-data-version"] == "v1"
+    assert get(client, "/player/x/log").headers["etag"] == first.headers["etag"]
+    assert state["calls"] == 1
+
+    state["version"] = "v2"
+    second = get(client, "/player/x/log")
+    assert second.headers["etag"] != first.headers["etag"]
+    assert state["calls"] == 2
+
+def test_matching_if_none_match_is_not_modified():
+    client, state = make_client()
+    etag = get(client, "/player/x/log").headers["etag"]
+    revalidated = get(client, "/player/x/log", **{"if-none-match": f'"other", {etag}'})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert state["calls"] == 1
+
+    # A wildcard says nothing about this representation, so it is served
+    assert get(client, "/player/x/log", **{"if-none-match": "*"}).status_code == 200
+    state["version"] = "v2"
+    assert get(client, "/player/x/log", **{"if-none-match": etag}).status_code == 200
+
+def test_encoding_follows_accept_encoding():
+    client, _ = make_client()
+    zipped = client.get("/player/x/log", headers={"accept-encoding": "gzip"})
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.content == BODY  # decoded by the client
+    plain = get(client, "/player/x/log")
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != zipped.headers["etag"]
+
+def test_only_declared_parameters_key_the_cache():
+    client, state = make_client()
+    etag = get(client, "/player/x/log?limit=5").headers["etag"]
+    assert get(client, "/player/x/log?junk=1&limit=5").headers["etag"] == etag
+    assert state["calls"] == 1
+    assert get(client, "/player/x/log?limit=6").headers["etag"] != etag
+    assert state["calls"] == 2
+
+def test_cache_is_bounded_by_bytes():
+    client, state = make_client(max_bytes=3 * len(BODY))
+    for name in "abcdef":
+        get(client, f"/player/{name}/log")
+    middleware = client.app.middleware_stack.app
+    while not isinstance(middleware, HTTPCacheMiddleware):
+        middleware = middleware.app
+    assert 0 < middleware.size <= 3 * len(BODY)
+    assert len(middleware.entries) < 6
+
+    # The oldest were evicted, the newest are still served from memory
+    get(client, "/player/f/log")
+    assert state["calls"] == 6
+    get(client, "/player/a/log")
+    assert state["calls"] == 7
@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import shutil
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import parse_and_aggregate
+from career_stats import load_career_stats, save_career_stats, update_career_stats
+from delivery_store import build_delivery_store, season_stat_tables
+
+# Six matches over two seasons, enough for season rows to span several matches
+MATCH_FILES = ["1082591.json", "1082592.json", "1082593.json", "1136561.json", "1136562.json", "1136563.json"]
+
+def incremental_run():
+    state = parse_and_aggregate.load_ingest_state()
+    parse_and_aggregate.update_incremental(state)
+    parse_and_aggregate.save_ingest_state(state)
+    return state["changed_players"]
+
+def by_key(df):
+    return df.astype(str).sort_values(["player", "season"]).reset_index(drop=True)
+
+def test_edited_match_updates_served_career_row(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "ipl_data")
+    os.makedirs(tmp_path / "player_data")
+    for fname in MATCH_FILES:
+        shutil.copy(os.path.join(REPO_DIR, "ipl_data", fname), tmp_path / "ipl_data" / fname)
+    monkeypatch.chdir(tmp_path)
+
+    incremental_run()
+    save_career_stats(*load_career_stats())
+
+    # Credit the first batter of one match with two more runs in a new CricSheet revision
+    path = tmp_path / "ipl_data" / MATCH_FILES[0]
+    with open(path) as f:
+        match = json.load(f)
+    delivery = match["innings"][0]["overs"][0]["deliveries"][0]
+    batter = delivery["batter"]
+    delivery["runs"]["batter"] += 2
+    delivery["runs"]["total"] += 2
+    match["meta"]["revision"] += 1
+    with open(path, "w") as f:
+        json.dump(match, f)
+
+    def career_runs():
+        career = pd.read_csv("player_data/career_batting_stats.csv")
+        return int(career.loc[career["player"] == batter, "runs"].iloc[0])
+
+    before = career_runs()
+    changed_players = incremental_run()
+    assert batter in changed_players
+    save_career_stats(*update_career_stats(changed_players))
+    assert career_runs() == before + 2
+
+    # The spliced season tables hold exactly what a full rebuild produces
+    full_batting, full_bowling = season_stat_tables(build_delivery_store("ipl_data/", files=sorted(MATCH_FILES)))
+    served_batting = pd.read_csv("player_data/batting_stats.csv", dtype=str, keep_default_na=False)
+    served_bowling = pd.read_csv("player_data/bowling_stats.csv", dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(by_key(served_batting), by_key(parse_and_aggregate.as_written(full_batting)))
+    pd.testing.assert_frame_equal(by_key(served_bowling), by_key(parse_and_aggregate.as_written(full_bowling)))
+
+def test_untouched_files_change_nothing(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "ipl_data")
+    os.makedirs(tmp_path / "player_data")
+    for fname in MATCH_FILES:
+        shutil.copy(os.path.join(REPO_DIR, "ipl_data", fname), tmp_path / "ipl_data" / fname)
+    monkeypatch.chdir(tmp_path)
+
+    incremental_run()
+    # Touched but the same revision: nothing is re-aggregated
+    os.utime(tmp_path / "ipl_data" / MATCH_FILES[0])
+    assert incremental_run() == []
+
+def test_removed_season_drops_its_rows(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / "ipl_data")
+    os.makedirs(tmp_path / "player_data")
+    for fname in MATCH_FILES:
+        shutil.copy(os.path.join(REPO_DIR, "ipl_data", fname), tmp_path / "ipl_data" / fname)
+    monkeypatch.chdir(tmp_path)
+
+    incremental_run()
+    # Remove every 2018 match: that season has no files left to rebuild from
+    for fname in MATCH_FILES[3:]:
+        os.remove(tmp_path / "ipl_data" / fname)
+    assert incremental_run()
+
+    full_batting, full_bowling = season_stat_tables(build_delivery_store("ipl_data/", files=sorted(MATCH_FILES[:3])))
+    served_batting = pd.read_csv("player_data/batting_stats.csv", dtype=str, keep_default_na=False)
+    served_bowling = pd.read_csv("player_data/bowling_stats.csv", dtype=str, keep_default_na=False)
+    assert set(served_batting["season"]) == {"2017"}
+    pd.testing.assert_frame_equal(by_key(served_batting), by_key(parse_and_aggregate.as_written(full_batting)))
+    pd.testing.assert_frame_equal(by_key(served_bowling), by_key(parse_and_aggregate.as_written(full_bowling)))
+
+    # Removing the last season too leaves empty tables with their headers
+    for fname in MATCH_FILES[:3]:
+        os.remove(tmp_path / "ipl_data" / fname)
+    incremental_run()
+    served_batting = pd.read_csv("player_data/batting_stats.csv")
+    assert served_batting.empty and list(served_batting.columns) == list(full_batting.columns)
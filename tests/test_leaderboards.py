@@ -0,0 +1,54 @@
+import io
+import os
+import sys
+import json
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from build_snapshot import build_leaderboard_tables
+from leaderboards import board_page
+from snapshot import filter_key
+
+BATTING_CSV = """player,team,season,matches,innings,not_outs,runs,high_score,balls,strike_rate,batting_average,50s,100s,4s,6s,catches,stumpings
+A,RCB,2017,5,5,1,200,80,150,133.33,50.0,2,0,10,5,0,0
+B,MI,2017,5,5,0,150,60,100,150.0,30.0,1,0,12,3,1,0
+A,RCB,2018,5,5,0,100,40,90,111.11,20.0,0,0,8,2,0,0
+B,MI,2018,5,5,1,300,90*,200,150.0,75.0,3,0,20,10,0,0
+C,CSK,2018,2,2,0,100,70,60,166.67,50.0,1,0,9,4,0,0
+"""
+
+BOWLING_CSV = """player,team,season,matches,innings,balls_bowled,runs_conceded,wickets,bowling_average,economy_rate,strike_rate,3w_hauls,4w_hauls,5w_hauls,best_bowling
+A,RCB,2017,5,0,0,0,0,-,-,-,0,0,0,-
+D,MI,2017,5,5,120,150,8,18.75,7.5,15.0,1,0,0,3/20
+E,CSK,2017,5,5,60,90,3,30.0,9.0,20.0,0,0,0,2/25
+"""
+
+TABLES = build_leaderboard_tables(pd.read_csv(io.StringIO(BATTING_CSV)), pd.read_csv(io.StringIO(BOWLING_CSV)))
+
+def page(scope, metric, offset=0, limit=10, **filters):
+    """(rank, player) of one page of a board, and the next page's offset"""
+    rows, next_offset = board_page(TABLES["leaderboards"][filter_key(scope, metric)], offset, limit, **filters)
+    return [(row["rank"], row["player"]) for row in map(json.loads, rows)], next_offset
+
+def test_boards_are_in_rank_order():
+    assert page("all-time", "runs") == ([(1, "B"), (2, "A"), (3, "C")], None)
+    # Equal runs: fewer balls ranks first
+    assert page("2018", "runs") == ([(1, "B"), (2, "C"), (3, "A")], None)
+    # Economy ranks lowest first, and players who never bowled are left off
+    assert page("2017", "economy") == ([(1, "D"), (2, "E")], None)
+    assert page("2017", "wickets") == ([(1, "D"), (2, "E")], None)
+
+def test_season_boards_only_count_that_season():
+    assert page("2017", "runs") == ([(1, "A"), (2, "B")], None)
+    assert page("2018", "economy") == ([], None)
+    rows, _ = board_page(TABLES["leaderboards"][filter_key("all-time", "runs")], 0, 1)
+    assert json.loads(rows[0])["runs"] == 450
+
+def test_pages_and_qualification():
+    assert page("all-time", "runs", offset=1, limit=1) == ([(2, "A")], 2)
+    assert page("all-time", "runs", offset=2, limit=1) == ([(3, "C")], None)
+    # Ranks count qualifying players only
+    assert page("all-time", "runs", min_balls=100) == ([(1, "B"), (2, "A")], None)
+    assert page("2018", "runs", min_balls=100, limit=1) == ([(1, "B")], None)
+    assert page("all-time", "runs", min_innings=6, limit=1) == ([(1, "B")], 1)
@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "api"))
+
+from match_archive import MatchArchiveBuilder, open_match_archive, render_scorecard
+
+# 2007/08 (filed under 2008), 2017, 2018 and 2024, when RCB played as Bengaluru
+MATCH_IDS = ["335982", "335983", "1082591", "1082592", "1136561", "1136562", "1136563", "1422119"]
+
+def load_match(match_id):
+    with open(os.path.join(REPO_DIR, "ipl_data", f"{match_id}.json"), "rb") as f:
+        raw = f.read()
+    return raw, json.loads(raw)
+
+@pytest.fixture(scope="module", params=[False, True], ids=["raw", "compressed"])
+def archive(request, tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("archive")
+    builder = MatchArchiveBuilder(compress=request.param, spool_dir=tmp_path)
+    for match_id in MATCH_IDS:
+        builder.add(match_id, *load_match(match_id))
+    assert builder.write(tmp_path / "matches.archive") == len(MATCH_IDS)
+    return open_match_archive(tmp_path / "matches.archive")
+
+def ids(summaries):
+    return [json.loads(summary)["match_id"] for summary in summaries]
+
+def test_matches_round_trip(archive):
+    for match_id in MATCH_IDS:
+        assert archive.match(match_id) == load_match(match_id)[1]
+    assert archive.match("1") is None
+
+def test_scorecard_adds_up(archive):
+    match = load_match("1082591")[1]
+    scorecard = render_scorecard("1082591", archive.match("1082591"))
+    assert scorecard["season"] == 2017 and scorecard["result"] == "Sunrisers Hyderabad won by 35 runs"
+    for innings, card in zip(match["innings"], scorecard["innings"]):
+        deliveries = [delivery for over in innings["overs"] for delivery in over["deliveries"]]
+        assert card["total"]["runs"] == sum(delivery["runs"]["total"] for delivery in deliveries)
+        assert card["total"]["runs"] == sum(row["runs"] for row in card["batting"]) + card["extras"]["total"]
+        assert card["total"]["wickets"] == sum(len(delivery.get("wickets", [])) for delivery in deliveries)
+        assert card["total"]["wickets"] == len(card["fall_of_wickets"])
+        assert sum(row["runs"] for row in card["bowling"]) + card["extras"]["byes"] + card["extras"]["legbyes"] == card["total"]["runs"]
+
+def test_filters(archive):
+    assert ids(archive.matches()) == MATCH_IDS
+    assert ids(archive.matches(season=2008)) == ["335982", "335983"]
+    assert ids(archive.matches(season=2018)) == ["1136561", "1136562", "1136563"]
+    assert ids(archive.matches(date="2018-04-08")) == ["1136562", "1136563"]
+    assert ids(archive.matches(team="Kolkata Knight Riders")) == ["335982", "1136563"]
+    # An abbreviation, in any case, covers every name the franchise played under
+    assert ids(archive.matches(team="rcb")) == ["335982", "1082591", "1136563", "1422119"]
+    assert ids(archive.matches(team="RCB", season=2018)) == ["1136563"]
+    assert ids(archive.matches(team="RCB", date="2024-03-22")) == ["1422119"]
+    assert archive.matches(season=2030) == [] and archive.matches(team="Nobody") == []
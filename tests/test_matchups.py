@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+from collections import Counter
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "api"))
+
+from delivery_store import build_delivery_store, build_matchup_matrix, save_matchup_matrix
+from api.cricsheet import BOWLER_WICKET_KINDS
+from matchups import MatchupIndex, load_matchups
+
+MATCH_FILES = ["1082591.json", "1082592.json", "1082593.json", "1136561.json", "1136562.json", "1136563.json"]
+
+def hand_counted():
+    """{(batter registry id, bowler registry id): stats}, counted straight from the match JSON"""
+    counts = {}
+    for fname in MATCH_FILES:
+        with open(os.path.join(REPO_DIR, "ipl_data", fname)) as f:
+            match = json.load(f)
+        registry = match["info"]["registry"]["people"]
+        for inning in match["innings"]:
+            for over in inning["overs"]:
+                for delivery in over["deliveries"]:
+                    pair = (registry[delivery["batter"]], registry[delivery["bowler"]])
+                    stats = counts.setdefault(pair, Counter())
+                    runs = delivery["runs"]["batter"]
+                    if "wides" not in delivery.get("extras", {}):
+                        stats["balls"] += 1
+                        stats["dots"] += runs == 0
+                    stats["runs"] += runs
+                    stats["4s"] += runs == 4
+                    stats["6s"] += runs == 6
+                    stats["dismissals"] += sum(
+                        wicket["kind"] in BOWLER_WICKET_KINDS and wicket["player_out"] == delivery["batter"]
+                        for wicket in delivery.get("wickets", [])
+                    )
+    return counts
+
+def test_matchups_match_a_hand_count(tmp_path):
+    path = tmp_path / "matchups.npz"
+    save_matchup_matrix(build_matchup_matrix(build_delivery_store(os.path.join(REPO_DIR, "ipl_data"), files=MATCH_FILES)), path)
+    index = MatchupIndex(load_matchups(path))
+    person = {str(registry_id): i for i, registry_id in enumerate(index.matrix["person_id"])}
+
+    counts = hand_counted()
+    stats = ("balls", "runs", "dots", "4s", "6s", "dismissals")
+    for (batter, bowler), expected in counts.items():
+        row = index.matchup(person[batter], person[bowler])
+        assert {stat: row[stat] for stat in stats} == {stat: expected[stat] for stat in stats}
+
+    # The pair that met most often, by name, with its rates
+    (batter, bowler), expected = max(counts.items(), key=lambda item: (item[1]["balls"], item[0]))
+    row = index.matchup(index.person(index.names[person[batter]]), index.person(index.names[person[bowler]]))
+    assert row["balls"] == expected["balls"] > 0
+    assert row["strike_rate"] == round(expected["runs"] * 100 / expected["balls"], 2)
+
+    # Every stored pair was hand-counted, and both sides list the same pairs
+    assert len(index.matrix["indices"]) == len(counts)
+    for batter_person in {person[batter] for batter, _ in counts}:
+        faced = index.top(batter_person, "batter", limit=len(counts))
+        assert [entry["balls"] for entry in faced] == sorted((entry["balls"] for entry in faced), reverse=True)
+    assert sum(len(index.top(person[bowler], "bowler", limit=len(counts))) for bowler in {bowler for _, bowler in counts}) == len(counts)
+
+def test_pairs_that_never_met_are_zero(tmp_path):
+    path = tmp_path / "matchups.npz"
+    save_matchup_matrix(build_matchup_matrix(build_delivery_store(os.path.join(REPO_DIR, "ipl_data"), files=MATCH_FILES[:1])), path)
+    index = MatchupIndex(load_matchups(path))
+    # Nobody bowls to themselves
+    row = index.matchup(0, 0)
+    assert row == {"balls": 0, "runs": 0, "dots": 0, "dismissals": 0, "4s": 0, "6s": 0, "strike_rate": None, "average": None}
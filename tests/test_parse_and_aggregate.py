@@ -0,0 +1,30 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import parse_and_aggregate
+
+# Two seasons, so shards split players' seasons as well as their matches
+MATCH_FILES = [f"{match_id}.json" for match_id in [*range(1082591, 1082597), *range(1136561, 1136567)]]
+
+def saved_counts(tmp_path, monkeypatch, player_stats):
+    """The bytes save_match_counts writes for player_stats"""
+    monkeypatch.chdir(tmp_path)
+    parse_and_aggregate.save_match_counts(player_stats)
+    return (tmp_path / "batting_stats.csv").read_bytes(), (tmp_path / "bowling_stats.csv").read_bytes()
+
+def test_merged_shards_match_a_serial_run(tmp_path, monkeypatch):
+    paths = [os.path.join(REPO_DIR, "ipl_data", fname) for fname in MATCH_FILES]
+    serial = saved_counts(tmp_path, monkeypatch, parse_and_aggregate.count_matches_and_innings(parse_and_aggregate.iter_matches(paths)))
+
+    # Uneven shards, merged in file order as the worker pool does
+    merged = {}
+    for shard in (paths[:1], paths[1:5], paths[5:]):
+        parse_and_aggregate.merge_player_stats(merged, parse_and_aggregate.count_shard(shard))
+    assert saved_counts(tmp_path, monkeypatch, merged) == serial
+
+    # And through the process pool itself
+    parallel = parse_and_aggregate.count_matches_and_innings_parallel(paths, workers=2)
+    assert saved_counts(tmp_path, monkeypatch, parallel) == serial
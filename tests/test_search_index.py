@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from search_index import build_search_tables, search
+from snapshot import Snapshot, encode_snapshot
+
+# Directory order is last-name order, which is also the tie-break
+DIRECTORY = [
+    {"name": "MS Dhoni"},
+    {"name": "G Gambhir"},
+    {"name": "CH Gayle"},
+    {"name": "Shubman Gill"},
+    {"name": "Glenn Maxwell"},
+    {"name": "Harbhajan Singh"},
+]
+ALIASES = {"MS Dhoni": ["Mahendra Singh Dhoni"], "CH Gayle": ["Chris Gayle"]}
+
+def names(query, limit=10):
+    snapshot = Snapshot(encode_snapshot("test", build_search_tables(DIRECTORY, ALIASES)))
+    return [entry["name"] for entry in search(snapshot, query, limit)]
+
+def test_surname_prefix_ranks_before_name_prefix():
+    assert names("g") == ["G Gambhir", "CH Gayle", "Shubman Gill", "Glenn Maxwell"]
+    assert names("g", limit=2) == ["G Gambhir", "CH Gayle"]
+
+def test_words_match_in_any_order():
+    assert names("ch gayle") == ["CH Gayle"]
+    assert names("gayle ch") == ["CH Gayle"]
+    assert names("C.H. Gayle") == ["CH Gayle"]
+
+def test_aliases_are_searched():
+    assert names("chris") == ["CH Gayle"]
+    # A surname beats a middle name that only an alias has
+    assert names("singh") == ["Harbhajan Singh", "MS Dhoni"]
+
+def test_trigrams_only_when_no_prefix_matches():
+    assert names("gaile") == ["CH Gayle"]
+    assert names("maxwel") == ["Glenn Maxwell"]
+    assert names("xyz") == []
+    assert names("") == []